@@ -0,0 +1,94 @@
+"""
+Compares the latency of `Client.graphql` calls through the shared, connection-pooled
+session with opening a new connection for every call, against a local stub server:
+
+    python benchmarks/client_requests.py --calls 500 --threads 8
+
+The stub answers every request immediately, so the difference between the two is the
+cost of setting up connections; against a remote HTTPS server, where each new connection
+also needs a TLS handshake, the difference is considerably larger.
+"""
+import argparse
+import http.server
+import json
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import requests
+
+from prefect.client import Client
+from prefect.utilities.configuration import set_temporary_config
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and body are written separately, which on a kept-alive connection
+    # would otherwise wait on the client's delayed ACK
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections += 1
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(dict(data=dict(ok=True))).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+def run(calls: int, threads: int) -> float:
+    client = Client()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: client.graphql("query { ok }"), range(calls)))
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def unpooled_post(self, url, **kwargs):
+    # a new session (and so a new connection) for every request, like `requests.post`
+    with requests.Session() as session:
+        return session.request("POST", url, **kwargs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}".format(server.server_address[1])
+
+    print("{:<10} {:>12} {:>12}".format("session", "ms / call", "connections"))
+    with set_temporary_config({"cloud.graphql": url, "cloud.auth_token": "token"}):
+        for name in ["unpooled", "pooled"]:
+            StubHandler.connections = 0
+            if name == "unpooled":
+                with patch("requests.Session.post", unpooled_post):
+                    latency = run(args.calls, args.threads)
+            else:
+                latency = run(args.calls, args.threads)
+            print(
+                "{:<10} {:>12.3f} {:>12}".format(name, latency, StubHandler.connections)
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
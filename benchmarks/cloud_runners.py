@@ -0,0 +1,155 @@
+"""
+Measures the overhead the Cloud runners add to flow runs, against a local stand-in for
+Prefect Cloud (see `fake_cloud.py`) with configurable latency and error injection:
+
+    python benchmarks/cloud_runners.py --tasks 200 --map-size 1000 --latency 0.005
+
+Each scenario is run once with `FlowRunner`, as a baseline, and once with
+`CloudFlowRunner`; the report shows, for the Cloud run, the requests made for each task
+run, the time added to each task run compared with the baseline, the number of task
+runs completed per second, and the GraphQL fields, log and result requests it made:
+
+- `chain`: `--tasks` tasks, each depending on the one before it
+- `map`: a task mapped over `--map-size` items, followed by a task which reduces them
+
+`--batch` sends state updates through the background batcher
+(`cloud.state_updates.batch`), and `--checkpoint` stores every task's result through the
+Cloud result handler.
+
+With `--error-rate`, updates which the `Client` can't retry can fail a run; failed runs
+are reported as `FAILED` and the script exits with an error once every scenario ran.
+"""
+import argparse
+import logging
+import sys
+import time
+from collections import Counter
+from typing import List, Tuple
+
+import prefect
+from prefect.engine.cloud import CloudFlowRunner, CloudResultHandler
+from prefect.engine.executors import DaskExecutor, LocalExecutor, SynchronousExecutor
+from prefect.engine.flow_runner import FlowRunner
+from prefect.engine.state import State
+from prefect.utilities.configuration import set_temporary_config
+
+from fake_cloud import FakeCloud
+
+EXECUTORS = {"local": LocalExecutor, "sync": SynchronousExecutor, "dask": DaskExecutor}
+
+
+@prefect.task
+def increment(x: int) -> int:
+    return x + 1
+
+
+@prefect.task
+def total(xs: list) -> int:
+    return sum(xs)
+
+
+def chain_flow(tasks: int) -> prefect.Flow:
+    with prefect.Flow("chain") as flow:
+        x = 0
+        for _ in range(tasks):
+            x = increment(x)
+    return flow
+
+
+def map_flow(map_size: int) -> prefect.Flow:
+    with prefect.Flow("map") as flow:
+        total(increment.map(list(range(map_size))))
+    return flow
+
+
+def run(flow: prefect.Flow, executor: str) -> float:
+    start = time.perf_counter()
+    state = FlowRunner(flow=flow).run(executor=EXECUTORS[executor]())
+    assert state.is_successful(), state
+    return time.perf_counter() - start
+
+
+def run_in_cloud(
+    flow: prefect.Flow, cloud: FakeCloud, executor: str
+) -> Tuple[float, int, State]:
+    """
+    Runs the flow with `CloudFlowRunner`, returning the time it took, the number of task
+    runs it had and its final state.
+    """
+    flow_run_id = cloud.create_flow_run(flow)
+    start = time.perf_counter()
+    with prefect.context(flow_run_id=flow_run_id):
+        state = CloudFlowRunner(flow=flow).run(executor=EXECUTORS[executor]())
+    elapsed = time.perf_counter() - start
+    runs = sum(tr["flow_run_id"] == flow_run_id for tr in cloud.task_runs.values())
+    return elapsed, runs, state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--map-size", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--executor", choices=sorted(EXECUTORS), default="local")
+    parser.add_argument("--batch", action="store_true")
+    parser.add_argument("--checkpoint", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("prefect").setLevel(logging.WARNING)
+
+    print(
+        "{:<8} {:>10} {:>14} {:>14} {:>12}   {}".format(
+            "scenario",
+            "task runs",
+            "requests / run",
+            "added ms / run",
+            "runs / s",
+            "calls",
+        )
+    )
+    failures = []  # type: List[str]
+    with FakeCloud(latency=args.latency, error_rate=args.error_rate, seed=0) as cloud:
+        settings = dict(
+            cloud.config(),
+            **{
+                "cloud.state_updates.batch": args.batch,
+                "cloud.heartbeat_interval": 3600.0,
+                "tasks.defaults.checkpoint": args.checkpoint,
+            }
+        )
+        with set_temporary_config(settings):
+            for name, flow in [
+                ("chain", chain_flow(args.tasks)),
+                ("map", map_flow(args.map_size)),
+            ]:
+                if args.checkpoint:
+                    flow.result_handler = CloudResultHandler()
+                    for task in flow.tasks:
+                        task.checkpoint = True
+
+                baseline = run(flow, args.executor)
+                cloud.calls, requests = Counter(), cloud.requests
+                elapsed, runs, state = run_in_cloud(flow, cloud, args.executor)
+                calls = cloud.requests - requests
+                if not state.is_successful():
+                    # with injected errors, updates which can't be retried can fail
+                    failures.append(name)
+                    print("{:<8} FAILED: {!r}".format(name, state))
+                    continue
+                print(
+                    "{:<8} {:>10} {:>14.2f} {:>14.3f} {:>12.1f}   {}".format(
+                        name,
+                        runs,
+                        calls / runs,
+                        (elapsed - baseline) / runs * 1000,
+                        runs / elapsed,
+                        dict(cloud.calls.most_common()),
+                    )
+                )
+
+    if failures:
+        sys.exit("failed runs: {}".format(", ".join(failures)))
+
+
+if __name__ == "__main__":
+    main()
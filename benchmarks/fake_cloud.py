@@ -0,0 +1,328 @@
+"""
+An in-memory stand-in for the Prefect Cloud APIs the `Client` uses while running flows,
+served from a thread on localhost: the GraphQL API (flow and task runs, their states
+and heartbeats, cached states and secrets), the log API and the result handler API.
+
+    from fake_cloud import FakeCloud
+
+    with FakeCloud(latency=0.02, error_rate=0.01) as cloud:
+        with set_temporary_config(cloud.config()):
+            flow_run_id = cloud.create_flow_run(flow)
+            with prefect.context(flow_run_id=flow_run_id):
+                CloudFlowRunner(flow=flow).run()
+        print(cloud.calls)
+
+Every request waits `latency` seconds before it's answered, and a fraction `error_rate`
+of requests are answered with a 503 response instead, which the `Client` retries if the
+request is idempotent.  State updates are checked against the current version of the
+flow or task run, like in Cloud, so runners which lose track of versions fail.
+"""
+import http.server
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import pendulum
+
+import prefect
+from prefect.engine.state import Pending, Scheduled, State
+from prefect.utilities.graphql import decompress
+
+# the mutation fields the Client sends, each with its input as a variable, such as
+# `update0: setTaskRunState(input: $input0)`
+MUTATION_FIELD = re.compile(
+    r"(?:(\w+)\s*:\s*)?"
+    r"(setTaskRunState|setFlowRunState|getOrCreateTaskRun|"
+    r"updateFlowRunHeartbeat|updateTaskRunHeartbeat|secretValue)"
+    r"\(\w+:\s*\$(\w+)\)"
+)
+FLOW_RUN_ID = re.compile(r'flow_run_by_pk\(id: "([^"]+)"\)')
+TASK_RUNS_FLOW_RUN_ID = re.compile(r'flow_run_id: \{ _eq: "([^"]+)" \}')
+TASK_RUNS_SLUGS = re.compile(r"slug: \{ _in: (\[[^\]]*\]) \}")
+
+
+class GraphQLError(Exception):
+    pass
+
+
+class FakeCloud:
+    """
+    An in-memory stand-in for Prefect Cloud, answering requests on localhost.
+
+    Args:
+        - latency (float, optional): seconds every request waits before it's answered
+        - error_rate (float, optional): the fraction of requests which are answered with
+            a 503 response
+        - seed (int, optional): the seed for choosing which requests fail
+    """
+
+    def __init__(
+        self, latency: float = 0.0, error_rate: float = 0.0, seed: int = None
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+
+        # requests by operation (GraphQL field, "log" or "result"), and failed requests
+        self.calls = Counter()  # type: Counter
+        self.requests = 0
+        self.errors = 0
+
+        self.flow_runs = {}  # type: Dict[str, dict]
+        self.task_runs = {}  # type: Dict[str, dict]
+        # task runs by flow run id, task id and map index
+        self.task_run_keys = {}  # type: Dict[tuple, dict]
+        self.secrets = {}  # type: Dict[str, Any]
+        self.results = {}  # type: Dict[str, str]
+        self.logs = []  # type: List[dict]
+        self.server = None  # type: Optional[socketserver.BaseServer]
+
+    # -------------------------------------------------------------------------
+    # Server
+
+    def start(self) -> "FakeCloud":
+        cloud = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                url = urllib.parse.urlparse(self.path)
+                params = dict(urllib.parse.parse_qsl(url.query))
+                self.respond(url.path, params)
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                self.respond(urllib.parse.urlparse(self.path).path, json.loads(body))
+
+            def respond(self, path: str, params: dict) -> None:
+                status, response = cloud.handle(path, params)
+                body = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+            daemon_threads = True
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "FakeCloud":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        assert self.server is not None, "the server hasn't been started"
+        return "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def config(self) -> dict:
+        """
+        The configuration which points the `Client` at this stand-in, for use with
+        `set_temporary_config`.
+        """
+        return {
+            "cloud.graphql": self.url + "/graphql",
+            "cloud.log": self.url + "/log",
+            "cloud.result_handler": self.url + "/result-handler",
+            "cloud.auth_token": "fake-token",
+        }
+
+    # -------------------------------------------------------------------------
+    # Records
+
+    def create_flow_run(
+        self, flow: "prefect.Flow", state: State = None, parameters: dict = None
+    ) -> str:
+        """
+        Creates a flow run of the given flow, with a `Pending` task run for each of its
+        tasks; the tasks' ids are their slugs.
+
+        Returns:
+            - str: the id of the flow run
+        """
+        flow_run_id = str(uuid.uuid4())
+        with self.lock:
+            self.flow_runs[flow_run_id] = dict(
+                id=flow_run_id,
+                version=0,
+                state=(state or Scheduled()).serialize(),
+                parameters=parameters or {},
+                scheduled_start_time=pendulum.now("utc").isoformat(),
+            )
+            for task in flow.tasks:
+                self._create_task_run(flow_run_id, task_id=task.slug, map_index=-1)
+        return flow_run_id
+
+    def _create_task_run(self, flow_run_id: str, task_id: str, map_index: int) -> dict:
+        task_run = dict(
+            id=str(uuid.uuid4()),
+            flow_run_id=flow_run_id,
+            task_id=task_id,
+            map_index=map_index,
+            version=0,
+            state=Pending().serialize(),
+        )
+        self.task_runs[task_run["id"]] = task_run
+        self.task_run_keys[(flow_run_id, task_id, map_index)] = task_run
+        return task_run
+
+    def _task_run_info(self, task_run: dict) -> dict:
+        return dict(
+            id=task_run["id"],
+            task={"id": task_run["task_id"], "slug": task_run["task_id"]},
+            version=task_run["version"],
+            serialized_state=task_run["state"],
+        )
+
+    # -------------------------------------------------------------------------
+    # Requests
+
+    def handle(self, path: str, params: dict) -> tuple:
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.errors += 1
+                return 503, {"error": "injected error"}
+
+            if path.startswith("/graphql"):
+                variables = json.loads(params.get("variables") or "{}")
+                return 200, self.graphql(params["query"], variables)
+            elif path.startswith("/log"):
+                self.calls["log"] += 1
+                if "logs" in params:
+                    self.logs.extend(decompress(params["logs"]))
+                else:
+                    self.logs.append(params)
+                return 200, {}
+            elif path.startswith("/result-handler"):
+                self.calls["result"] += 1
+                if "uri" in params:
+                    return 200, {"result": self.results.get(params["uri"], "")}
+                uri = str(uuid.uuid4())
+                self.results[uri] = params["result"]
+                return 200, {"uri": uri}
+            return 404, {"error": "unknown path {}".format(path)}
+
+    def graphql(self, query: str, variables: dict) -> dict:
+        data = {}  # type: Dict[str, Any]
+        errors = []
+        fields = MUTATION_FIELD.findall(query)
+        for alias, field, variable in fields:
+            self.calls[field] += 1
+            try:
+                data[alias or field] = getattr(self, field)(variables[variable])
+            except GraphQLError as exc:
+                data[alias or field] = None
+                errors.append(dict(message=str(exc), path=[alias or field]))
+
+        if not fields:
+            flow_run_id = FLOW_RUN_ID.search(query)
+            if flow_run_id:
+                self.calls["flow_run_by_pk"] += 1
+                data["flow_run_by_pk"] = self.flow_run_by_pk(
+                    flow_run_id.group(1), include_task_runs="task_runs" in query
+                )
+            elif query.lstrip().startswith("query") and "task_run" in query:
+                self.calls["task_run"] += 1
+                data["task_run"] = self.task_run(query)
+            else:
+                errors.append(dict(message="unsupported query"))
+
+        response = dict(data=data)  # type: Dict[str, Any]
+        if errors:
+            response["errors"] = errors
+        return response
+
+    # -------------------------------------------------------------------------
+    # GraphQL fields
+
+    def flow_run_by_pk(self, flow_run_id: str, include_task_runs: bool) -> dict:
+        flow_run = self.flow_runs.get(flow_run_id)
+        if flow_run is None:
+            return None  # type: ignore
+        result = dict(
+            parameters=flow_run["parameters"],
+            context=None,
+            version=flow_run["version"],
+            scheduled_start_time=flow_run["scheduled_start_time"],
+            serialized_state=flow_run["state"],
+        )
+        if include_task_runs:
+            result["task_runs"] = [
+                self._task_run_info(tr)
+                for tr in self.task_runs.values()
+                if tr["flow_run_id"] == flow_run_id and tr["map_index"] == -1
+            ]
+        return result
+
+    def task_run(self, query: str) -> List[dict]:
+        flow_run_id = TASK_RUNS_FLOW_RUN_ID.search(query)
+        slugs = TASK_RUNS_SLUGS.search(query)
+        if flow_run_id is None or slugs is None:
+            # cached states, which the stand-in doesn't keep
+            return []
+        slugs = set(json.loads(slugs.group(1)))
+        return [
+            self._task_run_info(tr)
+            for tr in self.task_runs.values()
+            if tr["flow_run_id"] == flow_run_id.group(1)
+            and tr["map_index"] == -1
+            and tr["task_id"] in slugs
+        ]
+
+    def setFlowRunState(self, input: dict) -> dict:
+        flow_run = self.flow_runs[input["flowRunId"]]
+        if flow_run["version"] != input["version"]:
+            raise GraphQLError("State update failed: version mismatch.")
+        flow_run.update(version=flow_run["version"] + 1, state=input["state"])
+        return dict(id=flow_run["id"])
+
+    def setTaskRunState(self, input: dict) -> dict:
+        task_run = self.task_runs[input["taskRunId"]]
+        if task_run["version"] != input["version"]:
+            raise GraphQLError("State update failed: version mismatch.")
+        task_run.update(version=task_run["version"] + 1, state=input["state"])
+        return dict(id=task_run["id"])
+
+    def getOrCreateTaskRun(self, input: dict) -> dict:
+        key = (input["flowRunId"], input["taskId"], input.get("mapIndex", -1))
+        task_run = self.task_run_keys.get(key)
+        if task_run is None:
+            task_run = self._create_task_run(*key)
+        return dict(task_run=self._task_run_info(task_run))
+
+    def updateFlowRunHeartbeat(self, input: dict) -> dict:
+        return dict(success=True)
+
+    def updateTaskRunHeartbeat(self, input: dict) -> dict:
+        return dict(success=True)
+
+    def secretValue(self, name: str) -> Any:
+        return self.secrets.get(name)
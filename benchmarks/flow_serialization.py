@@ -0,0 +1,97 @@
+"""
+Measures the time it takes to serialize large flows with `FlowSchema` and to load them
+back, and compares the size of the serialized flows, and the time it takes to encode and
+decode them, with `prefect.utilities.graphql.compress` (the encoding `Client.deploy`
+uses) and with the compact encoding of `prefect.serialization.flow.compress_flow`:
+
+    python benchmarks/flow_serialization.py --tasks 1000 10000 50000
+
+The flows are generated: each task has a few upstream tasks chosen at random, half of
+them passed as keyword arguments.  "dump" and "load" are the same for either encoding
+(dumping skips `Flow.validate`, which `Flow.serialize` runs first); "MB" is the size of
+the encoded flow (for `compress`, its base64 string).
+"""
+import argparse
+import json
+import random
+import time
+
+import prefect
+from prefect.serialization.flow import FlowSchema, compress_flow, decompress_flow
+from prefect.utilities.graphql import compress, decompress
+
+
+class Add(prefect.Task):
+    def run(self, **inputs: int) -> int:
+        return sum(inputs.values())
+
+
+def generate_flow(n_tasks: int, upstream: int, seed: int = 0) -> prefect.Flow:
+    rng = random.Random(seed)
+    flow = prefect.Flow("generated")
+    tasks = [Add(name="task-{}".format(i % 100)) for i in range(n_tasks)]
+    # the tasks are new, so they don't need `Flow.add_task`'s check for duplicate slugs
+    flow.tasks.update(tasks)
+    for i, task in enumerate(tasks[1:], 1):
+        for j, upstream_task in enumerate(
+            rng.sample(tasks[max(0, i - 100) : i], min(i, upstream))
+        ):
+            key = "x{}".format(j) if j % 2 else None
+            flow.add_edge(upstream_task, task, key=key, validate=False)
+    return flow
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--upstream", type=int, default=2)
+    args = parser.parse_args()
+
+    print(
+        "{:>8} {:>8} {:>9} {:>9} {:<14} {:>8} {:>11} {:>11}".format(
+            "tasks",
+            "edges",
+            "dump (s)",
+            "load (s)",
+            "encoding",
+            "MB",
+            "encode (s)",
+            "decode (s)",
+        )
+    )
+    for n_tasks in args.tasks:
+        flow = generate_flow(n_tasks, args.upstream)
+        serialized, dump_time = timed(FlowSchema().dump, flow)
+        # loading removes the version tags from the data, so load a copy of it
+        loaded, load_time = timed(FlowSchema().load, json.loads(json.dumps(serialized)))
+        assert len(loaded.tasks) == len(flow.tasks)
+        assert len(loaded.edges) == len(flow.edges)
+        for name, encode, decode in [
+            ("compress", compress, decompress),
+            ("compress_flow", compress_flow, decompress_flow),
+        ]:
+            encoded, encode_time = timed(encode, serialized)
+            decoded, decode_time = timed(decode, encoded)
+            assert decoded == serialized
+            print(
+                "{:>8} {:>8} {:>9.2f} {:>9.2f} {:<14} {:>8.2f} {:>11.2f} {:>11.2f}".format(
+                    n_tasks,
+                    len(flow.edges),
+                    dump_time,
+                    load_time,
+                    name,
+                    len(encoded) / 1e6,
+                    encode_time,
+                    decode_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures the cost of compiling the GraphQL documents `Client` sends while running flows,
+comparing building and parsing a document with the values formatted into it on every call
+against a document prepared once with `prepare_graphql`, whose values are sent as
+variables:
+
+    python benchmarks/graphql_queries.py --calls 10000
+
+Only the client-side work of producing the query string is timed; no requests are made.
+"""
+import argparse
+import timeit
+
+from prefect.client.client import _SET_TASK_RUN_STATE_MUTATION
+from prefect.utilities.graphql import EnumValue, parse_graphql, with_args
+
+
+def build_set_task_run_state(task_run_id: str, version: int) -> str:
+    # the document as it was built before it was prepared: the arguments are formatted
+    # into it, so it's parsed again for every call
+    return parse_graphql(
+        {
+            "mutation($state: JSON!)": {
+                with_args(
+                    "setTaskRunState",
+                    {
+                        "input": {
+                            "taskRunId": task_run_id,
+                            "version": version,
+                            "state": EnumValue("$state"),
+                        }
+                    },
+                ): {"id"}
+            }
+        }
+    )
+
+
+def prepared_set_task_run_state(task_run_id: str, version: int) -> str:
+    return parse_graphql(_SET_TASK_RUN_STATE_MUTATION)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=10000)
+    args = parser.parse_args()
+
+    print("{:<10} {:>12}".format("document", "us / call"))
+    for name, fn in [
+        ("built", build_set_task_run_state),
+        ("prepared", prepared_set_task_run_state),
+    ]:
+        seconds = min(
+            timeit.repeat(
+                lambda: fn("74b3a3f3-5a5b-4f4c-8c3c-7b5e1c4d2a10", 3),
+                number=args.calls,
+                repeat=3,
+            )
+        )
+        print("{:<10} {:>12.3f}".format(name, seconds / args.calls * 1e6))
+
+
+if __name__ == "__main__":
+    main()
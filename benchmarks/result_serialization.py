@@ -0,0 +1,105 @@
+"""
+Measures how many copies of a large array each result serializer makes, and the peak
+memory it needs, when writing a result to disk and reading it back.
+
+Every measurement runs in a fresh process so that peak RSS reflects only that operation:
+
+    python benchmarks/result_serialization.py --size 1024
+
+The value is a NumPy array of `--size` MiB if NumPy is installed, and a `bytearray`
+otherwise.  "copies" is the peak memory traced by `tracemalloc` during the operation
+divided by the size of the value (reading necessarily allocates the value itself, so the
+ideal is 0 for writes and 1 for reads); "extra RSS" is the growth in the process' peak
+resident memory over the same period.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from prefect.engine.result_handlers import serializers
+
+MiB = 1024 * 1024
+
+
+def make_value(size: int):
+    try:
+        import numpy
+
+        return numpy.ones(size // 8, dtype="f8")
+    except ImportError:
+        return bytearray(size)
+
+
+def peak_rss() -> int:
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def measure(operation: str, path: str, size: int, serializer: str, compression):
+    value = make_value(size) if operation == "write" else None
+    rss = peak_rss()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path, "wb" if operation == "write" else "rb") as f:
+        if operation == "write":
+            serializers.dump(value, f, serializer, compression)
+        else:
+            value = serializers.load(f)
+    duration = time.perf_counter() - start
+    _, traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dict(
+        seconds=duration, copies=traced / size, extra_rss=(peak_rss() - rss) / MiB
+    )
+
+
+def run_child(*args) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, __file__, "--child"] + [str(a) for a in args]
+    )
+    return json.loads(output.decode())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=1024, help="value size in MiB")
+    parser.add_argument(
+        "--serializers", nargs="+", default=["pickle", "pickle_oob"], metavar="NAME"
+    )
+    parser.add_argument("--compression", default=None)
+    parser.add_argument("--child", nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        operation, path, size, serializer, compression = args.child
+        compression = None if compression == "None" else compression
+        print(json.dumps(measure(operation, path, int(size), serializer, compression)))
+        return
+
+    size = args.size * MiB
+    print(
+        "{:<12} {:<6} {:>9} {:>8} {:>15}".format(
+            "serializer", "op", "seconds", "copies", "extra RSS (MiB)"
+        )
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for serializer in args.serializers:
+            path = os.path.join(tmp, serializer)
+            for operation in ["write", "read"]:
+                result = run_child(operation, path, size, serializer, args.compression)
+                print(
+                    "{:<12} {:<6} {seconds:>9.2f} {copies:>8.2f} {extra_rss:>15.0f}".format(
+                        serializer, operation, **result
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
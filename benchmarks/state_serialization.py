@@ -0,0 +1,80 @@
+"""
+Measures how long serializing and deserializing states takes with `StateSchema` and with
+the compiled serializers `State.serialize` and `State.deserialize` use:
+
+    python benchmarks/state_serialization.py --repeat 2000
+
+Each state is serialized and deserialized `--repeat` times by both, after checking they
+produce the same data and states; the report shows microseconds per call and the speedup.
+"""
+import argparse
+import time
+
+import pendulum
+
+from prefect.engine import state
+from prefect.engine.cloud import CloudResultHandler
+from prefect.engine.result import SafeResult
+from prefect.serialization.state import StateSchema, deserialize_state, serialize_state
+
+
+def states() -> dict:
+    checkpointed = SafeResult("result-uri", result_handler=CloudResultHandler())
+    return {
+        "Running": state.Running(message="Starting task run."),
+        "Success": state.Success(message="Task run succeeded."),
+        "Success (checkpointed)": state.Success(result=checkpointed),
+        "Retrying": state.Retrying(start_time=pendulum.now("utc"), run_count=2),
+        "Submitted": state.Submitted(state=state.Scheduled()),
+        "Cached": state.Cached(
+            cached_inputs={"x": checkpointed},
+            result=checkpointed,
+            cached_parameters={"x": 1},
+            cached_result_expiration=pendulum.now("utc"),
+        ),
+        "Mapped": state.Mapped(map_states=[None] * 100),
+    }
+
+
+def timeit(fn, arg, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        "{:<24} {:<12} {:>14} {:>14} {:>8}".format(
+            "state", "op", "schema (us)", "compiled (us)", "speedup"
+        )
+    )
+    for name, s in states().items():
+        serialized = StateSchema().dump(s)
+        assert serialize_state(s) == serialized
+        assert deserialize_state(serialized) == StateSchema().load(serialized)
+
+        for op, schema_fn, compiled_fn, arg in [
+            ("serialize", lambda s: StateSchema().dump(s), serialize_state, s),
+            (
+                "deserialize",
+                lambda d: StateSchema().load(d),
+                deserialize_state,
+                serialized,
+            ),
+        ]:
+            schema = timeit(schema_fn, arg, args.repeat)
+            compiled = timeit(compiled_fn, arg, args.repeat)
+            print(
+                "{:<24} {:<12} {:>14.1f} {:>14.1f} {:>7.1f}x".format(
+                    name, op, schema, compiled, schema / compiled
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
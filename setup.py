@@ -10,6 +10,7 @@ dev_requires = open("dev-requirements.txt").read().strip().split("\n")
 
 extras = {
     "airtable": ["airtable-python-wrapper >= 0.11, < 0.12"],
+    "async": ["tornado >= 5.0, < 7.0"],
     "aws": ["boto3 >= 1.9, < 2.0"],
     "dev": dev_requires,
     "google": [
@@ -2,6 +2,7 @@
 
 
 import click
+import datetime
 import json
 import logging
 import os
@@ -64,3 +65,27 @@ def execute_cloud_flow():
 
     environment.setup(storage=storage)
     environment.execute(storage=storage, flow_location=storage.flows[flow_data.name])
+
+
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--days",
+    type=float,
+    default=7,
+    show_default=True,
+    help="Only prune results which haven't been written for this many days.",
+)
+@click.option("--dry-run", is_flag=True, help="List results without deleting them.")
+def prune_results(directory, days, dry_run):
+    """
+    Prune old results from a content-addressed result store.
+    """
+    from prefect.engine.result_handlers.content_addressed_result_handler import prune
+
+    pruned = prune(directory, older_than=datetime.timedelta(days=days), dry_run=dry_run)
+    for path in pruned:
+        click.echo(path)
+    click.echo(
+        "{} {} result(s).".format("Would prune" if dry_run else "Pruned", len(pruned))
+    )
@@ -1,2 +1,3 @@
 from prefect.client.client import Client
-from prefect.client.secrets import Secret
+from prefect.client.async_client import AsyncClient
+from prefect.client.secrets import Secret, invalidate_secrets, prefetch_secrets
@@ -0,0 +1,441 @@
+import asyncio
+import datetime
+import json
+import os
+import urllib.parse
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple, Union
+
+import prefect
+from prefect.client.client import (
+    RETRY_STATUS_CODES,
+    BuiltIn,
+    Client,
+    FlowRunInfoResult,
+    TaskRunInfoResult,
+    _map_index_batches,
+)
+from prefect.utilities.exceptions import AuthorizationError, ClientError
+from prefect.utilities.graphql import GraphQLResult, parse_graphql
+
+if TYPE_CHECKING:
+    import tornado.httpclient
+
+
+def _tornado_httpclient() -> Any:
+    # lazy import for performance; tornado is an optional dependency
+    try:
+        import tornado.httpclient
+    except ImportError:
+        raise ImportError(
+            'Using `AsyncClient` requires Prefect to be installed with the "async" extra.'
+        ) from None
+    return tornado.httpclient
+
+
+class AsyncClient:
+    """
+    Asynchronous client for communication with Prefect Cloud, for use on an `asyncio`
+    event loop.  Requires the `tornado` package, which is installed with the "async"
+    extra.
+
+    `AsyncClient` provides coroutine versions of the `Client` methods used while running
+    flows: `graphql`, `get`, `post`, `create_flow_run`, `get_flow_run_info`,
+    `get_flow_run_task_runs`, `set_flow_run_state`, `get_task_run_info`,
+    `get_task_run_infos`, `set_task_run_state`, `set_task_run_states`,
+    `get_latest_cached_states`, `update_flow_run_heartbeat` and
+    `update_task_run_heartbeat`.  They build the same GraphQL documents and return the same
+    results as their `Client` counterparts, but many of them can be awaited concurrently:
+    up to `cloud.http.max_concurrent_requests` requests are in flight at once, and any
+    others wait for a free slot.  Requests are retried in the same way as `Client`
+    requests.
+
+    Authentication is handled by a synchronous `Client`, available as `client`: the
+    token is read from the same configuration and credentials file, `client.login` and
+    `client.logout` log in and out, and an expired token is refreshed with
+    `client.refresh_token` (once, however many requests were rejected).
+
+    Args:
+        - graphql_server (str, optional): the URL to send all GraphQL requests
+            to; if not provided, will be pulled from `cloud.graphql` config var
+        - client (Client, optional): the `Client` to authenticate with; if not provided,
+            one is created for `graphql_server`
+    """
+
+    def __init__(self, graphql_server: str = None, client: Client = None):
+        self.client = client or Client(graphql_server=graphql_server)
+        self._http_client = None  # type: Optional[tornado.httpclient.AsyncHTTPClient]
+        self._refresh_lock = None  # type: Optional[asyncio.Lock]
+
+    @property
+    def graphql_server(self) -> Optional[str]:
+        return self.client.graphql_server
+
+    @property
+    def token(self) -> Optional[str]:
+        return self.client.token
+
+    @token.setter
+    def token(self, token: Optional[str]) -> None:
+        self.client.token = token
+
+    def close(self) -> None:
+        """
+        Closes the connections held by this client.
+        """
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    # -------------------------------------------------------------------------
+    # Utilities
+
+    async def get(self, path: str, server: str = None, **params: BuiltIn) -> dict:
+        """
+        Convenience function for calling the Prefect API with token auth and GET request
+
+        Args:
+            - path (str): the path of the API url. For example, to GET
+                http://prefect-server/v1/auth/login, path would be 'auth/login'.
+            - server (str, optional): the server to send the GET request to;
+                defaults to `self.graphql_server`
+            - **params (dict): GET parameters
+
+        Returns:
+            - dict: Dictionary representation of the request made
+        """
+        response = await self._request(
+            method="GET", path=path, params=params, server=server
+        )
+        return json.loads(response.body.decode()) if response.body else {}
+
+    async def post(self, path: str, server: str = None, **params: BuiltIn) -> dict:
+        """
+        Convenience function for calling the Prefect API with token auth and POST request
+
+        Args:
+            - path (str): the path of the API url. For example, to POST
+                http://prefect-server/v1/auth/login, path would be 'auth/login'.
+            - server (str, optional): the server to send the POST request to;
+                defaults to `self.graphql_server`
+            - **params (dict): POST parameters
+
+        Returns:
+            - dict: Dictionary representation of the request made
+        """
+        response = await self._request(
+            method="POST", path=path, params=params, server=server
+        )
+        return json.loads(response.body.decode()) if response.body else {}
+
+    async def graphql(
+        self,
+        query: Any,
+        raise_on_error: bool = True,
+        **variables: Union[bool, dict, str, int]
+    ) -> GraphQLResult:
+        """
+        Convenience function for running queries against the Prefect GraphQL API
+
+        Args:
+            - query (Any): A representation of a graphql query to be executed. It will be
+                parsed by prefect.utilities.graphql.parse_graphql().
+            - raise_on_error (bool): if True, a `ClientError` will be raised if the GraphQL
+                returns any `errors`.
+            - **variables (kwarg): Variables to be filled into a query with the key being
+                equivalent to the variables that are accepted by the query
+
+        Returns:
+            - dict: Data returned from the GraphQL query
+
+        Raises:
+            - ClientError if there are errors raised by the GraphQL mutation
+        """
+        query = parse_graphql(query)
+        response = await self._request(
+            method="POST",
+            path="",
+            params=dict(query=query, variables=json.dumps(variables)),
+            server=self.graphql_server,
+            # queries can be safely retried, but mutations can't
+            idempotent=not query.lstrip().startswith("mutation"),
+        )
+        result = json.loads(response.body.decode()) if response.body else {}
+
+        if raise_on_error and "errors" in result:
+            raise ClientError(result["errors"])
+        else:
+            return GraphQLResult.wrap(result)
+
+    def _get_http_client(self) -> "tornado.httpclient.AsyncHTTPClient":
+        if self._http_client is None:
+            self._http_client = _tornado_httpclient().AsyncHTTPClient(
+                force_instance=True,
+                max_clients=prefect.config.cloud.http.max_concurrent_requests,
+            )
+        return self._http_client
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict = None,
+        server: str = None,
+        idempotent: bool = None,
+    ) -> "tornado.httpclient.HTTPResponse":
+        """
+        Runs any specified request (GET, POST, DELETE) against the server, retrying
+        idempotent requests like `Client._request`.
+
+        Args:
+            - method (str): The type of request to be made (GET, POST, DELETE)
+            - path (str): Path of the API URL
+            - params (dict, optional): Parameters used for the request
+            - server (str, optional): The server to make requests against, base API
+                server is used if not specified
+            - idempotent (bool, optional): whether the request can be safely retried;
+                defaults to `True` for GET and DELETE requests and `False` otherwise
+
+        Returns:
+            - tornado.httpclient.HTTPResponse: The response returned from the request
+
+        Raises:
+            - ClientError: if the client token is not in the context (due to not being logged in)
+            - ValueError: if a method is specified outside of the accepted GET, POST, DELETE
+            - tornado.httpclient.HTTPError: if a status code is returned that is not `200`
+                or `401`
+        """
+        httpclient = _tornado_httpclient()
+
+        if server is None:
+            server = self.graphql_server
+        assert isinstance(server, str)  # mypy assert
+
+        if self.token is None:
+            raise AuthorizationError("Call Client.login() to set the client token.")
+
+        url = os.path.join(server, path.lstrip("/")).rstrip("/")
+        params = params or {}
+        if method == "GET":
+            if params:
+                url = "{}?{}".format(url, urllib.parse.urlencode(params))
+            body = None
+        elif method == "POST":
+            body = json.dumps(params)
+        elif method == "DELETE":
+            body = None
+        else:
+            raise ValueError("Invalid method: {}".format(method))
+
+        if idempotent is None:
+            idempotent = method in ("GET", "DELETE")
+        http_client = self._get_http_client()
+
+        async def request_fn() -> "tornado.httpclient.HTTPResponse":
+            headers = {
+                "Authorization": "Bearer {}".format(self.token),
+                "Content-Type": "application/json",
+            }
+            request = httpclient.HTTPRequest(
+                url, method=method, headers=headers, body=body
+            )
+            return await http_client.fetch(request)
+
+        async def authorized_request_fn() -> "tornado.httpclient.HTTPResponse":
+            # If a 401 status code is returned, refresh the login token
+            token = self.token
+            try:
+                return await request_fn()
+            except httpclient.HTTPError as err:
+                if err.code == 401:
+                    await self._refresh_token(expired=token)
+                    return await request_fn()
+                raise
+
+        max_retries = prefect.config.cloud.http.max_retries if idempotent else 0
+        for attempt in range(max_retries + 1):
+            try:
+                return await authorized_request_fn()
+            except (httpclient.HTTPError, OSError) as exc:
+                # tornado reports timeouts and closed connections with the code 599
+                retryable = not isinstance(exc, httpclient.HTTPError) or (
+                    exc.code in RETRY_STATUS_CODES or exc.code == 599
+                )
+                if not retryable or attempt == max_retries:
+                    raise
+                delay = prefect.config.cloud.http.backoff_factor * 2 ** attempt
+                self.client.logger.debug(
+                    "{} request to {} failed ({}); retrying in {} seconds...".format(
+                        method, url, exc, delay
+                    )
+                )
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def _refresh_token(self, expired: Optional[str]) -> None:
+        """
+        Refreshes the auth token with `client.refresh_token`, unless another request
+        has already replaced the `expired` token.
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self.token == expired:
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, self.client.refresh_token)
+
+    # -------------------------------------------------------------------------
+    # Flow and task runs
+
+    async def create_flow_run(
+        self,
+        flow_id: str,
+        context: dict = None,
+        parameters: dict = None,
+        scheduled_start_time: datetime.datetime = None,
+        idempotency_key: str = None,
+    ) -> str:
+        """
+        Create a new flow run for the given flow id; see `Client.create_flow_run`.
+        """
+        mutation, variables = self.client._create_flow_run_query(
+            flow_id=flow_id,
+            context=context,
+            parameters=parameters,
+            scheduled_start_time=scheduled_start_time,
+            idempotency_key=idempotency_key,
+        )
+        res = await self.graphql(mutation, **variables)
+        return res.data.createFlowRun.flow_run.id
+
+    async def get_flow_run_info(
+        self, flow_run_id: str, include_task_runs: bool = True
+    ) -> FlowRunInfoResult:
+        """
+        Retrieves version and current state information for the given flow run; see
+        `Client.get_flow_run_info`.
+        """
+        query = self.client._get_flow_run_info_query(
+            flow_run_id, include_task_runs=include_task_runs
+        )
+        return self.client._get_flow_run_info_result(
+            await self.graphql(query), flow_run_id
+        )
+
+    async def get_flow_run_task_runs(
+        self, flow_run_id: str, task_slugs: Iterable[str]
+    ) -> List[TaskRunInfoResult]:
+        """
+        Retrieves version and current state information for the task runs of the given
+        tasks in a flow run; see `Client.get_flow_run_task_runs`.
+        """
+        query = self.client._get_flow_run_task_runs_query(
+            flow_run_id=flow_run_id, task_slugs=task_slugs
+        )
+        result = await self.graphql(query)
+        return list(self.client._iter_task_run_info_results(result.data.task_run))
+
+    async def update_flow_run_heartbeat(self, flow_run_id: str) -> None:
+        """
+        Convenience method for heartbeating a flow run; see
+        `Client.update_flow_run_heartbeat`.
+        """
+        mutation, variables = self.client._update_flow_run_heartbeat_query(flow_run_id)
+        await self.graphql(mutation, raise_on_error=False, **variables)
+
+    async def update_task_run_heartbeat(self, task_run_id: str) -> None:
+        """
+        Convenience method for heartbeating a task run; see
+        `Client.update_task_run_heartbeat`.
+        """
+        mutation, variables = self.client._update_task_run_heartbeat_query(task_run_id)
+        await self.graphql(mutation, raise_on_error=False, **variables)
+
+    async def set_flow_run_state(
+        self, flow_run_id: str, version: int, state: "prefect.engine.state.State"
+    ) -> None:
+        """
+        Sets new state for a flow run in the database; see `Client.set_flow_run_state`.
+        """
+        mutation, variables = self.client._set_flow_run_state_query(
+            flow_run_id=flow_run_id, version=version, state=state
+        )
+        await self.graphql(mutation, **variables)
+
+    async def get_latest_cached_states(
+        self, task_id: str, created_after: datetime.datetime
+    ) -> List["prefect.engine.state.State"]:
+        """
+        Pulls all Cached states for the given task which were created after the provided
+        date; see `Client.get_latest_cached_states`.
+        """
+        query = self.client._get_latest_cached_states_query(
+            task_id=task_id, created_after=created_after
+        )
+        return self.client._get_latest_cached_states_result(await self.graphql(query))
+
+    async def get_task_run_info(
+        self, flow_run_id: str, task_id: str, map_index: Optional[int] = None
+    ) -> TaskRunInfoResult:
+        """
+        Retrieves version and current state information for the given task run; see
+        `Client.get_task_run_info`.
+        """
+        mutation, variables = self.client._get_task_run_info_query(
+            flow_run_id=flow_run_id, task_id=task_id, map_index=map_index
+        )
+        return self.client._get_task_run_info_result(
+            await self.graphql(mutation, **variables), task_id
+        )
+
+    async def get_task_run_infos(
+        self, flow_run_id: str, task_id: str, map_indices: Iterable[int]
+    ) -> List[TaskRunInfoResult]:
+        """
+        Retrieves version and current state information for the task runs of many map
+        indices of a task at once; see `Client.get_task_run_infos`.  The requests for
+        each batch of map indices are sent concurrently.
+        """
+
+        async def get_batch(batch: List[int]) -> List[TaskRunInfoResult]:
+            mutation, variables = self.client._get_task_run_infos_query(
+                flow_run_id=flow_run_id, task_id=task_id, map_indices=batch
+            )
+            return self.client._get_task_run_infos_result(
+                await self.graphql(mutation, **variables),
+                task_id=task_id,
+                count=len(batch),
+            )
+
+        batches = await asyncio.gather(
+            *[get_batch(batch) for batch in _map_index_batches(list(map_indices))]
+        )
+        return [info for batch in batches for info in batch]
+
+    async def set_task_run_state(
+        self,
+        task_run_id: str,
+        version: int,
+        state: "prefect.engine.state.State",
+        cache_for: datetime.timedelta = None,
+    ) -> None:
+        """
+        Sets new state for a task run; see `Client.set_task_run_state`.
+        """
+        mutation, variables = self.client._set_task_run_state_query(
+            task_run_id=task_run_id, version=version, state=state
+        )
+        await self.graphql(mutation, **variables)
+
+    async def set_task_run_states(
+        self, updates: List[Tuple[str, int, "prefect.engine.state.State"]]
+    ) -> List[Optional[ClientError]]:
+        """
+        Sets new states for any number of task runs in a single GraphQL request; see
+        `Client.set_task_run_states`.
+        """
+        if not updates:
+            return []
+
+        mutation, variables = self.client._set_task_run_states_query(updates)
+        result = await self.graphql(mutation, raise_on_error=False, **variables)
+        return self.client._set_task_run_states_result(result, count=len(updates))
@@ -1,9 +1,24 @@
 import base64
+import collections
 import datetime
+import functools
 import json
 import logging
 import os
-from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Union
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import pendulum
 
@@ -12,14 +27,16 @@ from prefect.utilities.exceptions import AuthorizationError, ClientError
 from prefect.utilities.graphql import (
     EnumValue,
     GraphQLResult,
-    as_nested_dict,
+    PreparedQuery,
     parse_graphql,
+    prepare_graphql,
     with_args,
     compress,
 )
 
 if TYPE_CHECKING:
     import requests
+    import requests.adapters
     from prefect.core import Flow
 BuiltIn = Union[bool, dict, list, str, set, tuple]
 
@@ -44,10 +61,162 @@ FlowRunInfoResult = NamedTuple(
         ("version", int),
         ("scheduled_start_time", datetime.datetime),
         ("state", "prefect.engine.state.State"),
-        ("task_runs", List[TaskRunInfoResult]),
+        ("task_runs", Iterable[TaskRunInfoResult]),
     ],
 )
 
+# GraphQL documents of the requests made while running flows, compiled once; the values
+# which change from one request to the next are sent as variables
+
+_TASK_RUN_FIELDS = {
+    "task_run": {
+        "id": True,
+        "version": True,
+        "serialized_state": True,
+        "task": {"slug": True},
+    }
+}
+
+_UPDATE_FLOW_RUN_HEARTBEAT_MUTATION = prepare_graphql(
+    {
+        "mutation($input: updateFlowRunHeartbeatInput!)": {
+            "updateFlowRunHeartbeat(input: $input)": {"success"}
+        }
+    }
+)
+
+_UPDATE_TASK_RUN_HEARTBEAT_MUTATION = prepare_graphql(
+    {
+        "mutation($input: updateTaskRunHeartbeatInput!)": {
+            "updateTaskRunHeartbeat(input: $input)": {"success"}
+        }
+    }
+)
+
+_SET_FLOW_RUN_STATE_MUTATION = prepare_graphql(
+    {
+        "mutation($input: setFlowRunStateInput!)": {
+            "setFlowRunState(input: $input)": {"id"}
+        }
+    }
+)
+
+_SET_TASK_RUN_STATE_MUTATION = prepare_graphql(
+    {
+        "mutation($input: setTaskRunStateInput!)": {
+            "setTaskRunState(input: $input)": {"id"}
+        }
+    }
+)
+
+_GET_TASK_RUN_INFO_MUTATION = prepare_graphql(
+    {
+        "mutation($input: getOrCreateTaskRunInput!)": {
+            "getOrCreateTaskRun(input: $input)": _TASK_RUN_FIELDS
+        }
+    }
+)
+
+
+# requests are sent in batches of `cloud.flow_runs.map_batch_size` map indices, so only
+# the mutation for a full batch and the one for the last, partial batch are kept
+@functools.lru_cache(maxsize=2)
+def _get_task_run_infos_mutation(count: int) -> PreparedQuery:
+    """
+    The mutation creating or retrieving `count` task runs, with one `$input{i}` variable
+    for each.
+    """
+    variables = ", ".join(
+        "$input{}: getOrCreateTaskRunInput!".format(i) for i in range(count)
+    )
+    fields = collections.OrderedDict(
+        ("run{0}: getOrCreateTaskRun(input: $input{0})".format(i), _TASK_RUN_FIELDS)
+        for i in range(count)
+    )
+    return prepare_graphql({"mutation({})".format(variables): fields})
+
+
+def _map_index_batches(map_indices: List[int]) -> List[List[int]]:
+    """
+    Splits map indices into the batches whose task runs are retrieved with one request,
+    each of at most `cloud.flow_runs.map_batch_size` indices (0 sends a single batch).
+    """
+    size = prefect.config.cloud.flow_runs.map_batch_size or len(map_indices)
+    return [map_indices[i : i + size] for i in range(0, len(map_indices), size)]
+
+
+@functools.lru_cache(maxsize=128)
+def _set_task_run_states_mutation(count: int) -> PreparedQuery:
+    """
+    The mutation setting `count` task run states, with one `$input{i}` variable for each.
+    """
+    variables = ", ".join(
+        "$input{}: setTaskRunStateInput!".format(i) for i in range(count)
+    )
+    # the updates are applied in order, so their fields must be too
+    fields = collections.OrderedDict(
+        ("update{0}: setTaskRunState(input: $input{0})".format(i), {"id"})
+        for i in range(count)
+    )
+    return prepare_graphql({"mutation({})".format(variables): fields})
+
+
+# the fields of the task runs loaded with a flow run
+_TASK_RUN_INFO_FIELDS = {
+    "id": True,
+    "task": {"id": True, "slug": True},
+    "version": True,
+    "serialized_state": True,
+}
+
+# response status codes after which idempotent requests are retried
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# the requests Session shared by every Client in this process, and the id of the process
+# which created it
+_session = None  # type: Optional[requests.Session]
+_session_pid = None  # type: Optional[int]
+_session_lock = threading.Lock()
+
+
+def _get_session() -> "requests.Session":
+    """
+    Returns the `requests.Session` shared by every Client in this process, creating it on
+    first use.  The session keeps up to `cloud.http.pool_size` connections to each host
+    alive; its connection pool is thread-safe, so connections are reused across threads.
+    Because connections can't be shared with a forked child process, a new session is
+    created whenever this is called from a different process than the one which created
+    the current session.
+
+    Returns:
+        - requests.Session: the shared session
+    """
+    global _session, _session_pid
+
+    # lazy import for performance
+    import requests
+
+    pid = os.getpid()
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            pool_size = prefect.config.cloud.http.pool_size
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session, _session_pid = session, pid
+        return _session
+
+
+def _get_timeout() -> Optional[float]:
+    """
+    Returns the `timeout` passed to `requests`: `cloud.http.timeout` seconds, or `None`
+    (no timeout) if it's `0`.
+    """
+    return prefect.config.cloud.http.timeout or None
+
 
 class Client:
     """
@@ -159,30 +328,48 @@ class Client:
         Raises:
             - ClientError if there are errors raised by the GraphQL mutation
         """
-        result = self.post(
+        query = parse_graphql(query)
+        response = self._request(
+            method="POST",
             path="",
-            query=parse_graphql(query),
-            variables=json.dumps(variables),
+            params=dict(query=query, variables=json.dumps(variables)),
             server=self.graphql_server,
+            # queries can be safely retried, but mutations can't
+            idempotent=not query.lstrip().startswith("mutation"),
         )
+        result = response.json() if response.text else {}
 
         if raise_on_error and "errors" in result:
             raise ClientError(result["errors"])
         else:
-            return as_nested_dict(result, GraphQLResult)  # type: ignore
+            return GraphQLResult.wrap(result)
 
     def _request(
-        self, method: str, path: str, params: dict = None, server: str = None
+        self,
+        method: str,
+        path: str,
+        params: dict = None,
+        server: str = None,
+        idempotent: bool = None,
     ) -> "requests.models.Response":
         """
         Runs any specified request (GET, POST, DELETE) against the server
 
+        Requests are sent through a connection-pooled session shared by every Client in
+        the process.  Idempotent requests which fail to connect, time out, or receive a
+        `429`, `502`, `503` or `504` response are retried up to `cloud.http.max_retries`
+        times, waiting `cloud.http.backoff_factor` seconds before the first retry and
+        twice as long before each subsequent one.  Requests time out after
+        `cloud.http.timeout` seconds.
+
         Args:
             - method (str): The type of request to be made (GET, POST, DELETE)
             - path (str): Path of the API URL
             - params (dict, optional): Parameters used for the request
             - server (str, optional): The server to make requests against, base API
                 server is used if not specified
+            - idempotent (bool, optional): whether the request can be safely retried;
+                defaults to `True` for GET and DELETE requests and `False` otherwise
 
         Returns:
             - requests.models.Response: The response returned from the request
@@ -206,15 +393,24 @@ class Client:
 
         params = params or {}
 
+        if idempotent is None:
+            idempotent = method in ("GET", "DELETE")
+        session = _get_session()
+        timeout = _get_timeout()
+
         # write this as a function to allow reuse in next try/except block
         def request_fn() -> "requests.models.Response":
             headers = {"Authorization": "Bearer {}".format(self.token)}
             if method == "GET":
-                response = requests.get(url, headers=headers, params=params)
+                response = session.get(
+                    url, headers=headers, params=params, timeout=timeout
+                )
             elif method == "POST":
-                response = requests.post(url, headers=headers, json=params)
+                response = session.post(
+                    url, headers=headers, json=params, timeout=timeout
+                )
             elif method == "DELETE":
-                response = requests.delete(url, headers=headers)
+                response = session.delete(url, headers=headers, timeout=timeout)
             else:
                 raise ValueError("Invalid method: {}".format(method))
 
@@ -223,14 +419,39 @@ class Client:
 
             return response
 
-        # If a 401 status code is returned, refresh the login token
-        try:
-            return request_fn()
-        except requests.HTTPError as err:
-            if err.response.status_code == 401:
-                self.refresh_token()
+        def authorized_request_fn() -> "requests.models.Response":
+            # If a 401 status code is returned, refresh the login token
+            try:
                 return request_fn()
-            raise
+            except requests.HTTPError as err:
+                if err.response.status_code == 401:
+                    self.refresh_token()
+                    return request_fn()
+                raise
+
+        max_retries = prefect.config.cloud.http.max_retries if idempotent else 0
+        for attempt in range(max_retries + 1):
+            try:
+                return authorized_request_fn()
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.HTTPError,
+            ) as exc:
+                retryable = not isinstance(exc, requests.HTTPError) or (
+                    exc.response is not None
+                    and exc.response.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt == max_retries:
+                    raise
+                delay = prefect.config.cloud.http.backoff_factor * 2 ** attempt
+                self.logger.debug(
+                    "{} request to {} failed ({}); retrying in {} seconds...".format(
+                        method, url, exc, delay
+                    )
+                )
+                time.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
 
     # -------------------------------------------------------------------------
     # Auth
@@ -256,15 +477,13 @@ class Client:
             - AuthorizationError if unable to login to the server (request does not return `200`)
         """
 
-        # lazy import for performance
-        import requests
-
         # TODO: This needs to call the main graphql server and be adjusted for auth0
         url = os.path.join(self.graphql_server, "login_email")  # type: ignore
-        response = requests.post(
+        response = _get_session().post(
             url,
             auth=(email, password),
             json=dict(account_id=account_id, account_slug=account_slug),
+            timeout=_get_timeout(),
         )
 
         # Load the current auth token if able to login
@@ -291,13 +510,12 @@ class Client:
         """
         Refresh the auth token for this user on the server. It is only valid for fifteen minutes.
         """
-        # lazy import for performance
-        import requests
-
         # TODO: This needs to call the main graphql server
         url = os.path.join(self.graphql_server, "refresh_token")  # type: ignore
-        response = requests.post(
-            url, headers={"Authorization": "Bearer {}".format(self.token)}
+        response = _get_session().post(
+            url,
+            headers={"Authorization": "Bearer {}".format(self.token)},
+            timeout=_get_timeout(),
         )
         self.token = response.json().get("token")
 
@@ -434,6 +652,24 @@ class Client:
         Raises:
             - ClientError: if the GraphQL query is bad for any reason
         """
+        mutation, variables = self._create_flow_run_query(
+            flow_id=flow_id,
+            context=context,
+            parameters=parameters,
+            scheduled_start_time=scheduled_start_time,
+            idempotency_key=idempotency_key,
+        )
+        res = self.graphql(mutation, **variables)
+        return res.data.createFlowRun.flow_run.id  # type: ignore
+
+    def _create_flow_run_query(
+        self,
+        flow_id: str,
+        context: dict = None,
+        parameters: dict = None,
+        scheduled_start_time: datetime.datetime = None,
+        idempotency_key: str = None,
+    ) -> Tuple[dict, dict]:
         create_mutation = {
             "mutation($input: createFlowRunInput!)": {
                 "createFlowRun(input: $input)": {"flow_run": "id"}
@@ -450,41 +686,55 @@ class Client:
             inputs.update(
                 scheduledStartTime=scheduled_start_time.isoformat()
             )  # type: ignore
-        res = self.graphql(create_mutation, input=inputs)
-        return res.data.createFlowRun.flow_run.id  # type: ignore
+        return create_mutation, dict(input=inputs)
 
-    def get_flow_run_info(self, flow_run_id: str) -> FlowRunInfoResult:
+    def get_flow_run_info(
+        self, flow_run_id: str, include_task_runs: bool = True
+    ) -> FlowRunInfoResult:
         """
         Retrieves version and current state information for the given flow run.
 
         Args:
             - flow_run_id (str): the id of the flow run to get information for
+            - include_task_runs (bool, optional): whether to retrieve the flow run's task
+                runs; if `False`, `task_runs` is empty, and the task runs can be retrieved
+                in smaller parts with `get_flow_run_task_runs`.  Defaults to `True`
 
         Returns:
-            - GraphQLResult: a `DotDict` representing information about the flow run
+            - NamedTuple: a tuple containing `parameters, context, version,
+                scheduled_start_time, state, task_runs`, where `task_runs` is an iterator
+                of `TaskRunInfoResult`s which deserializes the state of each task run as
+                it's consumed
 
         Raises:
             - ClientError: if the GraphQL mutation is bad for any reason
         """
-        query = {
-            "query": {
-                with_args("flow_run_by_pk", {"id": flow_run_id}): {
-                    "parameters": True,
-                    "context": True,
-                    "version": True,
-                    "scheduled_start_time": True,
-                    "serialized_state": True,
-                    # load all task runs except dynamic task runs
-                    with_args("task_runs", {"where": {"map_index": {"_eq": -1}}}): {
-                        "id": True,
-                        "task": {"id": True, "slug": True},
-                        "version": True,
-                        "serialized_state": True,
-                    },
-                }
-            }
-        }
-        result = self.graphql(query).data.flow_run_by_pk  # type: ignore
+        query = self._get_flow_run_info_query(
+            flow_run_id, include_task_runs=include_task_runs
+        )
+        return self._get_flow_run_info_result(self.graphql(query), flow_run_id)
+
+    def _get_flow_run_info_query(
+        self, flow_run_id: str, include_task_runs: bool = True
+    ) -> dict:
+        fields = {
+            "parameters": True,
+            "context": True,
+            "version": True,
+            "scheduled_start_time": True,
+            "serialized_state": True,
+        }  # type: Dict[str, Any]
+        if include_task_runs:
+            # load all task runs except dynamic task runs
+            fields[
+                with_args("task_runs", {"where": {"map_index": {"_eq": -1}}})
+            ] = _TASK_RUN_INFO_FIELDS
+        return {"query": {with_args("flow_run_by_pk", {"id": flow_run_id}): fields}}
+
+    def _get_flow_run_info_result(
+        self, response: GraphQLResult, flow_run_id: str
+    ) -> FlowRunInfoResult:
+        result = response.data.flow_run_by_pk  # type: ignore
         if result is None:
             raise ClientError('Flow run ID not found: "{}"'.format(flow_run_id))
 
@@ -496,20 +746,60 @@ class Client:
             result.pop("serialized_state")
         )
 
-        # reformat task_runs
-        task_runs = []
-        for tr in result.task_runs:
-            tr.state = prefect.engine.state.State.deserialize(
-                tr.pop("serialized_state")
-            )
-            task_info = tr.pop("task")
-            tr.task_id = task_info["id"]
-            tr.task_slug = task_info["slug"]
-            task_runs.append(TaskRunInfoResult(**tr))
-
-        result.task_runs = task_runs
+        # task runs are reformatted, and their states deserialized, as they're consumed
+        result.task_runs = self._iter_task_run_info_results(result.get("task_runs", []))
         return FlowRunInfoResult(**result)
 
+    def get_flow_run_task_runs(
+        self, flow_run_id: str, task_slugs: Iterable[str]
+    ) -> List[TaskRunInfoResult]:
+        """
+        Retrieves version and current state information for the task runs of the given
+        tasks in a flow run, excluding dynamic (mapped) task runs.  Together with
+        `get_flow_run_info(flow_run_id, include_task_runs=False)`, this lets the task runs
+        of a large flow run be retrieved a part at a time.
+
+        Args:
+            - flow_run_id (str): the id of the flow run that these task runs live in
+            - task_slugs (Iterable[str]): the slugs of the tasks whose task runs to retrieve
+
+        Returns:
+            - List[NamedTuple]: a tuple containing `id, task_id, version, state` for each
+                task run found
+
+        Raises:
+            - ClientError: if the GraphQL query is bad for any reason
+        """
+        query = self._get_flow_run_task_runs_query(
+            flow_run_id=flow_run_id, task_slugs=task_slugs
+        )
+        return list(self._iter_task_run_info_results(self.graphql(query).data.task_run))
+
+    def _get_flow_run_task_runs_query(
+        self, flow_run_id: str, task_slugs: Iterable[str]
+    ) -> dict:
+        where_clause = {
+            "where": {
+                "flow_run_id": {"_eq": flow_run_id},
+                "map_index": {"_eq": -1},
+                "task": {"slug": {"_in": list(task_slugs)}},
+            }
+        }
+        return {"query": {with_args("task_run", where_clause): _TASK_RUN_INFO_FIELDS}}
+
+    def _iter_task_run_info_results(
+        self, task_runs: Iterable[Any]
+    ) -> Iterator[TaskRunInfoResult]:
+        deserializer = prefect.engine.state.State.deserialize
+        for tr in task_runs:
+            yield TaskRunInfoResult(
+                id=tr.id,
+                task_id=tr.task.id,
+                task_slug=tr.task.slug,
+                version=tr.version,
+                state=deserializer(tr.serialized_state),
+            )
+
     def update_flow_run_heartbeat(self, flow_run_id: str) -> None:
         """
         Convenience method for heartbeating a flow run.
@@ -520,14 +810,16 @@ class Client:
             - flow_run_id (str): the flow run ID to heartbeat
 
         """
-        mutation = {
-            "mutation": {
-                with_args(
-                    "updateFlowRunHeartbeat", {"input": {"flowRunId": flow_run_id}}
-                ): {"success"}
-            }
-        }
-        self.graphql(mutation, raise_on_error=False)
+        mutation, variables = self._update_flow_run_heartbeat_query(flow_run_id)
+        self.graphql(mutation, raise_on_error=False, **variables)
+
+    def _update_flow_run_heartbeat_query(
+        self, flow_run_id: str
+    ) -> Tuple[PreparedQuery, dict]:
+        return (
+            _UPDATE_FLOW_RUN_HEARTBEAT_MUTATION,
+            dict(input=dict(flowRunId=flow_run_id)),
+        )
 
     def update_task_run_heartbeat(self, task_run_id: str) -> None:
         """
@@ -539,14 +831,16 @@ class Client:
             - task_run_id (str): the task run ID to heartbeat
 
         """
-        mutation = {
-            "mutation": {
-                with_args(
-                    "updateTaskRunHeartbeat", {"input": {"taskRunId": task_run_id}}
-                ): {"success"}
-            }
-        }
-        self.graphql(mutation, raise_on_error=False)
+        mutation, variables = self._update_task_run_heartbeat_query(task_run_id)
+        self.graphql(mutation, raise_on_error=False, **variables)
+
+    def _update_task_run_heartbeat_query(
+        self, task_run_id: str
+    ) -> Tuple[PreparedQuery, dict]:
+        return (
+            _UPDATE_TASK_RUN_HEARTBEAT_MUTATION,
+            dict(input=dict(taskRunId=task_run_id)),
+        )
 
     def set_flow_run_state(
         self, flow_run_id: str, version: int, state: "prefect.engine.state.State"
@@ -562,24 +856,16 @@ class Client:
         Raises:
             - ClientError: if the GraphQL mutation is bad for any reason
         """
-        mutation = {
-            "mutation($state: JSON!)": {
-                with_args(
-                    "setFlowRunState",
-                    {
-                        "input": {
-                            "flowRunId": flow_run_id,
-                            "version": version,
-                            "state": EnumValue("$state"),
-                        }
-                    },
-                ): {"id"}
-            }
-        }
-
-        serialized_state = state.serialize()
+        mutation, variables = self._set_flow_run_state_query(
+            flow_run_id=flow_run_id, version=version, state=state
+        )
+        self.graphql(mutation, **variables)  # type: Any
 
-        self.graphql(mutation, state=serialized_state)  # type: Any
+    def _set_flow_run_state_query(
+        self, flow_run_id: str, version: int, state: "prefect.engine.state.State"
+    ) -> Tuple[PreparedQuery, dict]:
+        inputs = dict(flowRunId=flow_run_id, version=version, state=state.serialize())
+        return _SET_FLOW_RUN_STATE_MUTATION, dict(input=inputs)
 
     def get_latest_cached_states(
         self, task_id: str, created_after: datetime.datetime
@@ -594,6 +880,14 @@ class Client:
         Returns:
             - List[State]: a list of Cached states created after the given date
         """
+        query = self._get_latest_cached_states_query(
+            task_id=task_id, created_after=created_after
+        )
+        return self._get_latest_cached_states_result(self.graphql(query))
+
+    def _get_latest_cached_states_query(
+        self, task_id: str, created_after: datetime.datetime
+    ) -> dict:
         where_clause = {
             "where": {
                 "state": {"_eq": "Cached"},
@@ -602,8 +896,11 @@ class Client:
             },
             "order_by": {"state_timestamp": EnumValue("desc")},
         }
-        query = {"query": {with_args("task_run", where_clause): "serialized_state"}}
-        result = self.graphql(query)  # type: Any
+        return {"query": {with_args("task_run", where_clause): "serialized_state"}}
+
+    def _get_latest_cached_states_result(
+        self, result: Any
+    ) -> List["prefect.engine.state.State"]:
         deserializer = prefect.engine.state.State.deserialize
         valid_states = [
             deserializer(res.serialized_state) for res in result.data.task_run
@@ -628,29 +925,24 @@ class Client:
         Raises:
             - ClientError: if the GraphQL mutation is bad for any reason
         """
+        mutation, variables = self._get_task_run_info_query(
+            flow_run_id=flow_run_id, task_id=task_id, map_index=map_index
+        )
+        return self._get_task_run_info_result(
+            self.graphql(mutation, **variables), task_id
+        )
 
-        mutation = {
-            "mutation": {
-                with_args(
-                    "getOrCreateTaskRun",
-                    {
-                        "input": {
-                            "flowRunId": flow_run_id,
-                            "taskId": task_id,
-                            "mapIndex": -1 if map_index is None else map_index,
-                        }
-                    },
-                ): {
-                    "task_run": {
-                        "id": True,
-                        "version": True,
-                        "serialized_state": True,
-                        "task": {"slug": True},
-                    }
-                }
-            }
-        }
-        result = self.graphql(mutation)  # type: Any
+    def _get_task_run_info_query(
+        self, flow_run_id: str, task_id: str, map_index: Optional[int] = None
+    ) -> Tuple[PreparedQuery, dict]:
+        inputs = dict(
+            flowRunId=flow_run_id,
+            taskId=task_id,
+            mapIndex=-1 if map_index is None else map_index,
+        )
+        return _GET_TASK_RUN_INFO_MUTATION, dict(input=inputs)
+
+    def _get_task_run_info_result(self, result: Any, task_id: str) -> TaskRunInfoResult:
         task_run = result.data.getOrCreateTaskRun.task_run
 
         state = prefect.engine.state.State.deserialize(task_run.serialized_state)
@@ -662,6 +954,70 @@ class Client:
             state=state,
         )
 
+    def get_task_run_infos(
+        self, flow_run_id: str, task_id: str, map_indices: Iterable[int]
+    ) -> List[TaskRunInfoResult]:
+        """
+        Retrieves version and current state information for the task runs of many map
+        indices of a task at once, creating any which don't exist yet.  Task runs are
+        retrieved with one GraphQL request per `cloud.flow_runs.map_batch_size` map
+        indices.
+
+        Args:
+            - flow_run_id (str): the id of the flow run that these task runs live in
+            - task_id (str): the task id for these task runs
+            - map_indices (Iterable[int]): the mapping indices of the task runs
+
+        Returns:
+            - List[NamedTuple]: a tuple containing `id, task_id, version, state` for each
+                map index, in the order given
+
+        Raises:
+            - ClientError: if the GraphQL mutation is bad for any reason
+        """
+        infos = []  # type: List[TaskRunInfoResult]
+        for batch in _map_index_batches(list(map_indices)):
+            mutation, variables = self._get_task_run_infos_query(
+                flow_run_id=flow_run_id, task_id=task_id, map_indices=batch
+            )
+            infos.extend(
+                self._get_task_run_infos_result(
+                    self.graphql(mutation, **variables),
+                    task_id=task_id,
+                    count=len(batch),
+                )
+            )
+        return infos
+
+    def _get_task_run_infos_query(
+        self, flow_run_id: str, task_id: str, map_indices: List[int]
+    ) -> Tuple[PreparedQuery, dict]:
+        variables = {
+            "input{}".format(i): dict(
+                flowRunId=flow_run_id, taskId=task_id, mapIndex=map_index
+            )
+            for i, map_index in enumerate(map_indices)
+        }
+        return _get_task_run_infos_mutation(len(map_indices)), variables
+
+    def _get_task_run_infos_result(
+        self, result: Any, task_id: str, count: int
+    ) -> List[TaskRunInfoResult]:
+        infos = []
+        for i in range(count):
+            task_run = result.data["run{}".format(i)].task_run
+            state = prefect.engine.state.State.deserialize(task_run.serialized_state)
+            infos.append(
+                TaskRunInfoResult(
+                    id=task_run.id,
+                    task_id=task_id,
+                    task_slug=task_run.task.slug,
+                    version=task_run.version,
+                    state=state,
+                )
+            )
+        return infos
+
     def set_task_run_state(
         self,
         task_run_id: str,
@@ -682,24 +1038,71 @@ class Client:
         Raises:
             - ClientError: if the GraphQL mutation is bad for any reason
         """
-        mutation = {
-            "mutation($state: JSON!)": {
-                with_args(
-                    "setTaskRunState",
-                    {
-                        "input": {
-                            "taskRunId": task_run_id,
-                            "version": version,
-                            "state": EnumValue("$state"),
-                        }
-                    },
-                ): {"id"}
-            }
-        }
+        mutation, variables = self._set_task_run_state_query(
+            task_run_id=task_run_id, version=version, state=state
+        )
+        self.graphql(mutation, **variables)  # type: Any
+
+    def _set_task_run_state_query(
+        self, task_run_id: str, version: int, state: "prefect.engine.state.State"
+    ) -> Tuple[PreparedQuery, dict]:
+        inputs = dict(taskRunId=task_run_id, version=version, state=state.serialize())
+        return _SET_TASK_RUN_STATE_MUTATION, dict(input=inputs)
+
+    def set_task_run_states(
+        self, updates: List[Tuple[str, int, "prefect.engine.state.State"]]
+    ) -> List[Optional[ClientError]]:
+        """
+        Sets new states for any number of task runs in a single GraphQL request.
 
-        serialized_state = state.serialize()
+        Each update is an aliased `setTaskRunState` field of one mutation; the fields of a
+        mutation are executed in order, so several updates to the same task run are applied
+        in the order given, and each is checked against the version of the task run state
+        left by the updates before it.
 
-        self.graphql(mutation, state=serialized_state)  # type: Any
+        Args:
+            - updates (List[Tuple[str, int, State]]): the task run id, current version and
+                new state of each update
+
+        Returns:
+            - List[Optional[ClientError]]: for each update, the error it failed with, or
+                `None` if it succeeded
+
+        Raises:
+            - ClientError: if the request itself fails
+        """
+        if not updates:
+            return []
+
+        mutation, variables = self._set_task_run_states_query(updates)
+        result = self.graphql(mutation, raise_on_error=False, **variables)
+        return self._set_task_run_states_result(result, count=len(updates))
+
+    def _set_task_run_states_query(
+        self, updates: List[Tuple[str, int, "prefect.engine.state.State"]]
+    ) -> Tuple[PreparedQuery, dict]:
+        variables = {
+            "input{}".format(i): dict(
+                taskRunId=task_run_id, version=version, state=state.serialize()
+            )
+            for i, (task_run_id, version, state) in enumerate(updates)
+        }
+        return _set_task_run_states_mutation(len(updates)), variables
+
+    def _set_task_run_states_result(
+        self, result: Any, count: int
+    ) -> List[Optional[ClientError]]:
+        errors = [None] * count  # type: List[Optional[ClientError]]
+        for error in result.get("errors") or []:
+            path = error.get("path") or []
+            alias = path[0] if path else ""
+            if isinstance(alias, str) and alias.startswith("update"):
+                index = int(alias[len("update") :])
+                errors[index] = ClientError([error])
+            else:
+                # an error which can't be attributed to a single update fails them all
+                return [ClientError([error]) for _ in range(count)]
+        return errors
 
     def set_secret(self, name: str, value: Any) -> None:
         """
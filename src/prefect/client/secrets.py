@@ -1,10 +1,171 @@
 import json
 import os
-from typing import Any, Optional
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import prefect
 from prefect.client.client import Client
 from prefect.utilities.collections import as_nested_dict
+from prefect.utilities.graphql import prepare_graphql
+
+if TYPE_CHECKING:
+    from prefect.core import Flow
+
+_SECRET_VALUE_QUERY = prepare_graphql(
+    {"query($name: String!)": {"secretValue(name: $name)": True}}
+)
+
+# the values of Cloud secrets retrieved by this process, with the time they were
+# retrieved, by API server, auth token and name
+_cache = {}  # type: Dict[Tuple[Optional[str], Optional[str], str], Tuple[float, Any]]
+# the retrievals in progress, so that each secret is retrieved once however many threads
+# ask for it at the same time
+_pending = {}  # type: Dict[Tuple[Optional[str], Optional[str], str], Future]
+# held while `_cache` and `_pending` are read or updated, but not while secrets are
+# retrieved
+_cache_lock = threading.Lock()
+
+
+def _cache_key(name: str) -> Tuple[Optional[str], Optional[str], str]:
+    cloud = prefect.config.cloud
+    return (cloud.get("graphql"), cloud.get("auth_token"), name)
+
+
+def _get_cached(key: Tuple[Optional[str], Optional[str], str]) -> Tuple[bool, Any]:
+    ttl = prefect.config.cloud.secrets.cache_ttl
+    if key in _cache:
+        retrieved, value = _cache[key]
+        if time.monotonic() - retrieved < ttl:
+            return True, value
+    return False, None
+
+
+def _retrieve(names: List[str]) -> Dict[str, Any]:
+    """
+    Retrieves the values of the given Cloud secrets with a single request and caches
+    them, waiting for any which other threads are already retrieving.
+    """
+    keys = {name: _cache_key(name) for name in names}
+    values = {}  # type: Dict[str, Any]
+    waiting = {}  # type: Dict[str, Future]
+    retrieving = {}  # type: Dict[str, Future]
+    with _cache_lock:
+        for name, key in keys.items():
+            cached, value = _get_cached(key)
+            if cached:
+                values[name] = value
+            elif key in _pending:
+                waiting[name] = _pending[key]
+            else:
+                retrieving[name] = _pending[key] = Future()
+
+    if retrieving:
+        try:
+            retrieved = _query(sorted(retrieving))
+        except Exception as exc:
+            with _cache_lock:
+                for name, future in retrieving.items():
+                    del _pending[keys[name]]
+                    future.set_exception(exc)
+            raise
+
+        cache = prefect.config.cloud.secrets.cache_ttl > 0
+        with _cache_lock:
+            for name, future in retrieving.items():
+                if cache:
+                    _cache[keys[name]] = (time.monotonic(), retrieved[name])
+                del _pending[keys[name]]
+                future.set_result(retrieved[name])
+        values.update(retrieved)
+
+    for name, future in waiting.items():
+        values[name] = future.result()
+    return values
+
+
+def _query(names: List[str]) -> Dict[str, Any]:
+    if len(names) == 1:
+        result = Client().graphql(_SECRET_VALUE_QUERY, name=names[0])  # type: Any
+        return {names[0]: as_nested_dict(result.data.secretValue, dict)}
+
+    variables = {"name{}".format(i): name for i, name in enumerate(names)}  # type: dict
+    query = {
+        "query({})".format(
+            ", ".join("${}: String!".format(var) for var in variables)
+        ): [
+            "secret{0}: secretValue(name: ${1})".format(i, var)
+            for i, var in enumerate(variables)
+        ]
+    }
+    result = Client().graphql(query, **variables)
+    return {
+        name: as_nested_dict(result.data["secret{}".format(i)], dict)
+        for i, name in enumerate(names)
+    }
+
+
+def invalidate_secrets(names: Iterable[str] = None) -> None:
+    """
+    Removes secrets from the cache of Cloud secret values, so that the next `Secret.get()`
+    retrieves them from Cloud again.
+
+    Args:
+        - names (Iterable[str], optional): the names of the secrets to remove; if not
+            provided, every secret is removed
+    """
+    with _cache_lock:
+        if names is None:
+            _cache.clear()
+        else:
+            names = set(names)
+            for key in [key for key in _cache if key[2] in names]:
+                del _cache[key]
+
+
+def prefetch_secrets(names: Iterable[str]) -> None:
+    """
+    Retrieves the values of many Cloud secrets with a single request and caches them, so
+    that `Secret.get()` doesn't need a request of its own for any of them until they
+    expire.  Secrets which are already cached aren't retrieved again.
+
+    Does nothing if `cloud.use_local_secrets` is set, or if caching is disabled by setting
+    `cloud.secrets.cache_ttl` to 0.
+
+    Args:
+        - names (Iterable[str]): the names of the secrets to retrieve
+
+    Raises:
+        - ClientError: if the Client fails to retrieve the secrets
+    """
+    if (
+        prefect.config.cloud.use_local_secrets is True
+        or prefect.config.cloud.secrets.cache_ttl <= 0
+    ):
+        return
+
+    _retrieve(sorted(set(names)))
+
+
+def declared_secrets(flow: "Flow") -> Set[str]:
+    """
+    Returns the names of the secrets the tasks of a flow are configured to use: following
+    the convention of the task library, the string values of any task attributes whose
+    names end in `_secret`, such as `S3Download.aws_credentials_secret`.
+
+    Args:
+        - flow (Flow): the flow whose tasks to inspect
+
+    Returns:
+        - Set[str]: the names of the secrets
+    """
+    names = set()
+    for task in flow.tasks:
+        for attr, value in vars(task).items():
+            if attr.endswith("_secret") and isinstance(value, str):
+                names.add(value)
+    return names
 
 
 class Secret:
@@ -21,6 +182,12 @@ class Secret:
     If using local secrets, `Secret.get()` will attempt to call `json.loads` on the
     value pulled from context.  For this reason it is recommended to store local secrets as
     JSON documents to avoid ambiguous behavior (e.g., `"42"` being parsed as `42`).
+
+    If `cloud.secrets.cache_ttl` is set, secrets retrieved from Cloud are cached by each
+    process for that many seconds, for the API server and auth token they were retrieved
+    with, so that a secret used by many task runs is only retrieved once; use
+    `invalidate_secrets` to remove secrets from the cache, and `prefetch_secrets` to
+    retrieve many secrets with a single request.
     """
 
     def __init__(self, name: str):
@@ -58,13 +225,4 @@ class Secret:
             except (json.JSONDecodeError, TypeError):
                 return value
         else:
-            client = Client()
-            result = client.graphql(
-                """
-                query($name: String!) {
-                    secretValue(name: $name)
-                }
-                """,
-                name=self.name,
-            )  # type: Any
-            return as_nested_dict(result.data.secretValue, dict)
+            return _retrieve([self.name])[self.name]
@@ -12,6 +12,10 @@ and are used to determine whether to re-run the Task or use the cache.
 Note that _all_ validators take into account cache expiration.
 
 A cache validator returns `True` if the cache is still valid, and `False` otherwise.
+
+Custom validators always receive fully hydrated input `Result`s; the validators in this
+module only read the inputs they compare, so that no upstream results are read when a
+cache is validated on its expiration or parameters alone.
 """
 from typing import Any, Callable, Dict, Iterable
 
@@ -20,6 +24,20 @@ import pendulum
 import prefect
 
 
+def _load_inputs(inputs: Dict[str, Any], keys: Iterable[str] = None) -> None:
+    """
+    Hydrates (in place) any inputs which have not been read yet, so that they can be
+    compared against the inputs stored on a cached state.  Only the provided `keys` are
+    read; if none are provided, all inputs are read.
+    """
+    from prefect.engine.result import ResultInterface
+
+    for key, res in (inputs or {}).items():
+        if isinstance(res, ResultInterface):
+            if keys is None or key in keys:
+                inputs[key] = res.to_result()
+
+
 def never_use(
     state: "prefect.engine.state.Cached",
     inputs: Dict[str, Any],
@@ -88,7 +106,8 @@ def all_inputs(
     """
     if duration_only(state, inputs, parameters) is False:
         return False
-    elif state.cached_inputs == inputs:
+    _load_inputs(inputs)
+    if state.cached_inputs == inputs:
         return True
     else:
         return False
@@ -263,6 +282,7 @@ def partial_inputs_only(validate_on: Iterable[str] = None,) -> Callable:
                 True
             )  # if you dont want to validate on anything, then the cache is valid
         else:
+            _load_inputs(inputs, keys=validate_on)
             cached = state.cached_inputs or {}
             partial_provided = {
                 key: value for key, value in inputs.items() if key in validate_on
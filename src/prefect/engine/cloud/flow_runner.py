@@ -1,16 +1,171 @@
+import threading
 import warnings
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from collections.abc import MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import prefect
 from prefect.client import Client
+from prefect.client.client import TaskRunInfoResult
+from prefect.client.secrets import declared_secrets, prefetch_secrets
 from prefect.core import Flow, Task
 from prefect.engine.cloud import CloudTaskRunner
-from prefect.engine.cloud.utilities import prepare_state_for_cloud
+from prefect.engine.cloud.utilities import forget_flow_run, prepare_state_for_cloud
 from prefect.engine.flow_runner import FlowRunner, FlowRunnerInitializeResult
 from prefect.engine.runner import ENDRUN
 from prefect.engine.state import Failed, State
 
 
+class _TaskRunPages:
+    """
+    Retrieves the task runs of a flow run in pages of tasks, in the order in which the
+    flow runner submits the tasks, from a background thread.  Each page is merged into
+    the task states and contexts of the run when one of its tasks is first looked up, so
+    that tasks wait only for their own page.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        flow_run_id: str,
+        tasks: List[Task],
+        page_size: int,
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+    ) -> None:
+        self.client = client
+        self.flow_run_id = flow_run_id
+        self.pages = [tasks[i : i + page_size] for i in range(0, len(tasks), page_size)]
+        self.page_index = {
+            task: i for i, page in enumerate(self.pages) for task in page
+        }
+        self.merged = set()  # type: Set[int]
+        self.lock = threading.Lock()
+        self.task_states = task_states
+        self.task_contexts = task_contexts
+
+        # a single thread retrieves the pages one after another; it exits after the last
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.futures = [
+            executor.submit(self.fetch, page) for page in self.pages
+        ]  # type: List[Future]
+        executor.shutdown(wait=False)
+
+    def fetch(self, page: List[Task]) -> List[TaskRunInfoResult]:
+        return self.client.get_flow_run_task_runs(
+            flow_run_id=self.flow_run_id, task_slugs=[task.slug for task in page]
+        )
+
+    def wait(self, task: Any) -> None:
+        """
+        Waits until the page of the given task has been retrieved and merged.
+        """
+        index = self.page_index.get(task)
+        if index is None or index in self.merged:
+            return
+
+        with self.lock:
+            if index in self.merged:
+                return
+            page = self.pages[index]
+            try:
+                task_runs = self.futures[index].result()
+            except Exception:
+                # try again, raising the error if it fails twice
+                task_runs = self.fetch(page)
+
+            tasks = {t.slug: t for t in page}
+            for task_run in task_runs:
+                task = tasks[task_run.task_slug]
+                self.task_states.setdefault(task, task_run.state)
+                self.task_contexts.setdefault(task, {}).update(
+                    task_run_id=task_run.id,
+                    task_run_version=task_run.version,
+                    task_id=task_run.task_id,
+                )
+            self.merged.add(index)
+
+    def wait_all(self) -> None:
+        """
+        Waits until every page has been retrieved and merged.
+        """
+        for page in self.pages:
+            self.wait(page[0])
+
+    def cancel(self) -> None:
+        """
+        Cancels the retrieval of any pages which haven't been requested yet.
+        """
+        for future in self.futures:
+            future.cancel()
+
+
+class _TaskStates(MutableMapping):
+    """
+    The task states of a run whose task runs are retrieved in pages: reading or writing
+    the state of a task first waits for its page, so that states from Cloud never replace
+    states set by the flow runner, and iterating over the states waits for every page.
+    """
+
+    def __init__(self, data: Dict[Task, Any], pages: _TaskRunPages) -> None:
+        self._data = data
+        self._pages = pages
+
+    def __getitem__(self, task: Any) -> Any:
+        self._pages.wait(task)
+        return self._data[task]
+
+    def __setitem__(self, task: Any, value: Any) -> None:
+        self._pages.wait(task)
+        self._data[task] = value
+
+    def __delitem__(self, task: Any) -> None:
+        self._pages.wait(task)
+        del self._data[task]
+
+    def __iter__(self) -> Iterator:
+        self._pages.wait_all()
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        self._pages.wait_all()
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return "<{}: {!r}>".format(type(self).__name__, self.copy())
+
+    def copy(self) -> Dict[Task, Any]:
+        self._pages.wait_all()
+        return dict(self._data)
+
+
+class _TaskContexts(_TaskStates):
+    """
+    The task contexts of a run whose task runs are retrieved in pages: reading the
+    context of a task first waits for its page.  Contexts can be added without waiting,
+    since the ids from Cloud are merged into them.
+    """
+
+    def __setitem__(self, task: Any, value: Any) -> None:
+        with self._pages.lock:
+            self._data[task] = value
+
+    def setdefault(self, task: Any, default: Any = None) -> Any:
+        with self._pages.lock:
+            return self._data.setdefault(task, default)
+
+
 class CloudFlowRunner(FlowRunner):
     """
     FlowRunners handle the execution of Flows and determine the State of a Flow
@@ -57,10 +212,47 @@ class CloudFlowRunner(FlowRunner):
 
     def __init__(self, flow: Flow, state_handlers: Iterable[Callable] = None) -> None:
         self.client = Client()
+        self._task_run_pages = None  # type: Optional[_TaskRunPages]
         super().__init__(
             flow=flow, task_runner_cls=CloudTaskRunner, state_handlers=state_handlers
         )
 
+    def run(
+        self,
+        state: State = None,
+        task_states: Dict[Task, State] = None,
+        return_tasks: Iterable[Task] = None,
+        parameters: Dict[str, Any] = None,
+        task_runner_state_handlers: Iterable[Callable] = None,
+        executor: "prefect.engine.executors.Executor" = None,
+        context: Dict[str, Any] = None,
+        task_contexts: Dict[Task, Dict[str, Any]] = None,
+    ) -> State:
+        """
+        The main endpoint for FlowRunners; see `FlowRunner.run`.  If the run ends before
+        every page of its task runs has been retrieved, the rest aren't retrieved.  Once
+        the run is over, the payloads it wrote are forgotten (see `forget_flow_run`).
+
+        Returns:
+            - State: `State` representing the final post-run state of the `Flow`.
+        """
+        try:
+            return super().run(
+                state=state,
+                task_states=task_states,
+                return_tasks=return_tasks,
+                parameters=parameters,
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+                context=context,
+                task_contexts=task_contexts,
+            )
+        finally:
+            if self._task_run_pages is not None:
+                self._task_run_pages.cancel()
+                self._task_run_pages = None
+            forget_flow_run(prefect.context.get("flow_run_id"))
+
     def _heartbeat(self) -> None:
         try:
             flow_run_id = prefect.context.get("flow_run_id")
@@ -139,9 +331,12 @@ class CloudFlowRunner(FlowRunner):
 
         # load id from context
         flow_run_id = prefect.context.get("flow_run_id")
+        page_size = prefect.config.cloud.flow_runs.task_run_page_size
 
         try:
-            flow_run_info = self.client.get_flow_run_info(flow_run_id)
+            flow_run_info = self.client.get_flow_run_info(
+                flow_run_id, include_task_runs=not page_size
+            )
         except Exception as exc:
             self.logger.debug(
                 "Failed to retrieve flow state with error: {}".format(repr(exc))
@@ -159,17 +354,41 @@ class CloudFlowRunner(FlowRunner):
             scheduled_start_time=flow_run_info.scheduled_start_time,
         )
 
-        tasks = {t.slug: t for t in self.flow.tasks}
-        # update task states and contexts
-        for task_run in flow_run_info.task_runs:
-            task = tasks[task_run.task_slug]
-            task_states.setdefault(task, task_run.state)
-            task_contexts.setdefault(task, {}).update(
-                task_run_id=task_run.id,
-                task_run_version=task_run.version,
-                task_id=task_run.task_id,
+        # retrieve the secrets the flow's tasks use with one request, rather than one
+        # request for each of them when they're first used
+        try:
+            prefetch_secrets(declared_secrets(self.flow))
+        except Exception as exc:
+            self.logger.debug(
+                "Failed to prefetch secrets with error: {}".format(repr(exc))
             )
 
+        if page_size:
+            # the task runs are retrieved in the background, in pages of tasks in the
+            # order they're submitted, so that the first tasks can start right away
+            pages = _TaskRunPages(
+                client=self.client,
+                flow_run_id=flow_run_id,
+                tasks=list(self.flow.sorted_tasks()),
+                page_size=page_size,
+                task_states=task_states,
+                task_contexts=task_contexts,
+            )
+            self._task_run_pages = pages
+            task_states = _TaskStates(task_states, pages=pages)  # type: ignore
+            task_contexts = _TaskContexts(task_contexts, pages=pages)  # type: ignore
+        else:
+            tasks = {t.slug: t for t in self.flow.tasks}
+            # update task states and contexts
+            for task_run in flow_run_info.task_runs:
+                task = tasks[task_run.task_slug]
+                task_states.setdefault(task, task_run.state)
+                task_contexts.setdefault(task, {}).update(
+                    task_run_id=task_run.id,
+                    task_run_version=task_run.version,
+                    task_id=task_run.task_id,
+                )
+
         # if state is set, keep it; otherwise load from Cloud
         state = state or flow_run_info.state  # type: ignore
 
@@ -7,11 +7,9 @@ import base64
 import tempfile
 from typing import Any, Optional
 
-import cloudpickle
-
 from prefect import config
 from prefect.client.client import Client
-from prefect.engine.result_handlers import ResultHandler
+from prefect.engine.result_handlers import ResultHandler, serializers
 
 
 class CloudResultHandler(ResultHandler):
@@ -22,10 +20,22 @@ class CloudResultHandler(ResultHandler):
         - result_handler_service (str, optional): the location of the service
             which will further process and store the results; if not provided, will default to
             the value of `cloud.result_handler` in your config file
+        - serializer (str, optional): the name of the serializer used to write results (see
+            `prefect.engine.result_handlers.serializers`); defaults to `"pickle"`
+        - compression (str, optional): the name of the compression codec used to write
+            results, such as `"gzip"` or `"lzma"`; defaults to no compression
     """
 
-    def __init__(self, result_handler_service: str = None) -> None:
+    def __init__(
+        self,
+        result_handler_service: str = None,
+        serializer: str = "pickle",
+        compression: str = None,
+    ) -> None:
+        serializers.validate(serializer, compression)
         self._client = None  # type: Optional[Client]
+        self.serializer = serializer
+        self.compression = compression
         if result_handler_service is None:
             self.result_handler_service = config.cloud.result_handler
         else:
@@ -62,7 +72,7 @@ class CloudResultHandler(ResultHandler):
         )
 
         try:
-            return_val = cloudpickle.loads(base64.b64decode(res.get("result", "")))
+            return_val = serializers.loads(base64.b64decode(res.get("result", "")))
         except EOFError:
             return_val = None
         self.logger.debug("Finished reading result from {}...".format(uri))
@@ -81,7 +91,10 @@ class CloudResultHandler(ResultHandler):
         """
         self._initialize_client()
 
-        binary_data = base64.b64encode(cloudpickle.dumps(result)).decode()
+        # results are sent to Cloud as base64 encoded text
+        binary_data = base64.b64encode(
+            serializers.dumps(result, self.serializer, self.compression)
+        ).decode()
         self.logger.debug(
             "Starting to upload result to {}...".format(self.result_handler_service)
         )
@@ -1,12 +1,16 @@
 import copy
 import datetime
 import warnings
+from concurrent.futures import Future
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import prefect
 from prefect.client import Client
 from prefect.core import Edge, Task
-from prefect.engine.cloud.utilities import prepare_state_for_cloud
+from prefect.engine.cloud.utilities import (
+    get_state_update_batcher,
+    prepare_state_for_cloud,
+)
 from prefect.engine.result import NoResult, Result
 from prefect.engine.result_handlers import ResultHandler
 from prefect.engine.runner import ENDRUN, call_state_handlers
@@ -44,6 +48,7 @@ class CloudTaskRunner(TaskRunner):
         result_handler: ResultHandler = None,
     ) -> None:
         self.client = Client()
+        self._pending_state_updates = []  # type: List[Future]
         super().__init__(
             task=task, state_handlers=state_handlers, result_handler=result_handler
         )
@@ -83,14 +88,27 @@ class CloudTaskRunner(TaskRunner):
         task_run_id = prefect.context.get("task_run_id")
         version = prefect.context.get("task_run_version")
 
+        # results must be durably stored before the state referencing them is reported;
+        # if storing them fails, the task run fails instead
         try:
             cloud_state = prepare_state_for_cloud(new_state)
-            self.client.set_task_run_state(
-                task_run_id=task_run_id,
-                version=version,
-                state=cloud_state,
-                cache_for=self.task.cache_for,
-            )
+        except Exception as exc:
+            msg = "Exception raised while storing task results: {}".format(repr(exc))
+            self.logger.debug(msg)
+            if raise_on_exception:
+                raise exc
+            new_state = cloud_state = Failed(msg, result=exc)
+
+        try:
+            if prefect.config.cloud.state_updates.batch:
+                self._submit_state_update(task_run_id, version, cloud_state)
+            else:
+                self.client.set_task_run_state(
+                    task_run_id=task_run_id,
+                    version=version,
+                    state=cloud_state,
+                    cache_for=self.task.cache_for,
+                )
         except Exception as exc:
             self.logger.debug(
                 "Failed to set task state with error: {}".format(repr(exc))
@@ -102,6 +120,36 @@ class CloudTaskRunner(TaskRunner):
 
         return new_state
 
+    def _submit_state_update(
+        self, task_run_id: str, version: int, state: State
+    ) -> None:
+        """
+        Queues a state update with the process's `StateUpdateBatcher`.
+
+        Running and (unscheduled) pending states are reported optimistically: the task run
+        carries on without waiting for them to be applied, and if any of them has already
+        failed by the next state change, its error is raised then.  Every other state ends
+        or hands off the task run, so this waits for it, and every update before it, to be
+        applied.
+
+        Raises:
+            - Exception: the error of any failed state update
+        """
+        future = get_state_update_batcher().submit(task_run_id, version, state)
+        self._pending_state_updates.append(future)
+        if state.is_running() or (state.is_pending() and not state.is_scheduled()):
+            pending = []
+            for update in self._pending_state_updates:
+                if update.done():
+                    update.result()
+                else:
+                    pending.append(update)
+            self._pending_state_updates = pending
+        else:
+            pending, self._pending_state_updates = self._pending_state_updates, []
+            for update in pending:
+                update.result()
+
     def initialize_run(  # type: ignore
         self, state: Optional[State], context: Dict[str, Any]
     ) -> TaskRunnerInitializeResult:
@@ -117,9 +165,9 @@ class CloudTaskRunner(TaskRunner):
         """
 
         # if the map_index is not None, this is a dynamic task and we need to load
-        # task run info for it
+        # task run info for it, unless its parent already has
         map_index = context.get("map_index")
-        if map_index not in [-1, None]:
+        if map_index not in [-1, None] and context.get("task_run_id") is None:
             try:
                 task_run_info = self.client.get_task_run_info(
                     flow_run_id=context.get("flow_run_id", ""),
@@ -150,6 +198,64 @@ class CloudTaskRunner(TaskRunner):
 
         return super().initialize_run(state=state, context=context)
 
+    def initialize_mapped_runs(
+        self, initial_states: List[Optional[State]], context: Dict[str, Any]
+    ) -> Tuple[List[Optional[State]], List[Dict[str, Any]]]:
+        """
+        Prepares the children of a mapped task for execution, retrieving (or creating) the
+        task runs of every child with a single request to Prefect Cloud.  Each child is
+        given its task run id and version through its context, along with the state from the
+        database if it doesn't already have one.
+
+        If the task runs can't be retrieved in bulk, each child retrieves its own when it
+        starts, as in `initialize_run`.
+
+        Args:
+            - initial_states (List[Optional[State]]): the initial state of each child, in
+                order of map index; `None` if the child doesn't have one yet
+            - context (Dict[str, Any]): the context of the mapped task
+
+        Returns:
+            - Tuple[List[Optional[State]], List[Dict[str, Any]]]: the initial state and the
+                context of each child
+        """
+        initial_states, contexts = super().initialize_mapped_runs(
+            initial_states=initial_states, context=context
+        )
+        # children inherit the mapped task's context, which refers to its own task run
+        for map_context in contexts:
+            map_context.pop("task_run_id", None)
+            map_context.pop("task_run_version", None)
+
+        try:
+            task_run_infos = self.client.get_task_run_infos(
+                flow_run_id=context.get("flow_run_id", ""),
+                task_id=context.get("task_id", ""),
+                map_indices=range(len(contexts)),
+            )
+            if len(task_run_infos) != len(contexts):
+                raise ValueError(
+                    "Expected {} task runs, got {}".format(
+                        len(contexts), len(task_run_infos)
+                    )
+                )
+        except Exception as exc:
+            self.logger.debug(
+                "Failed to retrieve mapped task runs with error: {}".format(repr(exc))
+            )
+            return initial_states, contexts
+
+        states = []  # type: List[Optional[State]]
+        for state, map_context, task_run_info in zip(
+            initial_states, contexts, task_run_infos
+        ):
+            # if state was provided, keep it; otherwise use the one from db
+            states.append(state or task_run_info.state)
+            map_context.update(
+                task_run_id=task_run_info.id, task_run_version=task_run_info.version
+            )
+        return states, contexts
+
     @call_state_handlers
     def check_task_is_cached(self, state: State, inputs: Dict[str, Result]) -> State:
         """
@@ -187,6 +293,8 @@ class CloudTaskRunner(TaskRunner):
                     )
                 )
 
+            if cached_states:
+                self.load_inputs_for_cache_validator(inputs)
             for candidate_state in cached_states:
                 assert isinstance(candidate_state, Cached)  # mypy assert
                 if self.task.cache_validator(
@@ -1,4 +1,218 @@
+import collections
+import hashlib
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import cloudpickle
+
+import prefect
+import prefect.client
+from prefect.engine.result import NoResult, Result, ResultInterface, SafeResult
 from prefect.engine.state import State
+from prefect.utilities.executors import io_map
+
+# the number of flow runs whose written results are remembered by each process; the
+# process running a flow run forgets it once it finishes (see `forget_flow_run`)
+_MAX_TRACKED_RUNS = 16
+
+
+# stands in for the value of a payload which is no longer held anywhere
+_GONE = object()
+
+
+class _Payload:
+    """
+    A payload which has been (or is being) written with a result handler during a flow run.
+
+    Only a weak reference to the payload is kept: to its value where the value's type
+    allows it, and otherwise to the result holding it.  Later references to the payload
+    are matched by identity while it's still alive, and by content digest (computed only
+    when needed) once another payload of the same shape is written.
+
+    Args:
+        - result (Result): the result whose value is being written
+        - future (Future): a future which resolves to the `SafeResult` of the write
+    """
+
+    def __init__(self, result: Result, future: Future) -> None:
+        self.result_handler = result.result_handler
+        self.future = future
+        self.digest = None  # type: Optional[str]
+        try:
+            self.ref = weakref.ref(result.value)  # type: weakref.ref
+            self.holds_value = True
+        except TypeError:
+            self.ref = weakref.ref(result)
+            self.holds_value = False
+
+    def get_value(self) -> Any:
+        obj = self.ref()
+        if obj is None:
+            return _GONE
+        return obj if self.holds_value else obj.value
+
+    def value_is(self, value: Any) -> bool:
+        return self.get_value() is value
+
+    def compute_digest(self) -> None:
+        value = self.get_value()
+        if self.digest is None:
+            # payloads which are gone can't be compared
+            self.digest = "" if value is _GONE else _content_digest(value)
+
+
+# flow run id -> payload shape -> payloads written during the run
+_written = (
+    collections.OrderedDict()
+)  # type: collections.OrderedDict[Any, Dict[Tuple[type, Optional[int]], List[_Payload]]]
+_written_lock = threading.Lock()
+
+
+class _HashWriter:
+    """
+    A write-only file object which hashes everything written to it.
+    """
+
+    def __init__(self) -> None:
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return len(data)
+
+
+def _content_digest(value: Any) -> str:
+    """
+    Returns a digest of the pickled `value`, hashed as it's serialized, or an empty string
+    if the value can't be pickled.
+    """
+    writer = _HashWriter()
+    try:
+        cloudpickle.dump(value, writer)
+    except Exception:
+        return ""
+    return writer.hash.hexdigest()
+
+
+def _shape(value: Any) -> Tuple[type, Optional[int]]:
+    """
+    Returns a cheap key which is equal for any two equal payloads.
+    """
+    try:
+        return type(value), len(value)
+    except Exception:
+        return type(value), None
+
+
+def _store_once(res: ResultInterface) -> None:
+    """
+    Stores the safe value of the provided result, reusing the `SafeResult` of any identical
+    payload already written with an equal result handler during the current flow run.
+
+    Payloads are first matched by identity.  Separate copies of the same upstream result
+    (for example, after being shipped to different workers) are matched by content digest,
+    which is only computed once another payload of the same type and length has been
+    written, so each payload is written only once per process.  If the same payload is
+    being written by another thread, this waits for that write to finish instead of
+    starting a new one.
+
+    Args:
+        - res (ResultInterface): the result to store
+    """
+    run_id = prefect.context.get("flow_run_id")
+    if (
+        not isinstance(res, Result)
+        or res.safe_value != NoResult
+        or res.result_handler is None
+        or run_id is None
+    ):
+        res.store_safe_value()
+        return
+
+    shape = _shape(res.value)
+    digest = None  # type: Optional[str]
+    while True:
+        with _written_lock:
+            run = _written.get(run_id)
+            if run is None:
+                run = _written[run_id] = {}
+                while len(_written) > _MAX_TRACKED_RUNS:
+                    _written.popitem(last=False)
+            payloads = run.setdefault(shape, [])
+            # payloads which are gone and couldn't be hashed can never be matched again
+            payloads[:] = [
+                p
+                for p in payloads
+                if p.digest != "" or not p.future.done() or p.get_value() is not _GONE
+            ]
+            candidates = [p for p in payloads if p.result_handler == res.result_handler]
+            match = next((p for p in candidates if p.value_is(res.value)), None)
+            if match is None and digest:
+                match = next((p for p in candidates if p.digest == digest), None)
+            unhashed = [p for p in candidates if p.digest is None]
+            if (
+                match is None
+                and (digest is not None or not candidates)
+                and not unhashed
+            ):
+                payload = _Payload(res, Future())
+                payload.digest = digest
+                payload.future.set_running_or_notify_cancel()
+                payloads.append(payload)
+                break
+
+        if match is not None:
+            # this payload has been (or is being) written by another reference to it
+            safe_value = match.future.result()  # type: SafeResult
+            res.safe_value = SafeResult(
+                value=safe_value.value, result_handler=res.result_handler
+            )
+            return
+
+        # another payload of the same shape has been written; compare their contents
+        if digest is None:
+            digest = _content_digest(res.value)
+        for other in unhashed:
+            other.compute_digest()
+
+    try:
+        res.store_safe_value()
+    except Exception as exc:
+        # forget the failed write so that later references can try again
+        with _written_lock:
+            payloads.remove(payload)
+        payload.future.set_exception(exc)
+        raise
+    payload.future.set_result(res.safe_value)
+
+
+def forget_flow_run(flow_run_id: Any) -> None:
+    """
+    Forgets the payloads written during a flow run, once it has finished.
+
+    Args:
+        - flow_run_id (Any): the id of the flow run
+    """
+    with _written_lock:
+        _written.pop(flow_run_id, None)
+
+
+def _same_payload(first: ResultInterface, second: ResultInterface) -> bool:
+    if first is second:
+        return True
+    return (
+        isinstance(first, Result)
+        and isinstance(second, Result)
+        and first.safe_value == NoResult
+        and second.safe_value == NoResult
+        and first.result_handler is not None
+        and first.value is second.value
+        and first.result_handler == second.result_handler
+    )
 
 
 def prepare_state_for_cloud(state: State) -> State:
@@ -6,19 +220,150 @@ def prepare_state_for_cloud(state: State) -> State:
     Prepares a Prefect State for being sent to Cloud; this ensures that any data attributes
     are properly handled prior to being shipped off to a database.
 
+    Any results which still need to be stored are written concurrently through the shared
+    I/O pool.  Within a flow run, each distinct payload is written at most once per result
+    handler, and every later reference to it reuses the stored `SafeResult`.  This function
+    only returns once every write has completed, so the state is never reported before its
+    data is durable; if any write fails, its error is raised.
+
     Args:
         - state (State): the Prefect State to prepare
 
     Returns:
         - State: a sanitized copy of the original state
     """
+    to_store = []
+
     if state.is_cached():
-        state._result.store_safe_value()
+        to_store.append(state._result)
 
     if (
         hasattr(state, "cached_inputs")
         and state.cached_inputs is not None  # type: ignore
     ):
-        for res in state.cached_inputs.values():  # type: ignore
-            res.store_safe_value()
+        to_store.extend(state.cached_inputs.values())  # type: ignore
+
+    # the same payload can be referenced more than once (for example, when one upstream
+    # task feeds several arguments); only write it once
+    groups = []  # type: List[List[ResultInterface]]
+    for res in to_store:
+        group = next((g for g in groups if _same_payload(g[0], res)), None)
+        if group is None:
+            groups.append([res])
+        else:
+            group.append(res)
+
+    io_map(_store_once, [group[0] for group in groups])
+    for first, *others in groups:
+        for res in others:
+            if res is not first and isinstance(res, Result):
+                assert isinstance(first, Result) and res.result_handler  # mypy assert
+                res.safe_value = SafeResult(
+                    value=first.safe_value.value, result_handler=res.result_handler
+                )
     return state
+
+
+class StateUpdateBatcher:
+    """
+    Sends the task run state updates submitted by any number of threads to Prefect Cloud
+    in batches, from a single background thread.
+
+    Updates are queued as they're submitted; whenever the queue isn't empty, the background
+    thread waits `cloud.state_updates.batch_interval` seconds for more updates, then sends
+    up to `cloud.state_updates.max_batch_size` of them with one `setTaskRunStates` request
+    (see `Client.set_task_run_states`).  Updates that arrive while a request is in flight
+    form the next batch.  Because batches are sent one at a time, in the order their updates
+    were submitted, and Cloud checks every update against the version of its task run,
+    updates to each task run are applied in order; once one fails, the updates to the same
+    task run queued after it fail too.
+
+    Args:
+        - client (Client, optional): the client used to send updates; defaults to a new
+            `Client`
+    """
+
+    def __init__(self, client: "prefect.client.Client" = None) -> None:
+        self.client = client or prefect.client.Client()
+        self._queue = []  # type: List[Tuple[str, int, State, Future]]
+        self._condition = threading.Condition()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def submit(self, task_run_id: str, version: int, state: State) -> Future:
+        """
+        Queues a task run state update.
+
+        Args:
+            - task_run_id (str): the id of the task run to set state for
+            - version (int): the current version of the task run state
+            - state (State): the new state for this task run
+
+        Returns:
+            - Future: a future which resolves once the update has been applied, or raises
+                the error it failed with
+        """
+        future = Future()  # type: Future
+        future.set_running_or_notify_cancel()
+        with self._condition:
+            self._queue.append((task_run_id, version, state, future))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="prefect-state-updates", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+            interval = prefect.config.cloud.state_updates.batch_interval
+            if interval:
+                time.sleep(interval)
+            size = prefect.config.cloud.state_updates.max_batch_size
+            with self._condition:
+                batch, self._queue = self._queue[:size], self._queue[size:]
+            self._send(batch)
+
+    def _send(self, batch: List[Tuple[str, int, State, Future]]) -> None:
+        try:
+            errors = self.client.set_task_run_states(
+                [
+                    (task_run_id, version, state)
+                    for task_run_id, version, state, _ in batch
+                ]
+            )  # type: List[Any]
+        except Exception as exc:
+            errors = [exc] * len(batch)
+        for (_, _, _, future), error in zip(batch, errors):
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+
+# the StateUpdateBatcher shared by every task run in this process, and the id of the
+# process which created it
+_batcher = None  # type: Optional[StateUpdateBatcher]
+_batcher_pid = None  # type: Optional[int]
+_batcher_lock = threading.Lock()
+
+
+def get_state_update_batcher() -> StateUpdateBatcher:
+    """
+    Returns the `StateUpdateBatcher` shared by every task run in this process, creating it
+    on first use (and again in any forked child process, which doesn't inherit the
+    background thread).
+
+    Returns:
+        - StateUpdateBatcher: the shared batcher
+    """
+    global _batcher, _batcher_pid
+
+    pid = os.getpid()
+    with _batcher_lock:
+        if _batcher is None or _batcher_pid != pid:
+            _batcher, _batcher_pid = StateUpdateBatcher(), pid
+        return _batcher
@@ -1,3 +1,10 @@
+import collections
+import contextlib
+import copy
+import shutil
+import tempfile
+import threading
+import weakref
 from typing import (
     Any,
     Callable,
@@ -12,11 +19,15 @@ from typing import (
 )
 
 import pendulum
+from dask.sizeof import sizeof
 
 import prefect
 from prefect import config
 from prefect.core import Edge, Flow, Task
 from prefect.engine import signals
+from prefect.engine.executors import LocalExecutor, SynchronousExecutor
+from prefect.engine.result import NoResult, Result, SafeResult
+from prefect.engine.result_handlers import LocalResultHandler, ResultHandler
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
 from prefect.engine.state import (
     Failed,
@@ -29,6 +40,7 @@ from prefect.engine.state import (
     Success,
 )
 from prefect.engine.task_runner import TaskRunner
+from prefect.utilities import logging
 from prefect.utilities.collections import flatten_seq
 from prefect.utilities.executors import run_with_heartbeat
 
@@ -388,9 +400,40 @@ class FlowRunner(Runner):
         if set(return_tasks).difference(self.flow.tasks):
             raise ValueError("Some tasks in return_tasks were not found in the flow.")
 
+        # when releasing intermediate results, track the tasks which still consume each
+        # task's result; terminal tasks have no consumers and always keep their results
+        release_results = config.engine.flow_runner.release_intermediate_results
+        remaining_consumers = {}  # type: Dict[Task, Set[Task]]
+        if release_results:
+            remaining_consumers = {
+                t: self.flow.downstream_tasks(t) for t in self.flow.tasks
+            }
+
+        # results held in memory are spilled to disk once they exceed the memory budget,
+        # except for those of the tasks which determine the flow run's state; returned
+        # results are read back once the flow run is over.  Distributed executors manage
+        # (and spill) their workers' memory themselves
+        spiller = None  # type: Optional[ResultSpiller]
+        memory_budget = config.engine.flow_runner.memory_budget
+        if memory_budget:
+            if isinstance(executor, (LocalExecutor, SynchronousExecutor)):
+                spiller = ResultSpiller(
+                    budget=memory_budget,
+                    keep=self.flow.terminal_tasks().union(self.flow.reference_tasks()),
+                )
+            else:
+                self.logger.debug(
+                    "The result memory budget is not enforced for {}.".format(
+                        type(executor).__name__
+                    )
+                )
+
         # -- process each task in order
 
-        with executor.start():
+        with executor.start(), contextlib.ExitStack() as stack:
+            if spiller is not None:
+                # spilled results are only needed while the flow runs
+                stack.callback(spiller.cleanup)
 
             for task in self.flow.sorted_tasks():
 
@@ -425,6 +468,35 @@ class FlowRunner(Runner):
                     executor=executor,
                 )
 
+                if spiller is not None:
+                    task_states[task] = executor.submit(
+                        spiller.track,
+                        task,
+                        task_states[task],
+                        upstream_tasks=list({e.upstream_task for e in upstream_states}),
+                    )
+
+                # -- release the results of any upstream tasks with no remaining consumers
+
+                if release_results:
+                    for upstream_task in {e.upstream_task for e in upstream_states}:
+                        consumers = remaining_consumers[upstream_task]
+                        consumers.discard(task)
+                        if not consumers and upstream_task in task_states:
+                            edges = self.flow.edges_from(upstream_task)
+                            downstream = list({e.downstream_task for e in edges})
+                            task_states[upstream_task] = executor.submit(
+                                release_result,
+                                task_states[upstream_task],
+                                consumer_states=[
+                                    task_states.get(t) for t in downstream
+                                ],
+                                consumer_keys=[
+                                    {e.key for e in edges if e.downstream_task is t}
+                                    for t in downstream
+                                ],
+                            )
+
             # ---------------------------------------------
             # Collect results
             # ---------------------------------------------
@@ -455,6 +527,12 @@ class FlowRunner(Runner):
 
             assert isinstance(final_states, dict)
 
+            # returned results which were spilled are read back before the spilled
+            # results are removed
+            if spiller is not None:
+                for t in return_tasks:
+                    spiller.restore(t, final_states[t])
+
         key_states = set(flatten_seq([all_final_states[t] for t in reference_tasks]))
         terminal_states = set(
             flatten_seq([all_final_states[t] for t in terminal_tasks])
@@ -564,3 +642,188 @@ class FlowRunner(Runner):
             context=context,
             executor=executor,
         )
+
+
+def release_result(
+    state: State,
+    consumer_states: List[Optional[State]],
+    consumer_keys: List[Set[Optional[str]]],
+) -> State:
+    """
+    Returns a copy of a successful task state which no longer holds onto its result value;
+    the copy retains the result's `SafeResult` if it has been stored, and `NoResult`
+    otherwise.  This is intended to be submitted to an executor once every downstream task
+    has been submitted, so that large intermediate values can be freed during a flow run.
+
+    The original state is returned unchanged if it is not successful, if it is cached (its
+    result may be needed by future runs), or if any of the provided consumer states
+    (including mapped children) is unfinished and hasn't cached the inputs it receives
+    from this state.
+
+    Args:
+        - state (State): the state whose result should be released
+        - consumer_states (List[State]): the states of every downstream task
+        - consumer_keys (List[Set[str]]): for each downstream task, the keys of the
+            edges through which it receives this state's result
+
+    Returns:
+        - State: a state without a result value, or the original state
+    """
+    if not isinstance(state, State) or not state.is_successful() or state.is_cached():
+        return state
+
+    for consumer_state, keys in zip(consumer_states, consumer_keys):
+        if isinstance(consumer_state, Mapped):
+            children = consumer_state.map_states  # type: List[Any]
+        else:
+            children = [consumer_state]
+        for child in children:
+            # states which aren't available here (such as futures of mapped children)
+            # hold onto their own inputs
+            if not isinstance(child, State) or child.is_finished():
+                continue
+            cached_inputs = getattr(child, "cached_inputs", None) or {}
+            if not all(k in cached_inputs for k in keys if k is not None):
+                return state
+
+    released = copy.copy(state)
+    released._result = state._result.safe_value  # type: ignore
+    if isinstance(state, Mapped):
+        released.map_states = [  # type: ignore
+            release_result(s, consumer_states=[], consumer_keys=[])
+            for s in state.map_states
+        ]
+    return released
+
+
+class ResultSpiller:
+    """
+    Keeps track of the task results held in memory during a flow run, and spills the
+    least-recently-needed ones to disk whenever their total size exceeds a memory budget.
+
+    Spilled states keep a `SafeResult` in place of their value (reusing one which was
+    already stored, if available); downstream tasks which haven't run yet read the value
+    back on demand when they need it.  Results are only tracked while their states are
+    still referenced; mapped or cached states, and the states of the `keep` tasks, are
+    never spilled (nor counted against the budget).  Spilled results which are needed
+    after the flow run (such as those of returned tasks) can be read back with `restore`.
+
+    Args:
+        - budget (int): the maximum number of bytes of results to hold in memory
+        - result_handler (ResultHandler, optional): the result handler used for writing
+            spilled results; defaults to a `LocalResultHandler` writing to a temporary
+            directory, which `cleanup` removes
+        - keep (Iterable[Task], optional): tasks whose results are never spilled, such as
+            the tasks which determine the state of the flow run
+    """
+
+    def __init__(
+        self,
+        budget: int,
+        result_handler: ResultHandler = None,
+        keep: Iterable[Task] = None,
+    ) -> None:
+        self.budget = budget
+        self.result_handler = result_handler
+        self._dir = None  # type: Optional[str]
+        self.keep = set(keep or ())
+        self.resident_bytes = 0
+        self._spilled = {}  # type: Dict[Task, weakref.ref]
+        self.logger = logging.get_logger(type(self).__name__)
+        self._resident = (
+            collections.OrderedDict()
+        )  # type: collections.OrderedDict[Task, Tuple[weakref.ref, int]]
+        self._lock = threading.Lock()
+
+    def track(self, task: Task, state: State, upstream_tasks: Iterable[Task]) -> State:
+        """
+        Records the state of a task which has just run, along with the upstream tasks whose
+        results it needed, and spills results to disk until the memory budget is met.
+        This is intended to be submitted to an executor right after the task itself.
+
+        Args:
+            - task (Task): the task which ran
+            - state (State): the task's new state
+            - upstream_tasks (Iterable[Task]): the tasks whose results were just needed
+
+        Returns:
+            - State: the provided state, which may have been spilled
+        """
+        with self._lock:
+            for upstream_task in upstream_tasks:
+                if upstream_task in self._resident:
+                    self._resident.move_to_end(upstream_task)
+
+            self._forget(task)
+            if (
+                task not in self.keep
+                and isinstance(state, State)
+                and state.is_successful()
+                and not state.is_mapped()
+                and not state.is_cached()
+                and isinstance(state._result, Result)
+            ):
+                size = sizeof(state._result.value)
+                self._resident[task] = (weakref.ref(state), size)
+                self.resident_bytes += size
+
+            # states which are no longer referenced anywhere no longer hold any memory
+            for t, (ref, _) in list(self._resident.items()):
+                if ref() is None:
+                    self._forget(t)
+
+            while self.resident_bytes > self.budget and self._resident:
+                t, (ref, size) = self._resident.popitem(last=False)
+                self.resident_bytes -= size
+                spilled = ref()
+                if spilled is not None:
+                    self._spill(t, spilled)
+
+        return state
+
+    def restore(self, task: Task, state: State) -> State:
+        """
+        Reads back the result of a state which this spiller spilled, so that it no longer
+        depends on the spilled copy; any other state is left as-is.
+
+        Args:
+            - task (Task): the task whose state is being restored
+            - state (State): the task's state
+
+        Returns:
+            - State: the provided state
+        """
+        with self._lock:
+            ref = self._spilled.pop(task, None)
+        if ref is not None and ref() is state:
+            state._result = state._result.to_result()
+        return state
+
+    def cleanup(self) -> None:
+        """
+        Removes the temporary directory results were spilled to, if the spiller created
+        one.  Spilled results can't be read back afterwards.
+        """
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+    def _forget(self, task: Task) -> None:
+        _, size = self._resident.pop(task, (None, 0))
+        self.resident_bytes -= size
+
+    def _spill(self, task: Task, state: State) -> None:
+        result = state._result
+        assert isinstance(result, Result)  # mypy assert
+        if result.safe_value == NoResult:
+            if self.result_handler is None:
+                self._dir = tempfile.mkdtemp(prefix="prefect-spill-")
+                self.result_handler = LocalResultHandler(dir=self._dir)
+            loc = self.result_handler.write(result.value)
+            state._result = SafeResult(loc, result_handler=self.result_handler)
+        else:
+            state._result = result.safe_value
+        self._spilled[task] = weakref.ref(state)
+        self.logger.debug(
+            "Task '{}': result spilled to {}".format(task.name, state._result.value)
+        )
@@ -100,13 +100,19 @@ class SafeResult(ResultInterface):
     def safe_value(self) -> "SafeResult":
         return self
 
-    def to_result(self) -> "ResultInterface":
+    def to_result(self, **read_kwargs: Any) -> "ResultInterface":
         """
         Read the value of this result using the result handler and return a fully hydrated Result.
+
+        Args:
+            - **read_kwargs (Any): additional keyword arguments for the result handler's `read`
+                method, such as the `columns` to load with an `ArrowResultHandler`; a Result
+                which was only read in part doesn't keep this result as its `safe_value`
         """
-        value = self.result_handler.read(self.value)
+        value = self.result_handler.read(self.value, **read_kwargs)  # type: ignore
         res = Result(value=value, result_handler=self.result_handler)
-        res.safe_value = self
+        if not read_kwargs:
+            res.safe_value = self
         return res
 
 
@@ -135,7 +141,7 @@ class NoResultType(SafeResult):
     def value(self) -> "ResultInterface":
         return self
 
-    def to_result(self) -> "ResultInterface":
+    def to_result(self, **read_kwargs: Any) -> "ResultInterface":
         """Performs no computation and returns self."""
         return self
 
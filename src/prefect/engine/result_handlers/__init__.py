@@ -6,6 +6,10 @@ The only requirement for a Result handler implementation is that the `write` met
 from prefect.engine.result_handlers.result_handler import ResultHandler
 from prefect.engine.result_handlers.json_result_handler import JSONResultHandler
 from prefect.engine.result_handlers.local_result_handler import LocalResultHandler
+from prefect.engine.result_handlers.content_addressed_result_handler import (
+    ContentAddressedResultHandler,
+)
+from prefect.engine.result_handlers.arrow_result_handler import ArrowResultHandler
 
 try:
     from prefect.engine.result_handlers.gcs_result_handler import GCSResultHandler
@@ -0,0 +1,220 @@
+"""
+A result handler which stores tabular results in a columnar format, so that downstream
+consumers can read only the columns and row groups they need.
+"""
+import sys
+import tempfile
+from typing import Any, BinaryIO, List
+
+from prefect.engine.result_handlers import ResultHandler, serializers
+
+# the magic strings which begin Parquet and Arrow IPC files
+PARQUET_MAGIC = b"PAR1"
+ARROW_MAGIC = b"ARROW1"
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _to_table(value: Any) -> Any:
+    """
+    Returns the provided value as a `pyarrow.Table` if it is tabular (a pandas `DataFrame`,
+    or an Arrow `Table` or `RecordBatch`) and can be converted, and `None` otherwise.
+    """
+    # neither pandas nor pyarrow are imported here; if they haven't been imported, the
+    # value can't be one of their objects
+    pandas = sys.modules.get("pandas")  # type: Any
+    arrow = sys.modules.get("pyarrow")  # type: Any
+    is_frame = pandas is not None and isinstance(value, pandas.DataFrame)
+    is_arrow = arrow is not None and isinstance(value, (arrow.Table, arrow.RecordBatch))
+    if not (is_frame or is_arrow):
+        return None
+
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+
+    if isinstance(value, pyarrow.RecordBatch):
+        return pyarrow.Table.from_batches([value])
+    elif is_frame:
+        try:
+            return pyarrow.Table.from_pandas(value)
+        except (pyarrow.ArrowException, TypeError, ValueError):
+            return None  # for example, columns of arbitrary Python objects
+    return value
+
+
+class ArrowResultHandler(ResultHandler):
+    """
+    Hook for storing and retrieving task results from local file storage, in which tabular
+    results (pandas `DataFrame`s and Arrow `Table`s or `RecordBatch`es) are written in the
+    Parquet or Arrow IPC format and every other result is written with `cloudpickle`.
+
+    Tabular results can be read in part, by passing `columns` and / or `row_groups` to
+    `read` (or to `SafeResult.to_result`); Parquet files are read column by column, and
+    Arrow IPC files are memory-mapped, so that only the data which is requested is loaded.
+    DataFrames are read back as DataFrames (with their index) and Arrow data as Arrow
+    `Table`s.  Requires `pyarrow` for tabular results.
+
+    Args:
+        - dir (str, optional): the _absolute_ path to a directory for storing
+            all results; defaults to `$TMPDIR`
+        - format (str, optional): the format of tabular results, either `"parquet"` or
+            `"arrow"` (the Arrow IPC file format); defaults to `"parquet"`
+        - row_group_size (int, optional): the maximum number of rows in each Parquet row
+            group or Arrow record batch; defaults to the `pyarrow` default
+
+    Raises:
+        - ValueError: if the format isn't `"parquet"` or `"arrow"`
+    """
+
+    def __init__(
+        self, dir: str = None, format: str = "parquet", row_group_size: int = None
+    ):
+        if format not in FORMATS:
+            raise ValueError(
+                "Unknown tabular format {!r}; must be one of {}".format(
+                    format, sorted(FORMATS)
+                )
+            )
+        self.dir = dir
+        self.format = format
+        self.row_group_size = row_group_size
+        super().__init__()
+
+    def read(
+        self, fpath: str, columns: List[str] = None, row_groups: List[int] = None
+    ) -> Any:
+        """
+        Read a result from the given file location.
+
+        Args:
+            - fpath (str): the _absolute_ path to the location of a written result
+            - columns (List[str], optional): for tabular results, the names of the columns
+                to read; defaults to all columns
+            - row_groups (List[int], optional): for tabular results, the indices of the
+                Parquet row groups (or Arrow record batches) to read; defaults to all rows
+
+        Returns:
+            - the read result from the provided file
+
+        Raises:
+            - ValueError: if `columns` or `row_groups` are provided for a result which
+                isn't tabular
+        """
+        self.logger.debug("Starting to read result from {}...".format(fpath))
+        with open(fpath, "rb") as f:
+            magic = f.read(max(len(PARQUET_MAGIC), len(ARROW_MAGIC)))
+            if not magic.startswith((PARQUET_MAGIC, ARROW_MAGIC)):
+                if columns is not None or row_groups is not None:
+                    raise ValueError(
+                        "Columns and row groups can only be read from tabular results."
+                    )
+                f.seek(0)
+                val = serializers.load(f)
+
+        if magic.startswith(PARQUET_MAGIC):
+            val = self._read_parquet(fpath, columns, row_groups)
+        elif magic.startswith(ARROW_MAGIC):
+            val = self._read_arrow(fpath, columns, row_groups)
+        self.logger.debug("Finished reading result from {}...".format(fpath))
+        return val
+
+    def _read_parquet(
+        self, fpath: str, columns: List[str] = None, row_groups: List[int] = None
+    ) -> Any:
+        import pyarrow.parquet
+
+        parquet_file = pyarrow.parquet.ParquetFile(fpath)
+        if row_groups is None:
+            table = parquet_file.read(columns=columns, use_pandas_metadata=True)
+        else:
+            table = parquet_file.read_row_groups(
+                row_groups, columns=columns, use_pandas_metadata=True
+            )
+        return self._from_table(table)
+
+    def _read_arrow(
+        self, fpath: str, columns: List[str] = None, row_groups: List[int] = None
+    ) -> Any:
+        import pyarrow
+
+        # batches are views of the memory-mapped file, so columns which aren't selected
+        # are never read from disk
+        with pyarrow.memory_map(fpath, "r") as source:
+            table = self._read_batches(
+                pyarrow.ipc.open_file(source), columns, row_groups
+            )
+            if table.schema.pandas_metadata is not None:
+                return table.to_pandas()
+
+        # tables which are returned as-is would keep the file mapped, so they are read
+        # into memory instead
+        with pyarrow.OSFile(fpath, "rb") as source:
+            return self._read_batches(
+                pyarrow.ipc.open_file(source), columns, row_groups
+            )
+
+    def _read_batches(
+        self, reader: Any, columns: List[str] = None, row_groups: List[int] = None
+    ) -> Any:
+        import pyarrow
+
+        indices = range(reader.num_record_batches) if row_groups is None else row_groups
+        batches = [reader.get_batch(i) for i in indices]
+        table = pyarrow.Table.from_batches(batches, schema=reader.schema)
+        if columns is None:
+            return table
+
+        # keep any columns which store the index of a DataFrame
+        index = [
+            c
+            for c in (table.schema.pandas_metadata or {}).get("index_columns", [])
+            if isinstance(c, str)
+        ]
+        names = list(columns) + [c for c in index if c not in columns]
+        return pyarrow.Table.from_arrays(
+            [table.column(table.schema.get_field_index(name)) for name in names],
+            names=names,
+            metadata=table.schema.metadata,
+        )
+
+    def _from_table(self, table: Any) -> Any:
+        if table.schema.pandas_metadata is not None:
+            return table.to_pandas()
+        return table
+
+    def _write_parquet(self, table: Any, fileobj: BinaryIO) -> None:
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(table, fileobj, row_group_size=self.row_group_size)
+
+    def _write_arrow(self, table: Any, fileobj: BinaryIO) -> None:
+        import pyarrow
+
+        with pyarrow.ipc.new_file(fileobj, table.schema) as writer:
+            writer.write_table(table, max_chunksize=self.row_group_size)
+
+    def write(self, result: Any) -> str:
+        """
+        Serialize the provided result to local disk, in a columnar format if it is tabular.
+
+        Args:
+            - result (Any): the result to write and store
+
+        Returns:
+            - str: the _absolute_ path to the written result on disk
+        """
+        table = _to_table(result)
+        suffix = FORMATS[self.format] if table is not None else ""
+        fd, loc = tempfile.mkstemp(prefix="prefect-", suffix=suffix, dir=self.dir)
+        self.logger.debug("Starting to upload result to {}...".format(loc))
+        with open(fd, "wb") as f:
+            if table is None:
+                serializers.dump(result, f)
+            elif self.format == "parquet":
+                self._write_parquet(table, f)
+            else:
+                self._write_arrow(table, f)
+        self.logger.debug("Finished uploading result to {}...".format(loc))
+        return loc
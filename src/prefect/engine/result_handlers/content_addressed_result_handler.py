@@ -0,0 +1,240 @@
+"""
+A result handler which stores each distinct result payload on local disk exactly once,
+addressed by the hash of its contents, along with the tools to garbage collect it by age.
+"""
+import contextlib
+import datetime
+import hashlib
+import os
+import tempfile
+import time
+from typing import Any, BinaryIO, Iterator, List, Optional
+
+from prefect.engine.result_handlers import ResultHandler, serializers
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None  # type: ignore
+
+# the prefix of the temporary files results are serialized into before being stored
+TEMP_PREFIX = ".prefect-"
+
+# the name of the lock file in each shard of the store
+LOCK_NAME = ".lock"
+
+
+def _default_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "prefect-results")
+
+
+class _HashingWriter:
+    """
+    A writable file object which hashes everything written through it.
+    """
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        self._fileobj = fileobj
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._hash.update(data)
+        return self._fileobj.write(data)
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+@contextlib.contextmanager
+def _shard_lock(shard: str, exclusive: bool) -> Iterator[None]:
+    """
+    Holds the lock of a shard (subdirectory) of the store: writes share it while they
+    refresh a blob and make sure it's stored, and `prune` holds it exclusively while it
+    decides whether to delete a blob and deletes it, so that a blob is never deleted
+    after a write has returned its location.  On platforms without `fcntl`, nothing is
+    locked.
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(os.path.join(shard, LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)  # which releases the lock
+
+
+def last_written(path: str) -> Optional[float]:
+    """
+    Returns the last time the blob stored at `path` was written, including writes of an
+    identical payload which found it already stored.
+
+    Args:
+        - path (str): the location of the blob
+
+    Returns:
+        - float: the timestamp of the last write, or `None` if the blob doesn't exist
+    """
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+class ContentAddressedResultHandler(ResultHandler):
+    """
+    Hook for storing and retrieving task results from local file storage, in which every
+    distinct payload is only stored once.
+
+    Results are serialized (with the configured serializer and compression codec) and
+    hashed with SHA-256; each payload is stored in a file named after its hash, sharded
+    into subdirectories by the first two characters of the hash.  Writing a result which
+    has already been stored, for example an unchanged lookup table produced by every run
+    of a flow, refreshes the modification time of the existing file rather than writing
+    it again.
+    Note that only byte-identical payloads are deduplicated; values whose serialization
+    isn't deterministic (such as sets of strings across processes) are stored separately.
+
+    Stored payloads are garbage collected by age: those which haven't been written for
+    longer than a given retention period can be deleted with `prune` (or the
+    `prefect prune-results` command).  Results which are read long after they were last
+    written, for example by restarted flow runs, should be kept for at least that long.
+
+    Args:
+        - dir (str, optional): the _absolute_ path to the directory of the store; defaults
+            to a `prefect-results` directory in `$TMPDIR`
+        - serializer (str, optional): the name of the serializer used to write results (see
+            `prefect.engine.result_handlers.serializers`); defaults to `"pickle"`
+        - compression (str, optional): the name of the compression codec used to write
+            results, such as `"gzip"` or `"lzma"`; defaults to no compression
+    """
+
+    def __init__(
+        self, dir: str = None, serializer: str = "pickle", compression: str = None
+    ):
+        serializers.validate(serializer, compression)
+        self.dir = dir
+        self.serializer = serializer
+        self.compression = compression
+        super().__init__()
+
+    def _root(self) -> str:
+        return self.dir or _default_dir()
+
+    def read(self, fpath: str) -> Any:
+        """
+        Read a result from the given location in the store.
+
+        Args:
+            - fpath (str): the _absolute_ path to the location of a written result
+
+        Returns:
+            - the read result from the provided file
+        """
+        self.logger.debug("Starting to read result from {}...".format(fpath))
+        with open(fpath, "rb") as f:
+            val = serializers.load(f)
+        self.logger.debug("Finished reading result from {}...".format(fpath))
+        return val
+
+    def write(self, result: Any) -> str:
+        """
+        Serialize the provided result into the store, unless an identical payload has
+        already been stored, in which case that payload is marked as written now.
+
+        Args:
+            - result (Any): the result to write and store
+
+        Returns:
+            - str: the _absolute_ path to the stored result on disk
+        """
+        root = self._root()
+        os.makedirs(root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=root)
+        try:
+            with open(fd, "wb") as f:
+                writer = _HashingWriter(f)  # type: Any
+                serializers.dump(result, writer, self.serializer, self.compression)
+            digest = writer.hexdigest()
+            loc = os.path.join(root, digest[:2], digest)
+            os.makedirs(os.path.dirname(loc), exist_ok=True)
+
+            # the blob is refreshed while holding the shard's lock, so that it can't be
+            # pruned between checking for it and returning its location
+            with _shard_lock(os.path.dirname(loc), exclusive=False):
+                if fcntl is not None and os.path.exists(loc):
+                    self.logger.debug("Result already stored at {}".format(loc))
+                    os.utime(loc)
+                    os.remove(tmp)
+                else:
+                    # without a lock, the blob is always replaced in case it's pruned
+                    self.logger.debug("Starting to upload result to {}...".format(loc))
+                    os.replace(tmp, loc)
+                    self.logger.debug("Finished uploading result to {}...".format(loc))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return loc
+
+    def prune(self, older_than: datetime.timedelta, dry_run: bool = False) -> List[str]:
+        """
+        Delete the results in this handler's store which haven't been written within
+        `older_than`; see `prune` for details.
+        """
+        return prune(self._root(), older_than=older_than, dry_run=dry_run)
+
+
+def prune(dir: str, older_than: datetime.timedelta, dry_run: bool = False) -> List[str]:
+    """
+    Delete the results in a content-addressed store which haven't been written within
+    `older_than`, along with any temporary files left behind by interrupted writes.
+
+    Args:
+        - dir (str): the directory of the store
+        - older_than (datetime.timedelta): how long a result must have gone without being
+            written before it is deleted
+        - dry_run (bool, optional): if `True`, nothing is deleted; defaults to `False`
+
+    Returns:
+        - List[str]: the paths of the deleted (or, for a dry run, deletable) results
+    """
+    cutoff = time.time() - older_than.total_seconds()
+    pruned = []
+
+    def prunable(path: str) -> bool:
+        written = last_written(path)
+        return written is not None and written < cutoff
+
+    for entry in os.scandir(dir):
+        if entry.is_file() and entry.name.startswith(TEMP_PREFIX):
+            if entry.stat().st_mtime < cutoff:
+                pruned.append(entry.path)
+                if not dry_run:
+                    os.remove(entry.path)
+            continue
+        if not entry.is_dir() or len(entry.name) != 2:
+            continue
+
+        for blob in os.scandir(entry.path):
+            if (
+                not blob.is_file()
+                or blob.name.startswith(".")
+                or not prunable(blob.path)
+            ):
+                continue
+            if dry_run:
+                pruned.append(blob.path)
+                continue
+            with _shard_lock(entry.path, exclusive=True):
+                # a write may have refreshed the blob since it was checked
+                if not prunable(blob.path):
+                    continue
+                pruned.append(blob.path)
+                os.remove(blob.path)
+
+    return pruned
@@ -2,29 +2,49 @@ import base64
 import uuid
 from typing import TYPE_CHECKING, Any
 
-import cloudpickle
 import pendulum
 
 from prefect.client import Secret
-from prefect.engine.result_handlers import ResultHandler
+from prefect.engine.result_handlers import ResultHandler, serializers
 
 if TYPE_CHECKING:
     import google.cloud
 
 
+def _load_legacy(blob: bytes) -> Any:
+    # results written by earlier versions of Prefect are base64 encoded
+    return serializers.loads(base64.b64decode(blob))
+
+
 class GCSResultHandler(ResultHandler):
     """
     Result Handler for writing to and reading from a Google Cloud Bucket.
 
     Args:
         - bucket (str): the name of the bucket to write to / read from
+        - serializer (str, optional): the name of the serializer used to write results (see
+            `prefect.engine.result_handlers.serializers`); defaults to `"pickle"`
+        - compression (str, optional): the name of the compression codec used to write
+            results, such as `"gzip"` or `"lzma"`; defaults to no compression
 
     Note that for this result handler to work properly, your Google Application Credentials
     must be made available.
+
+    Results are streamed: they are serialized directly into a resumable upload and
+    deserialized directly from a chunked download, `chunk_size` bytes at a time, so they
+    are never held in memory as bytes in full.
     """
 
-    def __init__(self, bucket: str = None) -> None:
+    # the number of bytes uploaded or downloaded per request; must be a multiple of 256 KB
+    chunk_size = 8 * 1024 * 1024
+
+    def __init__(
+        self, bucket: str = None, serializer: str = "pickle", compression: str = None
+    ) -> None:
+        serializers.validate(serializer, compression)
         self.bucket = bucket
+        self.serializer = serializer
+        self.compression = compression
         self.initialize_client()
         super().__init__()
 
@@ -74,8 +94,11 @@ class GCSResultHandler(ResultHandler):
         date = pendulum.now("utc").format("Y/M/D")
         uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
         self.logger.debug("Starting to upload result to {}...".format(uri))
-        binary_data = base64.b64encode(cloudpickle.dumps(result)).decode()
-        self.gcs_bucket.blob(uri).upload_from_string(binary_data)
+        blob = self.gcs_bucket.blob(uri, chunk_size=self.chunk_size)
+        with serializers.stream_dump(
+            result, self.serializer, self.compression
+        ) as stream:
+            blob.upload_from_file(stream)
         self.logger.debug("Finished uploading result to {}.".format(uri))
         return uri
 
@@ -91,9 +114,11 @@ class GCSResultHandler(ResultHandler):
         """
         try:
             self.logger.debug("Starting to download result from {}...".format(uri))
-            result = self.gcs_bucket.blob(uri).download_as_string()
+            blob = self.gcs_bucket.blob(uri, chunk_size=self.chunk_size)
             try:
-                return_val = cloudpickle.loads(base64.b64decode(result))
+                return_val = serializers.stream_load(
+                    blob.download_to_file, legacy=_load_legacy
+                )
             except EOFError:
                 return_val = None
             self.logger.debug("Finished downloading result from {}.".format(uri))
@@ -3,30 +3,71 @@ Result Handlers provide the hooks that Prefect uses to store task results in pro
 
 Anytime a task needs its output or inputs stored, a result handler is used to determine where this data should be stored (and how it can be retrieved).
 """
-import base64
+import sys
 import tempfile
 from typing import Any
 
-import cloudpickle
+from prefect.engine.result_handlers import ResultHandler, serializers
 
-from prefect.engine.result_handlers import ResultHandler
+# the magic string which begins every file in the `.npy` format
+NPY_MAGIC = b"\x93NUMPY"
+
+
+def _is_mappable_array(value: Any) -> bool:
+    # NumPy is never imported here; if it hasn't been imported, the value isn't an array
+    numpy = sys.modules.get("numpy")  # type: Any
+    return (
+        numpy is not None
+        and type(value) in (numpy.ndarray, numpy.memmap)
+        and value.size > 0
+        and not value.dtype.hasobject
+    )
 
 
 class LocalResultHandler(ResultHandler):
     """
     Hook for storing and retrieving task results from local file storage. Only intended to be used
-    for local testing and development. Task results are written using `cloudpickle` and stored in the
-    provided location for use in future runs.
+    for local testing and development. Task results are written using the configured serializer
+    (`cloudpickle` by default) and stored in the provided location for use in future runs.
+
+    If `memory_map` is set, NumPy array results are stored in the `.npy` format and read
+    back as copy-on-write memory maps, so that reading a large checkpoint doesn't require
+    any fresh memory up front: pages are loaded from disk (and shared through the page
+    cache between every task reading the same result) only as they are accessed, and
+    changes made by a task are never written back to the stored result.
 
     **NOTE**: Stored results will _not_ be automatically cleaned up after execution.
 
     Args:
         - dir (str, optional): the _absolute_ path to a directory for storing
             all results; defaults to `$TMPDIR`
+        - serializer (str, optional): the name of the serializer used to write results (see
+            `prefect.engine.result_handlers.serializers`); defaults to `"pickle"`
+        - compression (str, optional): the name of the compression codec used to write
+            results, such as `"gzip"` or `"lzma"`; defaults to no compression
+        - memory_map (bool, optional): whether to store NumPy arrays in the `.npy` format
+            and memory-map them when they are read; can't be combined with `compression`.
+            Defaults to `False`
+
+    Raises:
+        - ValueError: if the serializer or compression codec is not available, or if both
+            `memory_map` and `compression` are set
     """
 
-    def __init__(self, dir: str = None):
+    def __init__(
+        self,
+        dir: str = None,
+        serializer: str = "pickle",
+        compression: str = None,
+        memory_map: bool = False,
+    ):
+        serializers.validate(serializer, compression)
+        if memory_map and compression is not None:
+            raise ValueError("Memory-mapped results can't be compressed.")
         self.dir = dir
+        self.serializer = serializer
+        self.compression = compression
+        self.memory_map = memory_map
         super().__init__()
 
     def read(self, fpath: str) -> Any:
@@ -41,7 +82,14 @@ class LocalResultHandler(ResultHandler):
         """
         self.logger.debug("Starting to read result from {}...".format(fpath))
         with open(fpath, "rb") as f:
-            val = cloudpickle.loads(f.read())
+            is_array = f.read(len(NPY_MAGIC)) == NPY_MAGIC
+            if not is_array:
+                f.seek(0)
+                val = serializers.load(f)
+        if is_array:
+            import numpy
+
+            val = numpy.load(fpath, mmap_mode="c" if self.memory_map else None)
         self.logger.debug("Finished reading result from {}...".format(fpath))
         return val
 
@@ -55,9 +103,19 @@ class LocalResultHandler(ResultHandler):
         Returns:
             - str: the _absolute_ path to the written result on disk
         """
+        if self.memory_map and _is_mappable_array(result):
+            import numpy.lib.format
+
+            fd, loc = tempfile.mkstemp(prefix="prefect-", suffix=".npy", dir=self.dir)
+            self.logger.debug("Starting to upload result to {}...".format(loc))
+            with open(fd, "wb") as f:
+                numpy.lib.format.write_array(f, result, allow_pickle=False)
+            self.logger.debug("Finished uploading result to {}...".format(loc))
+            return loc
+
         fd, loc = tempfile.mkstemp(prefix="prefect-", dir=self.dir)
         self.logger.debug("Starting to upload result to {}...".format(loc))
         with open(fd, "wb") as f:
-            f.write(cloudpickle.dumps(result))
+            serializers.dump(result, f, self.serializer, self.compression)
         self.logger.debug("Finished uploading result to {}...".format(loc))
         return loc
@@ -1,32 +1,48 @@
 import base64
-import io
 import json
 import uuid
 from typing import TYPE_CHECKING, Any
 
-import cloudpickle
 import pendulum
 
 from prefect.client import Secret
-from prefect.engine.result_handlers import ResultHandler
+from prefect.engine.result_handlers import ResultHandler, serializers
 
 if TYPE_CHECKING:
     import boto3
 
 
+def _load_legacy(blob: bytes) -> Any:
+    # results written by earlier versions of Prefect are base64 encoded
+    return serializers.loads(base64.b64decode(blob))
+
+
 class S3ResultHandler(ResultHandler):
     """
     Result Handler for writing to and reading from an AWS S3 Bucket.
 
     Args:
         - bucket (str): the name of the bucket to write to / read from
+        - serializer (str, optional): the name of the serializer used to write results (see
+            `prefect.engine.result_handlers.serializers`); defaults to `"pickle"`
+        - compression (str, optional): the name of the compression codec used to write
+            results, such as `"gzip"` or `"lzma"`; defaults to no compression
 
     Note that for this result handler to work properly, your AWS Credentials must
     be made available in the `"AWS_CREDENTIALS"` Prefect Secret.
+
+    Results are streamed: they are serialized directly into a multipart upload and
+    deserialized directly from the download stream, so they are never held in memory as
+    bytes in full.
     """
 
-    def __init__(self, bucket: str = None) -> None:
+    def __init__(
+        self, bucket: str = None, serializer: str = "pickle", compression: str = None
+    ) -> None:
+        serializers.validate(serializer, compression)
         self.bucket = bucket
+        self.serializer = serializer
+        self.compression = compression
         self.initialize_client()
         super().__init__()
 
@@ -83,12 +99,11 @@ class S3ResultHandler(ResultHandler):
         uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
         self.logger.debug("Starting to upload result to {}...".format(uri))
 
-        ## prepare data
-        binary_data = base64.b64encode(cloudpickle.dumps(result))
-        stream = io.BytesIO(binary_data)
-
-        ## upload
-        self.client.upload_fileobj(stream, Bucket=self.bucket, Key=uri)
+        ## serialize while uploading
+        with serializers.stream_dump(
+            result, self.serializer, self.compression
+        ) as stream:
+            self.client.upload_fileobj(stream, Bucket=self.bucket, Key=uri)
         self.logger.debug("Finished uploading result to {}.".format(uri))
         return uri
 
@@ -104,14 +119,11 @@ class S3ResultHandler(ResultHandler):
         """
         try:
             self.logger.debug("Starting to download result from {}...".format(uri))
-            stream = io.BytesIO()
-
-            ## download
-            self.client.download_fileobj(Bucket=self.bucket, Key=uri, Fileobj=stream)
-            stream.seek(0)
 
+            ## deserialize while downloading
+            body = self.client.get_object(Bucket=self.bucket, Key=uri)["Body"]
             try:
-                return_val = cloudpickle.loads(base64.b64decode(stream.read()))
+                return_val = serializers.load(body, legacy=_load_legacy)
             except EOFError:
                 return_val = None
             self.logger.debug("Finished downloading result from {}.".format(uri))
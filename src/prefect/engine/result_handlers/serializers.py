@@ -0,0 +1,746 @@
+"""
+Serializers convert task results to and from the bytes which result handlers store.
+
+Every payload written by `dumps` begins with a short header recording the serializer and
+the compression codec which produced it, so that `loads` can read any payload regardless
+of how the handler reading it is configured.  Payloads without a header are assumed to be
+bare `cloudpickle` data, as written by earlier versions of Prefect.
+
+The available serializers are `"pickle"` (`cloudpickle`, using the highest pickle protocol
+this Python supports), `"pickle_oob"` (`cloudpickle`, with large NumPy arrays and
+`bytearray`s written out-of-band without being copied) and `"json"`; the available compression codecs are `"zlib"`,
+`"gzip"`, `"bz2"` and `"lzma"`, along with `"lz4"` and `"zstd"` if the `lz4` or
+`zstandard` packages are installed.  Additional serializers and codecs can be registered
+with `register_serializer` and `register_codec`.
+
+Payloads can also be written to and read from file-like objects incrementally with `dump`
+and `load`, and `stream_dump` / `stream_load` connect them to uploads and downloads through
+a pipe, so that large results never need to be held in memory as bytes.
+"""
+import bz2
+import gzip
+import io
+import json
+import os
+import pickle
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Tuple
+
+import cloudpickle
+
+MAGIC = b"\x00PFR"
+HEADER_VERSION = 1
+
+# the size of the chunks in which streamed payloads are read and decompressed
+CHUNK_SIZE = 1024 * 1024
+
+
+class Serializer:
+    """
+    Base class for converting values to and from bytes.
+    """
+
+    def __repr__(self) -> str:
+        return "<Serializer: {}>".format(type(self).__name__)
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize a value.
+
+        Args:
+            - value (Any): the value to serialize
+
+        Returns:
+            - bytes: the serialized value
+        """
+        raise NotImplementedError()
+
+    def loads(self, blob: bytes) -> Any:
+        """
+        Deserialize a value.
+
+        Args:
+            - blob (bytes): the serialized value
+
+        Returns:
+            - Any: the deserialized value
+        """
+        raise NotImplementedError()
+
+    def dump(self, value: Any, fileobj: BinaryIO) -> None:
+        """
+        Serialize a value into a writable binary file object.  By default, this writes
+        the result of `dumps`; serializers which can write incrementally should override it.
+
+        Args:
+            - value (Any): the value to serialize
+            - fileobj (BinaryIO): the file object to write to
+        """
+        fileobj.write(self.dumps(value))
+
+    def load(self, fileobj: BinaryIO) -> Any:
+        """
+        Deserialize a value from a readable binary file object.  By default, this reads
+        the whole file and calls `loads`; serializers which can read incrementally should
+        override it.
+
+        Args:
+            - fileobj (BinaryIO): the file object to read from
+
+        Returns:
+            - Any: the deserialized value
+        """
+        return self.loads(fileobj.read())
+
+
+class PickleSerializer(Serializer):
+    """
+    Serializes values with `cloudpickle`, using the highest available pickle protocol.
+    """
+
+    def dumps(self, value: Any) -> bytes:
+        return cloudpickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, blob: bytes) -> Any:
+        return cloudpickle.loads(blob)
+
+    def dump(self, value: Any, fileobj: BinaryIO) -> None:
+        cloudpickle.dump(value, fileobj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, fileobj: BinaryIO) -> Any:
+        return cloudpickle.load(fileobj)
+
+
+class _OutOfBandPickler(cloudpickle.CloudPickler):
+    """
+    A `CloudPickler` which collects large contiguous buffers instead of pickling them,
+    recording a reference to each buffer in their place.
+    """
+
+    def __init__(self, file: BinaryIO, min_size: int) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.min_size = min_size
+        self.buffers = []  # type: List[memoryview]
+        self._pids = {}  # type: Dict[int, Tuple[Any, Any]]
+
+    def persistent_id(self, obj: Any) -> Any:
+        # objects referenced more than once are only written once; like the pickle memo,
+        # this keeps a reference to each object so that its id can't be reused
+        if id(obj) in self._pids:
+            return self._pids[id(obj)][1]
+        pid = self._buffer_id(obj)
+        if pid is not None:
+            self._pids[id(obj)] = (obj, pid)
+        return pid
+
+    def _buffer_id(self, obj: Any) -> Any:
+        if type(obj) is bytearray and len(obj) >= self.min_size:
+            self.buffers.append(memoryview(obj))
+            return ("bytearray", len(self.buffers) - 1)
+
+        # only check for arrays if NumPy has already been imported by someone else
+        numpy = sys.modules.get("numpy")  # type: Any
+        if (
+            numpy is not None
+            and type(obj) is numpy.ndarray
+            and obj.nbytes >= self.min_size
+            and not obj.dtype.hasobject
+            and (obj.flags.c_contiguous or obj.flags.f_contiguous)
+        ):
+            order = "C" if obj.flags.c_contiguous else "F"
+            flat = obj.reshape(-1, order=order).view(numpy.uint8)
+            self.buffers.append(memoryview(flat))
+            return ("ndarray", len(self.buffers) - 1, obj.dtype, obj.shape, order)
+        return None
+
+
+class _OutOfBandUnpickler(pickle.Unpickler):
+    """
+    An `Unpickler` which resolves the buffer references written by `_OutOfBandPickler`.
+    """
+
+    def __init__(self, file: BinaryIO, buffers: List[bytearray]) -> None:
+        super().__init__(file)
+        self.buffers = buffers
+
+    def persistent_load(self, pid: Any) -> Any:
+        buffer = self.buffers[pid[1]]
+        if pid[0] == "bytearray":
+            return buffer
+        elif pid[0] == "ndarray":
+            import numpy
+
+            dtype, shape, order = pid[2:]
+            return numpy.frombuffer(buffer, dtype=dtype).reshape(shape, order=order)
+        raise pickle.UnpicklingError("Unknown buffer reference: {!r}".format(pid[0]))
+
+
+def _read_exactly(fileobj: BinaryIO, size: int) -> bytearray:
+    """
+    Reads exactly `size` bytes from a file object directly into a new `bytearray`.
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    position = 0
+    while position < size:
+        if hasattr(fileobj, "readinto"):
+            count = fileobj.readinto(view[position:])  # type: ignore
+        else:
+            data = fileobj.read(size - position)
+            count = len(data)
+            view[position : position + count] = data  # type: ignore
+        if not count:
+            raise EOFError("Result payload ended unexpectedly.")
+        position += count
+    return buffer
+
+
+class OutOfBandPickleSerializer(Serializer):
+    """
+    Serializes values with `cloudpickle`, writing the data of large `bytearray`s and
+    contiguous NumPy arrays (including those backing pandas objects) out-of-band, in the
+    spirit of pickle protocol 5.
+
+    Each buffer is written straight from the memory of the object it belongs to, ahead of
+    the pickle stream which refers to it, and is read back directly into a new writable
+    buffer which the reconstructed array is a view of; in either direction, array data is
+    never copied into intermediate bytes.
+
+    Args:
+        - min_size (int, optional): the size in bytes above which buffers are written
+            out-of-band; defaults to 64 KiB
+    """
+
+    _count = struct.Struct("<I")
+    _size = struct.Struct("<Q")
+
+    def __init__(self, min_size: int = 64 * 1024) -> None:
+        self.min_size = min_size
+
+    def dumps(self, value: Any) -> bytes:
+        stream = io.BytesIO()
+        self.dump(value, stream)
+        return stream.getvalue()
+
+    def loads(self, blob: bytes) -> Any:
+        return self.load(io.BytesIO(blob))
+
+    def dump(self, value: Any, fileobj: BinaryIO) -> None:
+        # the pickle stream is written after the buffers it refers to, so it is held in a
+        # temporary file (only spilled to disk if large) until the buffers are written
+        with tempfile.SpooledTemporaryFile(max_size=16 * CHUNK_SIZE) as stream:
+            pickler = _OutOfBandPickler(stream, min_size=self.min_size)  # type: ignore
+            pickler.dump(value)
+            fileobj.write(self._count.pack(len(pickler.buffers)))
+            for buffer in pickler.buffers:
+                fileobj.write(self._size.pack(buffer.nbytes))  # type: ignore
+                fileobj.write(buffer)  # type: ignore
+            stream.seek(0)
+            shutil.copyfileobj(stream, fileobj, CHUNK_SIZE)  # type: ignore
+
+    def load(self, fileobj: BinaryIO) -> Any:
+        (count,) = self._count.unpack(_read_exactly(fileobj, self._count.size))
+        buffers = []
+        for _ in range(count):
+            (size,) = self._size.unpack(_read_exactly(fileobj, self._size.size))
+            buffers.append(_read_exactly(fileobj, size))
+        return _OutOfBandUnpickler(fileobj, buffers).load()
+
+
+class JSONSerializer(Serializer):
+    """
+    Serializes JSON-compatible values as UTF-8 encoded JSON.
+    """
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode()
+
+    def loads(self, blob: bytes) -> Any:
+        return json.loads(blob.decode())
+
+
+SERIALIZERS = {
+    "pickle": PickleSerializer(),
+    "pickle_oob": OutOfBandPickleSerializer(),
+    "json": JSONSerializer(),
+}  # type: Dict[str, Serializer]
+
+CODECS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "gzip": (gzip.compress, gzip.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}  # type: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]
+
+
+class _CompressingWriter:
+    """
+    A writable file object which compresses data with a `zlib`-style compressor object
+    before writing it to another file object.
+    """
+
+    def __init__(self, fileobj: BinaryIO, compressor: Any) -> None:
+        self._fileobj = fileobj
+        self._compressor = compressor
+
+    def write(self, data: bytes) -> int:
+        self._fileobj.write(self._compressor.compress(data))
+        return len(data)
+
+    def close(self) -> None:
+        self._fileobj.write(self._compressor.flush())
+
+
+class _DecompressingReader(io.RawIOBase):
+    """
+    A readable file object which decompresses data read from another file object with a
+    `zlib` decompressor object, producing at most `CHUNK_SIZE` bytes at a time.
+    """
+
+    def __init__(self, fileobj: BinaryIO, decompressor: Any) -> None:
+        self._fileobj = fileobj
+        self._decompressor = decompressor
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer:
+            data = self._decompressor.unconsumed_tail or self._fileobj.read(CHUNK_SIZE)
+            if not data:
+                self._buffer = self._decompressor.flush()
+                if not self._buffer:
+                    return 0
+                break
+            self._buffer = self._decompressor.decompress(data, CHUNK_SIZE)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _open_zlib(fileobj: BinaryIO, mode: str) -> Any:
+    if mode == "wb":
+        return _CompressingWriter(fileobj, zlib.compressobj())
+    return io.BufferedReader(_DecompressingReader(fileobj, zlib.decompressobj()))
+
+
+# codecs which can compress and decompress file objects incrementally, mapped to functions
+# which open a compressed view of a file object in the provided mode ("rb" or "wb")
+STREAM_CODECS = {
+    "zlib": _open_zlib,
+    # a fixed mtime keeps gzip output deterministic
+    "gzip": lambda f, mode: gzip.GzipFile(fileobj=f, mode=mode, mtime=0),
+    "bz2": lambda f, mode: bz2.BZ2File(f, mode=mode),
+}  # type: Dict[str, Callable[[BinaryIO, str], Any]]
+
+try:
+    import lzma
+
+    CODECS["lzma"] = (lzma.compress, lzma.decompress)
+    STREAM_CODECS["lzma"] = lambda f, mode: lzma.LZMAFile(f, mode=mode)
+except ImportError:
+    pass
+
+try:
+    import lz4.frame
+
+    CODECS["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+    STREAM_CODECS["lz4"] = lambda f, mode: lz4.frame.LZ4FrameFile(f, mode=mode)
+except ImportError:
+    pass
+
+try:
+    import zstandard
+
+    CODECS["zstd"] = (
+        lambda b: zstandard.ZstdCompressor().compress(b),
+        lambda b: zstandard.ZstdDecompressor().decompress(b),
+    )
+except ImportError:
+    pass
+
+
+def register_serializer(name: str, serializer: Serializer) -> None:
+    """
+    Registers a serializer under the provided name, so that result handlers can be
+    configured to use it and payloads written with it can be read.
+
+    Args:
+        - name (str): the name of the serializer; at most 255 bytes
+        - serializer (Serializer): the serializer
+    """
+    if len(name.encode()) > 255:
+        raise ValueError("Serializer names must be at most 255 bytes.")
+    SERIALIZERS[name] = serializer
+
+
+def register_codec(
+    name: str,
+    compress: Callable[[bytes], bytes],
+    decompress: Callable[[bytes], bytes],
+    open_stream: Callable[[BinaryIO, str], Any] = None,
+) -> None:
+    """
+    Registers a compression codec under the provided name, so that result handlers can be
+    configured to use it and payloads written with it can be read.
+
+    Args:
+        - name (str): the name of the codec; at most 255 bytes
+        - compress (Callable): a function which compresses bytes
+        - decompress (Callable): a function which decompresses bytes
+        - open_stream (Callable, optional): a function which accepts a file object and a
+            mode (`"rb"` or `"wb"`) and returns a file object which decompresses or
+            compresses data incrementally; if not provided, streamed payloads are
+            compressed and decompressed in memory
+    """
+    if len(name.encode()) > 255:
+        raise ValueError("Codec names must be at most 255 bytes.")
+    CODECS[name] = (compress, decompress)
+    if open_stream is not None:
+        STREAM_CODECS[name] = open_stream
+    else:
+        STREAM_CODECS.pop(name, None)
+
+
+def validate(serializer: str, compression: str = None) -> None:
+    """
+    Checks that the provided serializer and compression codec are available.
+
+    Args:
+        - serializer (str): the name of a serializer
+        - compression (str, optional): the name of a compression codec
+
+    Raises:
+        - ValueError: if either is not available
+    """
+    if serializer not in SERIALIZERS:
+        raise ValueError(
+            "Unknown serializer {!r}; available serializers are: {}".format(
+                serializer, ", ".join(sorted(SERIALIZERS))
+            )
+        )
+    if compression is not None and compression not in CODECS:
+        raise ValueError(
+            "Unknown compression codec {!r}; available codecs are: {}".format(
+                compression, ", ".join(sorted(CODECS))
+            )
+        )
+
+
+def has_header(blob: bytes) -> bool:
+    """
+    Returns whether the provided payload was written by `dumps`.
+    """
+    return blob[: len(MAGIC)] == MAGIC
+
+
+def _header(serializer: str, compression: str = None) -> bytes:
+    header = bytearray(MAGIC)
+    header.append(HEADER_VERSION)
+    for name in [serializer, compression or ""]:
+        encoded = name.encode()
+        header.append(len(encoded))
+        header.extend(encoded)
+    return bytes(header)
+
+
+def _read_header(fileobj: BinaryIO) -> Tuple[str, Any]:
+    """
+    Reads the header of a payload whose magic bytes have already been read, returning
+    the names of its serializer and compression codec.
+    """
+    version = fileobj.read(1)
+    if version != bytes([HEADER_VERSION]):
+        raise ValueError("Unknown result header version: {!r}".format(version))
+
+    names = []
+    for _ in range(2):
+        size = fileobj.read(1)
+        names.append(fileobj.read(size[0] if size else 0).decode())
+    serializer, compression = names[0], names[1] or None
+    validate(serializer, compression)
+    return serializer, compression
+
+
+def dumps(value: Any, serializer: str = "pickle", compression: str = None) -> bytes:
+    """
+    Serializes (and optionally compresses) a value, prefixed by a header describing how
+    it was written.
+
+    Args:
+        - value (Any): the value to serialize
+        - serializer (str, optional): the name of the serializer to use; defaults to
+            `"pickle"`
+        - compression (str, optional): the name of the compression codec to use; defaults
+            to no compression
+
+    Returns:
+        - bytes: the serialized payload
+
+    Raises:
+        - ValueError: if the serializer or compression codec is not available
+    """
+    validate(serializer, compression)
+    blob = SERIALIZERS[serializer].dumps(value)
+    if compression is not None:
+        blob = CODECS[compression][0](blob)
+    return _header(serializer, compression) + blob
+
+
+def loads(blob: bytes) -> Any:
+    """
+    Deserializes a payload written by `dumps`, using the serializer and compression codec
+    recorded in its header.  Payloads without a header are read with `cloudpickle`.
+
+    Args:
+        - blob (bytes): the serialized payload
+
+    Returns:
+        - Any: the deserialized value
+
+    Raises:
+        - ValueError: if the payload was written with an unknown header version,
+            serializer or compression codec
+    """
+    if not has_header(blob):
+        return cloudpickle.loads(blob)
+
+    stream = io.BytesIO(blob)
+    stream.seek(len(MAGIC))
+    serializer, compression = _read_header(stream)
+    payload = blob[stream.tell() :]
+    if compression is not None:
+        payload = CODECS[compression][1](payload)
+    return SERIALIZERS[serializer].loads(payload)
+
+
+def dump(
+    value: Any, fileobj: BinaryIO, serializer: str = "pickle", compression: str = None
+) -> None:
+    """
+    Serializes (and optionally compresses) a value into a writable binary file object,
+    in the same format as `dumps`.  Whenever the serializer and codec support it, the
+    payload is written incrementally rather than being built in memory first.
+
+    Args:
+        - value (Any): the value to serialize
+        - fileobj (BinaryIO): the file object to write to
+        - serializer (str, optional): the name of the serializer to use; defaults to
+            `"pickle"`
+        - compression (str, optional): the name of the compression codec to use; defaults
+            to no compression
+
+    Raises:
+        - ValueError: if the serializer or compression codec is not available
+    """
+    validate(serializer, compression)
+    fileobj.write(_header(serializer, compression))
+    if compression is None:
+        SERIALIZERS[serializer].dump(value, fileobj)
+    elif compression in STREAM_CODECS:
+        compressed = STREAM_CODECS[compression](fileobj, "wb")
+        try:
+            SERIALIZERS[serializer].dump(value, compressed)
+        finally:
+            compressed.close()
+    else:
+        fileobj.write(CODECS[compression][0](SERIALIZERS[serializer].dumps(value)))
+
+
+class _RawReader(io.RawIOBase):
+    """
+    Adapts any object with a `read` method to the raw I/O interface, so that it can be
+    wrapped in an `io.BufferedReader`.
+    """
+
+    def __init__(self, fileobj: Any) -> None:
+        self._fileobj = fileobj
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        # large reads are split into chunks, so that no more than one chunk is held in
+        # an intermediate buffer at a time
+        data = self._fileobj.read(min(len(b), CHUNK_SIZE))
+        b[: len(data)] = data
+        return len(data)
+
+
+def load(fileobj: Any, legacy: Callable[[bytes], Any] = cloudpickle.loads) -> Any:
+    """
+    Deserializes a payload written by `dump` (or `dumps`) from a readable file object,
+    reading and decompressing it incrementally whenever the serializer and codec support
+    it.
+
+    Args:
+        - fileobj (Any): any object with a `read` method
+        - legacy (Callable, optional): the function used to read payloads without a
+            header, which are read into memory in full; defaults to `cloudpickle.loads`
+
+    Returns:
+        - Any: the deserialized value
+
+    Raises:
+        - ValueError: if the payload was written with an unknown header version,
+            serializer or compression codec
+    """
+    stream = io.BufferedReader(_RawReader(fileobj), CHUNK_SIZE)  # type: Any
+    prefix = stream.read(len(MAGIC))
+    if prefix != MAGIC:
+        return legacy(prefix + stream.read())
+
+    serializer, compression = _read_header(stream)
+    if compression is None:
+        return SERIALIZERS[serializer].load(stream)
+    elif compression in STREAM_CODECS:
+        return SERIALIZERS[serializer].load(STREAM_CODECS[compression](stream, "rb"))
+    else:
+        payload = CODECS[compression][1](stream.read())
+        return SERIALIZERS[serializer].loads(payload)
+
+
+class _PipeReader:
+    """
+    The readable end of a pipe fed by a background thread.  Reads are always filled to
+    the requested size unless the end of the stream is reached, and if the thread
+    feeding the pipe fails, reading the end of the stream raises its error.
+    """
+
+    def __init__(self, fd: int, thread: threading.Thread, errors: List[Exception]):
+        self._file = open(fd, "rb", buffering=0)
+        self._thread = thread
+        self._position = 0
+        self.errors = errors
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            chunks = []  # type: List[bytes]
+            while True:
+                chunk = self.read(CHUNK_SIZE)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._file.read(size - len(data))
+            if not chunk:
+                self._thread.join()
+                if self.errors:
+                    raise self.errors[0]
+                break
+            data.extend(chunk)
+        self._position += len(data)
+        return bytes(data)
+
+    def close(self) -> None:
+        """
+        Closes the pipe (which unblocks the background thread if the stream wasn't fully
+        read) and waits for the thread to finish.
+        """
+        self._file.close()
+        self._thread.join()
+
+
+def _feed_pipe(fill: Callable[[BinaryIO], None]) -> _PipeReader:
+    """
+    Runs `fill` in a background thread, passing it the writable end of a pipe, and
+    returns the readable end.
+    """
+    read_fd, write_fd = os.pipe()
+    errors = []  # type: List[Exception]
+
+    def feed() -> None:
+        try:
+            with open(write_fd, "wb", buffering=0) as writer:
+                fill(writer)
+        except BrokenPipeError:
+            pass  # the reader stopped reading
+        except Exception as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=feed, daemon=True)
+    reader = _PipeReader(read_fd, thread, errors)
+    thread.start()
+    return reader
+
+
+@contextmanager
+def stream_dump(
+    value: Any, serializer: str = "pickle", compression: str = None
+) -> Iterator[Any]:
+    """
+    Context manager which serializes a value in a background thread, yielding a readable
+    stream of the payload (in the same format as `dumps`).  The payload is passed through
+    a pipe, so only a small amount of it is held in memory at once; if serializing the
+    value fails, reading the end of the stream raises the error.
+
+    Args:
+        - value (Any): the value to serialize
+        - serializer (str, optional): the name of the serializer to use; defaults to
+            `"pickle"`
+        - compression (str, optional): the name of the compression codec to use; defaults
+            to no compression
+
+    Yields:
+        - a readable file object containing the payload
+
+    Raises:
+        - ValueError: if the serializer or compression codec is not available
+    """
+    validate(serializer, compression)
+    reader = _feed_pipe(lambda f: dump(value, f, serializer, compression))
+    try:
+        yield reader
+    finally:
+        reader.close()
+
+
+def stream_load(
+    fill: Callable[[BinaryIO], None], legacy: Callable[[bytes], Any] = cloudpickle.loads
+) -> Any:
+    """
+    Deserializes a payload which `fill` writes into a file object (for example, a download
+    function), reading it through a pipe as it is written so that the payload is never
+    held in memory in full.
+
+    Args:
+        - fill (Callable): a function which writes the payload to the file object it is
+            passed; it is called in a background thread
+        - legacy (Callable, optional): the function used to read payloads without a
+            header; defaults to `cloudpickle.loads`
+
+    Returns:
+        - Any: the deserialized value
+
+    Raises:
+        - Exception: any error raised by `fill` or while deserializing
+    """
+    reader = _feed_pipe(fill)
+    try:
+        return load(reader, legacy=legacy)
+    except Exception:
+        # errors from `fill` (which truncate the payload) take precedence
+        reader.close()
+        if reader.errors:
+            raise reader.errors[0]
+        raise
+    finally:
+        reader.close()
@@ -196,9 +196,9 @@ class State:
         Args:
             - json_blob (dict): the JSON representing the serialized state
         """
-        from prefect.serialization.state import StateSchema
+        from prefect.serialization.state import deserialize_state
 
-        state = StateSchema().load(json_blob)
+        state = deserialize_state(json_blob)
         return state
 
     def serialize(self) -> dict:
@@ -208,9 +208,9 @@ class State:
         Returns:
             - dict: a JSON representation of the state
         """
-        from prefect.serialization.state import StateSchema
+        from prefect.serialization.state import serialize_state
 
-        json_blob = StateSchema().dump(self)
+        json_blob = serialize_state(self)
         return json_blob
 
 
@@ -24,7 +24,7 @@ import prefect
 from prefect import config
 from prefect.core import Edge, Task
 from prefect.engine import signals
-from prefect.engine.result import NoResult, Result
+from prefect.engine.result import NoResult, Result, SafeResult
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
 from prefect.engine.state import (
     Cached,
@@ -43,7 +43,7 @@ from prefect.engine.state import (
     TimedOut,
     TriggerFailed,
 )
-from prefect.utilities.executors import run_with_heartbeat
+from prefect.utilities.executors import io_map, run_with_heartbeat
 
 if TYPE_CHECKING:
     from prefect.engine.result_handlers import ResultHandler
@@ -525,6 +525,10 @@ class TaskRunner(Runner):
         Upstream state result values are used. If the current state has `cached_inputs`, they
         will override any upstream values which are `NoResult`.
 
+        Note that no results are read at this stage: any `SafeResult` inputs are returned
+        as-is and are only hydrated by `load_task_inputs` once the task is actually going to
+        run. Tasks which end up skipped, cached or trigger-failed never read their inputs.
+
         Args:
             - state (State): the task's current state.
             - upstream_states (Dict[Edge, State]): the upstream state_handlers
@@ -538,14 +542,12 @@ class TaskRunner(Runner):
         for edge, upstream_state in upstream_states.items():
             # construct task inputs
             if edge.key is not None:
-                task_inputs[  # type: ignore
-                    edge.key
-                ] = upstream_state._result.to_result()  # type: ignore
+                task_inputs[edge.key] = upstream_state._result  # type: ignore
 
         if state.is_pending() and state.cached_inputs is not None:  # type: ignore
             task_inputs.update(
                 {
-                    k: r.to_result()
+                    k: r
                     for k, r in state.cached_inputs.items()  # type: ignore
                     if task_inputs.get(k, NoResult) == NoResult
                 }
@@ -553,6 +555,52 @@ class TaskRunner(Runner):
 
         return task_inputs
 
+    def load_task_inputs(self, inputs: Dict[str, Result]) -> Dict[str, Result]:
+        """
+        Reads any task inputs which are not yet hydrated, using their result handlers.
+        When several inputs need to be read, the reads are issued concurrently through the
+        shared I/O pool (see `prefect.utilities.executors.io_map`).
+
+        The provided dictionary is updated in place, so that inputs are read at most once
+        per task run regardless of how many pipeline steps need their values.
+
+        Args:
+            - inputs (Dict[str, Result]): a dictionary of inputs whose keys correspond
+                to the task's `run()` arguments.
+
+        Returns:
+            - Dict[str, Result]: the same dictionary, with every input hydrated
+        """
+        unread = [
+            key
+            for key, res in inputs.items()
+            if isinstance(res, SafeResult) and res != NoResult
+        ]
+        loaded = io_map(lambda key: inputs[key].to_result(), unread)
+        inputs.update(zip(unread, loaded))  # type: ignore
+        return inputs
+
+    def load_inputs_for_cache_validator(
+        self, inputs: Dict[str, Result]
+    ) -> Dict[str, Result]:
+        """
+        Hydrates the task's inputs before they're passed to its cache validator, unless the
+        validator is one of the built-in `prefect.engine.cache_validators`, which only read
+        the inputs they compare.  Custom validators therefore always receive fully hydrated
+        `Result`s.
+
+        Args:
+            - inputs (Dict[str, Result]): a dictionary of inputs whose keys correspond
+                to the task's `run()` arguments.
+
+        Returns:
+            - Dict[str, Result]: the same dictionary, updated in place
+        """
+        validator_module = getattr(self.task.cache_validator, "__module__", None)
+        if validator_module != prefect.engine.cache_validators.__name__:
+            self.load_task_inputs(inputs)
+        return inputs
+
     @call_state_handlers
     def check_task_is_cached(self, state: State, inputs: Dict[str, Result]) -> State:
         """
@@ -571,6 +619,7 @@ class TaskRunner(Runner):
         """
         if state.is_cached():
             assert isinstance(state, Cached)  # mypy assert
+            self.load_inputs_for_cache_validator(inputs)
             if self.task.cache_validator(
                 state, inputs, prefect.context.get("parameters")
             ):
@@ -666,10 +715,10 @@ class TaskRunner(Runner):
                 break
 
         def run_fn(
-            state: State, map_index: int, upstream_states: Dict[Edge, State]
+            state: State,
+            map_context: Dict[str, Any],
+            upstream_states: Dict[Edge, State],
         ) -> State:
-            map_context = context.copy()
-            map_context.update(map_index=map_index)
             return self.run(
                 upstream_states=upstream_states,
                 # if we set the state here, then it will not be processed by `initialize_run()`
@@ -684,16 +733,42 @@ class TaskRunner(Runner):
         else:
             initial_states = []
         initial_states.extend([None] * (len(map_upstream_states) - len(initial_states)))
+        initial_states, map_contexts = self.initialize_mapped_runs(
+            initial_states=initial_states[: len(map_upstream_states)], context=context
+        )
 
-        # map over the initial states, a counter representing the map_index, and also the mapped upstream states
+        # map over the initial states, the contexts of each map_index, and also the mapped upstream states
         map_states = executor.map(
-            run_fn, initial_states, range(len(map_upstream_states)), map_upstream_states
+            run_fn, initial_states, map_contexts, map_upstream_states
         )
 
         return Mapped(
             message="Mapped tasks submitted for execution.", map_states=map_states
         )
 
+    def initialize_mapped_runs(
+        self, initial_states: List[Optional[State]], context: Dict[str, Any]
+    ) -> Tuple[List[Optional[State]], List[Dict[str, Any]]]:
+        """
+        Prepares the children of a mapped task for execution, returning the state and
+        context each child is run with.
+
+        Args:
+            - initial_states (List[Optional[State]]): the initial state of each child, in
+                order of map index; `None` if the child doesn't have one yet
+            - context (Dict[str, Any]): the context of the mapped task
+
+        Returns:
+            - Tuple[List[Optional[State]], List[Dict[str, Any]]]: the initial state and the
+                context of each child
+        """
+        contexts = []
+        for map_index in range(len(initial_states)):
+            map_context = context.copy()
+            map_context.update(map_index=map_index)
+            contexts.append(map_context)
+        return initial_states, contexts
+
     @call_state_handlers
     def wait_for_mapped_task(
         self, state: State, executor: "prefect.engine.executors.Executor"
@@ -784,7 +859,7 @@ class TaskRunner(Runner):
             timeout_handler = (
                 timeout_handler or prefect.utilities.executors.timeout_handler
             )
-            raw_inputs = {k: r.value for k, r in inputs.items()}
+            raw_inputs = {k: r.value for k, r in self.load_task_inputs(inputs).items()}
             with prefect.context(logger=self.task.logger):
                 result = timeout_handler(
                     self.task.run, timeout=self.task.timeout, **raw_inputs
@@ -802,7 +877,9 @@ class TaskRunner(Runner):
         result = Result(value=result, result_handler=self.result_handler)
         state = Success(result=result, message="Task run succeeded.")
 
-        ## only checkpoint tasks if running in cloud
+        ## only checkpoint tasks if running in cloud; this write stays synchronous, as the
+        ## Success state must not be reported (or handed back to the flow runner, possibly
+        ## in another process) before its result is durably stored
         if (
             state.is_successful()
             and prefect.context.get("cloud") is True
@@ -1,4 +1,7 @@
-from typing import Set
+import collections
+import gzip
+import json
+from typing import Any, Dict, List, Optional, Set
 
 from marshmallow import fields, post_load, pre_dump, utils
 
@@ -30,6 +33,36 @@ def get_reference_tasks(obj: prefect.Flow, context: dict) -> Set:
         return utils.get_value(obj, "reference_tasks")
 
 
+class EdgesField(fields.Nested):
+    """
+    Loads a flow's edges directly from the slugs of their tasks, which the flow's
+    `TaskSchema` has already loaded into the shared task cache, instead of loading both
+    tasks of every edge through `TaskSchema`.  Edges which refer to unknown tasks or
+    have unexpected values are all loaded through `EdgeSchema` instead.
+    """
+
+    def _deserialize(self, value, attr, data, **kwargs):  # type: ignore
+        task_cache = self.context.get("task_cache", {})
+        Edge = prefect.core.Edge
+        try:
+            edges = []
+            for edge in value:
+                mapped = edge.get("mapped", False)
+                if mapped is not None and type(mapped) is not bool:
+                    raise TypeError("Not a valid boolean: {!r}".format(mapped))
+                edges.append(
+                    Edge(
+                        upstream_task=task_cache[edge["upstream_task"]["slug"]],
+                        downstream_task=task_cache[edge["downstream_task"]["slug"]],
+                        key=edge.get("key"),
+                        mapped=mapped,
+                    )
+                )
+            return edges
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return super()._deserialize(value, attr, data, **kwargs)
+
+
 class FlowSchema(ObjectSchema):
     class Meta:
         object_class = lambda: prefect.core.Flow
@@ -45,7 +78,7 @@ class FlowSchema(ObjectSchema):
     schedule = fields.Nested(ScheduleSchema, allow_none=True)
     parameters = Nested(ParameterSchema, value_selection_fn=get_parameters, many=True)
     tasks = fields.Nested(TaskSchema, many=True)
-    edges = fields.Nested(EdgeSchema, many=True)
+    edges = EdgesField(EdgeSchema, many=True)
     reference_tasks = Nested(
         TaskSchema, value_selection_fn=get_reference_tasks, many=True, only=["slug"]
     )
@@ -57,8 +90,10 @@ class FlowSchema(ObjectSchema):
         """
         Flow edges are validated, for example to make sure the keys match Task inputs,
         but because we are deserializing all Tasks as base Tasks, the edge validation will
-        fail (base Tasks have no inputs). Therefore we hold back the edges from Flow
-        initialization and assign them explicitly.
+        fail (base Tasks have no inputs). Therefore we hold back the tasks and edges from
+        Flow initialization and add them to the Flow directly, which also avoids the
+        work `Flow.add_task` and `Flow.add_edge` do for every task and edge of
+        large flows.
 
         Args:
             - data (dict): the deserialized data
@@ -67,6 +102,216 @@ class FlowSchema(ObjectSchema):
             - Flow
 
         """
+        if not self.context.get("create_object", True):
+            return super().create_object(data)
+
+        # tasks and edges are added in bulk: every task was loaded once, by slug, and
+        # the edges were loaded from the same tasks, so there's nothing for
+        # `Flow.add_task` and `Flow.add_edge` to check
+        tasks = data.pop("tasks", None) or []
+        edges = data.pop("edges", None) or []
+        reference_tasks = data.pop("reference_tasks", None) or []
         data["validate"] = False
         flow = super().create_object(data)
+        flow.tasks.update(tasks)
+        for edge in edges:
+            flow.tasks.add(edge.upstream_task)
+            flow.tasks.add(edge.downstream_task)
+        flow.edges.update(edges)
+        flow.set_reference_tasks(reference_tasks)
         return flow
+
+
+# -------------------------------------------------------------------
+# Compact encoding
+#
+# `FlowSchema` output repeats the same keys, version tags, class names and input
+# signatures for every task and edge.  The compact encoding stores every distinct value
+# once, tasks and parameters as rows of indices into those values, and edges as
+# integer indices into the list of tasks.
+# -------------------------------------------------------------------
+
+_COMPACT_FORMAT = 1
+# most of the size of an encoded flow is task slugs, which don't compress further
+_COMPACT_COMPRESSLEVEL = 6
+_COMPACT_KEYS = ("tasks", "parameters", "edges", "reference_tasks")
+
+
+class _Values:
+    """
+    Interns JSON values, returning the index of each distinct value.
+    """
+
+    def __init__(self) -> None:
+        self.values = []  # type: List[Any]
+        self.index = {}  # type: Dict[Any, int]
+
+    def __call__(self, value: Any) -> int:
+        # other values are keyed by tuples, so that `1` and `"1"` (or `1` and `True`)
+        # stay distinct, and collections by their representation
+        if type(value) is str:
+            key = value  # type: Any
+        elif isinstance(value, (dict, list)):
+            key = (repr(value),)
+        else:
+            key = (type(value), value)
+        index = self.index.get(key)
+        if index is None:
+            index = self.index[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+def _encode_records(records: List[dict], intern: _Values) -> dict:
+    # the header lists the columns in index order, which plain dicts don't keep on
+    # every supported Python version
+    columns = collections.OrderedDict()  # type: Dict[str, int]
+    for record in records:
+        for key in record:
+            columns.setdefault(key, len(columns))
+    rows = []
+    strings = intern.index
+    for record in records:
+        row = [-1] * len(columns)
+        for key, value in record.items():
+            # look strings up directly, since most values are strings
+            i = strings.get(value) if type(value) is str else None
+            row[columns[key]] = intern(value) if i is None else i
+        rows.append(row)
+    return dict(columns=list(columns), rows=rows)
+
+
+def _decode_records(encoded: dict, values: List[Any]) -> List[dict]:
+    columns = encoded["columns"]
+    return [
+        {column: values[i] for column, i in zip(columns, row) if i != -1}
+        for row in encoded["rows"]
+    ]
+
+
+def _versioned(data: dict, version: Optional[str]) -> dict:
+    if version is not None:
+        data["__version__"] = version
+    return data
+
+
+def _edge(
+    upstream: str, downstream: str, key: Any, mapped: Any, version: Optional[str]
+) -> dict:
+    return _versioned(
+        dict(
+            upstream_task=_versioned(dict(slug=upstream), version),
+            downstream_task=_versioned(dict(slug=downstream), version),
+            key=key,
+            mapped=mapped,
+        ),
+        version,
+    )
+
+
+def compress_flow(serialized_flow: dict) -> bytes:
+    """
+    Encodes the output of `FlowSchema().dump` (or `Flow.serialize`) compactly: every
+    distinct value (such as a task class name or input signature) is stored once, tasks
+    and parameters refer to values by index, and edges are stored as indices into the
+    list of tasks.  The result is gzipped, and is usually far smaller, and faster to
+    produce, than `prefect.utilities.graphql.compress` of the same data.
+
+    Args:
+        - serialized_flow (dict): a serialized flow
+
+    Returns:
+        - bytes: the encoded flow, which `decompress_flow` decodes
+
+    Raises:
+        - ValueError: if the data isn't a serialized flow, for example if an edge
+            refers to a task which isn't one of the flow's tasks
+    """
+    version = serialized_flow.get("__version__")
+    intern = _Values()
+    encoded = dict(
+        format=_COMPACT_FORMAT,
+        flow={k: v for k, v in serialized_flow.items() if k not in _COMPACT_KEYS},
+    )  # type: Dict[str, Any]
+
+    tasks = serialized_flow.get("tasks", [])
+    slugs = [task.get("slug") for task in tasks]
+    task_index = {slug: i for i, slug in enumerate(slugs)}
+    if len(task_index) != len(tasks):
+        raise ValueError("The tasks of a flow must have distinct slugs.")
+    if "tasks" in serialized_flow:
+        encoded["tasks"] = _encode_records(tasks, intern)
+    if "parameters" in serialized_flow:
+        encoded["parameters"] = _encode_records(serialized_flow["parameters"], intern)
+
+    if "edges" in serialized_flow:
+        edges = []  # type: List[int]
+        encoded["edges"] = edges
+        for edge in serialized_flow["edges"]:
+            try:
+                upstream = task_index[edge["upstream_task"]["slug"]]
+                downstream = task_index[edge["downstream_task"]["slug"]]
+                key, mapped = edge["key"], edge["mapped"]
+            except (KeyError, TypeError):
+                raise ValueError("Unsupported edge: {}".format(edge))
+            if edge != _edge(slugs[upstream], slugs[downstream], key, mapped, version):
+                raise ValueError("Unsupported edge: {}".format(edge))
+            edges.extend([upstream, downstream, intern(key), intern(mapped)])
+
+    if "reference_tasks" in serialized_flow:
+        references = []  # type: List[int]
+        encoded["reference_tasks"] = references
+        for ref in serialized_flow["reference_tasks"]:
+            i = task_index.get(ref.get("slug"), -1)
+            if i == -1 or ref != _versioned(dict(slug=slugs[i]), version):
+                raise ValueError("Unsupported reference task: {}".format(ref))
+            references.append(i)
+
+    encoded["values"] = intern.values
+    return gzip.compress(
+        json.dumps(encoded, separators=(",", ":")).encode(),
+        compresslevel=_COMPACT_COMPRESSLEVEL,
+    )
+
+
+def decompress_flow(data: bytes) -> dict:
+    """
+    Decodes a flow encoded by `compress_flow`, returning the same data as the serialized
+    flow that was encoded, for use with `FlowSchema().load`.
+
+    Args:
+        - data (bytes): the encoded flow
+
+    Returns:
+        - dict: the serialized flow
+
+    Raises:
+        - ValueError: if the data wasn't encoded by a compatible version of
+            `compress_flow`
+    """
+    encoded = json.loads(gzip.decompress(data).decode())
+    if encoded.get("format") != _COMPACT_FORMAT:
+        raise ValueError(
+            "Unsupported compact flow format: {}".format(encoded.get("format"))
+        )
+    values = encoded["values"]
+    serialized_flow = encoded["flow"]
+    version = serialized_flow.get("__version__")
+
+    tasks = _decode_records(encoded.get("tasks", dict(columns=[], rows=[])), values)
+    slugs = [task.get("slug") for task in tasks]
+    if "tasks" in encoded:
+        serialized_flow["tasks"] = tasks
+    if "parameters" in encoded:
+        serialized_flow["parameters"] = _decode_records(encoded["parameters"], values)
+    if "edges" in encoded:
+        it = iter(encoded["edges"])
+        serialized_flow["edges"] = [
+            _edge(slugs[u], slugs[d], values[key], values[mapped], version)
+            for u, d, key, mapped in zip(it, it, it, it)
+        ]
+    if "reference_tasks" in encoded:
+        serialized_flow["reference_tasks"] = [
+            _versioned(dict(slug=slugs[i]), version) for i in encoded["reference_tasks"]
+        ]
+    return serialized_flow
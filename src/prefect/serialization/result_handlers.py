@@ -5,6 +5,8 @@ from marshmallow import ValidationError, fields, post_load
 
 from prefect.engine.cloud.result_handler import CloudResultHandler
 from prefect.engine.result_handlers import (
+    ArrowResultHandler,
+    ContentAddressedResultHandler,
     GCSResultHandler,
     JSONResultHandler,
     LocalResultHandler,
@@ -44,6 +46,8 @@ class CloudResultHandlerSchema(BaseResultHandlerSchema):
         object_class = CloudResultHandler
 
     result_handler_service = fields.String(allow_none=True)
+    serializer = fields.String(allow_none=False)
+    compression = fields.String(allow_none=True)
 
 
 class GCSResultHandlerSchema(BaseResultHandlerSchema):
@@ -51,6 +55,8 @@ class GCSResultHandlerSchema(BaseResultHandlerSchema):
         object_class = GCSResultHandler
 
     bucket = fields.String(allow_none=False)
+    serializer = fields.String(allow_none=False)
+    compression = fields.String(allow_none=True)
 
 
 class JSONResultHandlerSchema(BaseResultHandlerSchema):
@@ -63,6 +69,27 @@ class LocalResultHandlerSchema(BaseResultHandlerSchema):
         object_class = LocalResultHandler
 
     dir = fields.String(allow_none=True)
+    serializer = fields.String(allow_none=False)
+    compression = fields.String(allow_none=True)
+    memory_map = fields.Boolean(allow_none=False)
+
+
+class ContentAddressedResultHandlerSchema(BaseResultHandlerSchema):
+    class Meta:
+        object_class = ContentAddressedResultHandler
+
+    dir = fields.String(allow_none=True)
+    serializer = fields.String(allow_none=False)
+    compression = fields.String(allow_none=True)
+
+
+class ArrowResultHandlerSchema(BaseResultHandlerSchema):
+    class Meta:
+        object_class = ArrowResultHandler
+
+    dir = fields.String(allow_none=True)
+    format = fields.String(allow_none=False)
+    row_group_size = fields.Integer(allow_none=True)
 
 
 class S3ResultHandlerSchema(BaseResultHandlerSchema):
@@ -70,6 +97,8 @@ class S3ResultHandlerSchema(BaseResultHandlerSchema):
         object_class = S3ResultHandler
 
     bucket = fields.String(allow_none=False)
+    serializer = fields.String(allow_none=False)
+    compression = fields.String(allow_none=True)
 
 
 class ResultHandlerSchema(OneOfSchema):
@@ -85,6 +114,8 @@ class ResultHandlerSchema(OneOfSchema):
         "CloudResultHandler": CloudResultHandlerSchema,
         "JSONResultHandler": JSONResultHandlerSchema,
         "LocalResultHandler": LocalResultHandlerSchema,
+        "ContentAddressedResultHandler": ContentAddressedResultHandlerSchema,
+        "ArrowResultHandler": ArrowResultHandlerSchema,
     }
 
     def get_obj_type(self, obj: Any) -> str:
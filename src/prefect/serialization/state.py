@@ -1,11 +1,15 @@
+import datetime
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from marshmallow import ValidationError, fields, post_load
+from marshmallow.utils import ensure_text_type, from_iso_datetime, isoformat
 
+import prefect
 from prefect.engine import result, state
 from prefect.serialization.result import StateResultSchema
-from prefect.utilities.collections import DotDict
+from prefect.serialization.result_handlers import ResultHandlerSchema
+from prefect.utilities.collections import DotDict, as_nested_dict
 from prefect.utilities.serialization import (
     JSONCompatible,
     Nested,
@@ -206,3 +210,255 @@ class StateSchema(OneOfSchema):
         "TimedOut": TimedOutSchema,
         "TriggerFailed": TriggerFailedSchema,
     }
+
+
+# -------------------------------------------------------------------
+# Compiled serialization
+#
+# `StateSchema` spends most of its time in marshmallow's generic machinery (mostly
+# instantiating nested schemas), which is noticeable when a state is (de)serialized for
+# every task run.  The functions below produce the same data and objects from plans
+# compiled once from the schemas of states, results and result handlers.  They handle
+# the canonical values of each field; any other value, and any object or field without
+# a plan, makes them fall back to `StateSchema`, so that results and errors are the same
+# either way.
+# -------------------------------------------------------------------
+
+_MISSING = object()
+
+
+def _dump_string(value: Any) -> Optional[str]:
+    return None if value is None else ensure_text_type(value)
+
+
+def _load_string(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("Not a valid string: {!r}".format(value))
+    return value
+
+
+def _dump_int(value: Any) -> Optional[int]:
+    if value is not None and type(value) is not int:
+        raise TypeError("Not a valid integer: {!r}".format(value))
+    return value
+
+
+def _load_int(value: Any) -> int:
+    if type(value) is not int:
+        raise TypeError("Not a valid integer: {!r}".format(value))
+    return value
+
+
+def _dump_bool(value: Any) -> Optional[bool]:
+    if value is not None and value is not True and value is not False:
+        raise TypeError("Not a valid boolean: {!r}".format(value))
+    return value
+
+
+def _load_bool(value: Any) -> bool:
+    if value is not True and value is not False:
+        raise TypeError("Not a valid boolean: {!r}".format(value))
+    return value
+
+
+def _dump_datetime(value: Any) -> Optional[str]:
+    return None if value is None else isoformat(value)
+
+
+def _load_datetime(value: Any) -> datetime.datetime:
+    if not value:
+        raise ValueError("Not a valid datetime: {!r}".format(value))
+    return from_iso_datetime(value)
+
+
+def _dump_json(value: Any) -> Any:
+    json.dumps(as_nested_dict(value, dict))
+    return value
+
+
+def _load_json(value: Any) -> Any:
+    json.dumps(value)
+    return value
+
+
+def _load_map_states(value: Any) -> list:
+    return [None] * _load_int(value)
+
+
+def _dump_state(obj: Optional[state.State]) -> Optional[dict]:
+    return None if obj is None else _dump(obj, _COMPILED_STATE_SCHEMAS)
+
+
+def _load_state(data: dict) -> state.State:
+    return _load(data, _COMPILED_STATE_SCHEMAS)
+
+
+def _dump_safe_value(res: Any) -> Optional[dict]:
+    return None if res is None else _dump(res.safe_value, _COMPILED_RESULT_SCHEMAS)
+
+
+def _load_result(data: dict) -> result.SafeResult:
+    return _load(data, _COMPILED_RESULT_SCHEMAS)
+
+
+def _dump_safe_values(value: Any) -> Optional[dict]:
+    if value is None:
+        return None
+    return {k: _dump_safe_value(v) for k, v in value.items()}
+
+
+def _load_results(value: dict) -> dict:
+    return {k: _load_result(v) for k, v in value.items()}
+
+
+def _dump_result_handler(handler: Any) -> Optional[dict]:
+    return None if handler is None else _dump(handler, _COMPILED_RESULT_HANDLER_SCHEMAS)
+
+
+def _load_result_handler(data: dict) -> Any:
+    return _load(data, _COMPILED_RESULT_HANDLER_SCHEMAS)
+
+
+_FIELD_CONVERTERS = {
+    JSONCompatible: (_dump_json, _load_json),
+    fields.String: (_dump_string, _load_string),
+    fields.Integer: (_dump_int, _load_int),
+    fields.Boolean: (_dump_bool, _load_bool),
+    fields.DateTime: (_dump_datetime, _load_datetime),
+}
+
+
+def _compile_field(field: fields.Field) -> Optional[tuple]:
+    """
+    Returns the functions which dump and load the values of a schema field, or `None` if
+    the field isn't handled here.
+    """
+    if type(field) in _FIELD_CONVERTERS:
+        return _FIELD_CONVERTERS[type(field)]
+    if type(field) is Nested and field.value_selection_fn is get_safe:
+        if field.nested is StateResultSchema:
+            return _dump_safe_value, _load_result
+    elif type(field) is fields.Nested and not field.many:
+        if field.nested == "StateSchema":
+            return _dump_state, _load_state
+        if field.nested is ResultHandlerSchema:
+            return _dump_result_handler, _load_result_handler
+    elif type(field) is fields.Dict and field.key_container is None:
+        values = field.value_container
+        if type(values) is Nested and values.value_selection_fn is get_safe:
+            if values.nested is StateResultSchema:
+                return _dump_safe_values, _load_results
+    return None
+
+
+def _compile_schemas(type_schemas: dict, create_objects: tuple) -> dict:
+    """
+    Compiles the schemas of a `OneOfSchema`, returning for the name of each type the
+    class its schema creates, and for each of the schema's fields: its name, whether it
+    may be `None`, the functions which dump and load its values, and the keyword argument
+    its value is created with.  Schemas with fields which aren't handled here, or which
+    create objects in ways other than `create_objects`, are left out.
+    """
+    compiled = {}
+    for name, schema in type_schemas.items():
+        opts = schema.opts
+        if schema.create_object not in create_objects:
+            continue
+        plan = []
+        for field_name, field in schema._declared_fields.items():
+            if field_name in opts.exclude:
+                continue
+            converters = _compile_field(field)
+            if converters is None:
+                break
+            dump, load = converters
+            key = field_name  # type: Optional[str]
+            if field_name == "_result":
+                key = "result"
+            elif field_name == "n_map_states":
+                load, key = _load_map_states, "map_states"
+            elif field_name in opts.exclude_fields:
+                key = None
+            plan.append((field_name, field.allow_none, dump, load, key))
+        else:
+            compiled[name] = (opts.object_class, plan)
+    return compiled
+
+
+def _dump(obj: Any, compiled: dict) -> dict:
+    name = type(obj).__name__
+    _, plan = compiled[name]
+    data = {}  # type: Dict[str, Any]
+    for field_name, _, dump, _, _ in plan:
+        value = getattr(obj, field_name, _MISSING)
+        if value is not _MISSING:
+            data[field_name] = dump(value)
+    data["__version__"] = prefect.__version__
+    data["type"] = name
+    return data
+
+
+def _load(data: dict, compiled: dict) -> Any:
+    object_class, plan = compiled[data["type"]]
+    kwargs = {}  # type: Dict[str, Any]
+    for field_name, allow_none, _, load, key in plan:
+        value = data.get(field_name, _MISSING)
+        if value is _MISSING or key is None:
+            continue
+        if value is not None:
+            value = load(value)
+        elif not allow_none:
+            raise ValueError("Field may not be null: {}".format(field_name))
+        kwargs[key] = value
+    return object_class(**kwargs)
+
+
+_COMPILED_RESULT_HANDLER_SCHEMAS = _compile_schemas(
+    ResultHandlerSchema.type_schemas, (ObjectSchema.create_object,)
+)
+_COMPILED_RESULT_SCHEMAS = _compile_schemas(
+    StateResultSchema.type_schemas, (ObjectSchema.create_object,)
+)
+_COMPILED_STATE_SCHEMAS = _compile_schemas(
+    StateSchema.type_schemas,
+    (BaseStateSchema.create_object, MappedSchema.create_object),
+)
+
+
+def serialize_state(obj: state.State) -> dict:
+    """
+    Serializes a state to the same data as `StateSchema().dump`, without the overhead of
+    marshmallow for the states, results and result handlers Prefect defines.
+
+    Args:
+        - obj (State): the state to serialize
+
+    Returns:
+        - dict: the serialized state
+    """
+    try:
+        return _dump(obj, _COMPILED_STATE_SCHEMAS)
+    except Exception:
+        return StateSchema().dump(obj)
+
+
+def deserialize_state(data: dict) -> state.State:
+    """
+    Deserializes a state from the same data as `StateSchema().load`, without the overhead
+    of marshmallow for the states, results and result handlers Prefect defines.
+
+    Args:
+        - data (dict): the serialized state
+
+    Returns:
+        - State: the deserialized state
+
+    Raises:
+        - ValidationError: if the data doesn't represent a valid state
+    """
+    try:
+        if not isinstance(data, dict):
+            data = as_nested_dict(data, dict)
+        return _load_state(data)
+    except Exception:
+        return StateSchema().load(data)
@@ -165,7 +165,9 @@ def as_nested_dict(
     ```
     """
     if isinstance(obj, (list, tuple, set)):
-        return type(obj)([as_nested_dict(d, dct_class) for d in obj])
+        # list subclasses, such as the lazy lists of GraphQL results, become lists
+        seq_type = list if isinstance(obj, list) else type(obj)  # type: type
+        return seq_type([as_nested_dict(d, dct_class) for d in obj])
     elif isinstance(obj, (dict, DotDict)):
         # instantiate the dict and call update because if a dotdict contains a key called
         # `update`, then calling update in __init__ becomes impossible
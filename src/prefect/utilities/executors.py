@@ -1,10 +1,11 @@
 import datetime
+import os
 import signal
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeout
 from functools import wraps
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Union
 
 import dask
 import dask.bag
@@ -91,3 +92,58 @@ def timeout_handler(
         return fut.result(timeout=timeout)
     except FutureTimeout:
         raise TimeoutError("Execution timed out.")
+
+
+_io_pool = None  # type: Optional[ThreadPoolExecutor]
+_io_pool_pid = None  # type: Optional[int]
+_io_pool_lock = threading.Lock()
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide thread pool used for blocking result I/O (for example,
+    reading task inputs through their result handlers).  The pool is created lazily, sized
+    by `engine.result_handler.io_threads` in your Prefect configuration, and recreated
+    if the current process was forked after the pool was started.
+
+    Returns:
+        - ThreadPoolExecutor: the shared I/O pool
+    """
+    global _io_pool, _io_pool_pid
+
+    with _io_pool_lock:
+        if _io_pool is None or _io_pool_pid != os.getpid():
+            _io_pool = ThreadPoolExecutor(
+                max_workers=prefect.config.engine.result_handler.io_threads
+            )
+            _io_pool_pid = os.getpid()
+        return _io_pool
+
+
+def io_map(fn: Callable, items: Iterable) -> List[Any]:
+    """
+    Concurrently calls `fn` on each of the provided items using the shared I/O pool, and
+    returns the results in order.  The current Prefect context is made available to every
+    call, and the first exception raised (if any) is re-raised.
+
+    Single items are processed in the calling thread.  Note that `fn` should not itself
+    call `io_map`, as nested calls could exhaust the pool.
+
+    Args:
+        - fn (Callable): the function to call on each item
+        - items (Iterable): the items to process
+
+    Returns:
+        - List[Any]: the results of `fn(item)` for each item
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+
+    ctx_dict = prefect.context.to_dict()
+
+    def run_with_ctx(item: Any) -> Any:
+        with prefect.context(ctx_dict):
+            return fn(item)
+
+    return list(get_io_pool().map(run_with_ctx, items))
@@ -5,7 +5,7 @@ import re
 import textwrap
 import uuid
 from collections.abc import KeysView, ValuesView
-from typing import Any, Union
+from typing import Any, Iterator, Union
 
 from prefect.utilities.collections import DotDict, as_nested_dict
 
@@ -19,9 +19,58 @@ def lowercase_first_letter(s: str) -> str:
     return s
 
 
+def _wrap(value: Any) -> Any:
+    """
+    Wraps a parsed JSON object in a `GraphQLResult` and a parsed JSON array in a
+    `GraphQLList`; any other value is returned unchanged.
+    """
+    if type(value) is dict:
+        return GraphQLResult.wrap(value)
+    elif type(value) is list:
+        return GraphQLList(value)
+    return value
+
+
 class GraphQLResult(DotDict):
+    """
+    A `DotDict` representing a GraphQL response.
+
+    Results created with `GraphQLResult.wrap` are lazy: they use the parsed JSON object
+    they wrap as their storage, without copying it, and the objects and arrays nested in
+    it are only wrapped in `GraphQLResult`s and `GraphQLList`s when they're accessed, so
+    the cost of a large response is only paid for the parts of it which are used.
+    """
+
     __protect_critical_keys__ = False
 
+    @classmethod
+    def wrap(cls, data: dict) -> "GraphQLResult":
+        """
+        Wraps a parsed JSON object without copying it.
+
+        Args:
+            - data (dict): the parsed JSON object; changes to the result are made to it
+
+        Returns:
+            - GraphQLResult: a result backed by `data`
+        """
+        result = object.__new__(cls)
+        object.__setattr__(result, "__dict__", data)
+        return result
+
+    def __getattribute__(self, attr: str) -> Any:
+        value = object.__getattribute__(self, attr)
+        if (type(value) is dict or type(value) is list) and attr != "__dict__":
+            return self[attr]
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        data = object.__getattribute__(self, "__dict__")
+        value = data[key]
+        if type(value) is dict or type(value) is list:
+            value = data[key] = _wrap(value)
+        return value
+
     def __repr__(self) -> str:
         try:
             return json.dumps(as_nested_dict(self, dict), indent=4)
@@ -29,6 +78,24 @@ class GraphQLResult(DotDict):
             return repr(self.to_dict())
 
 
+class GraphQLList(list):
+    """
+    A list representing an array in a GraphQL response, which wraps the objects in it in
+    `GraphQLResult`s as they're accessed.  The wrappers aren't kept, so iterating over a
+    large array only holds one of them at a time; changes made through them are made to
+    the underlying objects.
+    """
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return GraphQLList(super().__getitem__(index))
+        return _wrap(super().__getitem__(index))
+
+    def __iter__(self) -> Iterator[Any]:
+        for value in super().__iter__():
+            yield _wrap(value)
+
+
 class EnumValue:
     """
     When parsing GraphQL arguments, strings can be wrapped in this class to be rendered
@@ -67,6 +134,41 @@ class GQLObject:
         return self.__name
 
 
+class PreparedQuery(str):
+    """
+    A GraphQL query string which has already been compiled by `prepare_graphql`.
+    `parse_graphql` returns prepared queries unchanged, so they can be passed anywhere a
+    document is expected without being parsed again.
+    """
+
+
+def prepare_graphql(document: Any) -> PreparedQuery:
+    """
+    Compiles a document into a GraphQL-compliant query string once, for queries which are
+    sent many times.  Any values which change from one request to the next should be
+    declared as GraphQL variables and passed with each request, rather than formatted into
+    the document.
+
+    For example:
+    ```
+    SET_STATE = prepare_graphql({
+        "mutation($input: setTaskRunStateInput!)": {
+            "setTaskRunState(input: $input)": {"id"}
+        }
+    })
+
+    client.graphql(SET_STATE, input=dict(taskRunId=task_run_id, version=1, state=state))
+    ```
+
+    Args:
+        - document (Any): a document in any of the forms accepted by `parse_graphql`
+
+    Returns:
+        - PreparedQuery: the compiled query string, which `parse_graphql` returns as is
+    """
+    return PreparedQuery(parse_graphql(document))
+
+
 def parse_graphql(document: Any) -> str:
     """
     Parses a document into a GraphQL-compliant query string.
@@ -149,6 +251,8 @@ def parse_graphql(document: Any) -> str:
     Raises:
         - TypeError: if the user provided a `GQLObject` class, rather than an instance.
     """
+    if isinstance(document, PreparedQuery):
+        return document
     delimiter = "    "
     parsed = _parse_graphql_inner(document, delimiter=delimiter)
     parsed = parsed.replace(delimiter + "}", "}")
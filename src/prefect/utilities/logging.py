@@ -12,34 +12,176 @@ import atexit
 import logging
 import os
 import queue
+import threading
 import time
-from logging.handlers import QueueHandler, QueueListener
-from typing import Any
+from logging.handlers import QueueHandler
+from typing import Any, Dict, List, Optional
 
 import prefect
 from prefect.configuration import config
+from prefect.utilities.graphql import compress
 
 
-class RemoteHandler(logging.StreamHandler):
+# reports the RemoteHandler's own failures; it doesn't propagate to the "prefect" logger,
+# so that they aren't sent to Cloud themselves
+_handler_logger = logging.getLogger("RemoteHandler")
+
+
+class RemoteHandler(QueueHandler):
+    """
+    A logging handler which ships log records to Prefect Cloud.
+
+    Records are placed on a bounded queue, so logging never blocks on the network; a
+    background thread takes them off the queue in batches of up to
+    `logging.remote.batch_size` records, waiting at most `logging.remote.batch_interval`
+    seconds for a batch to fill.  Each record is sent with a request of its own or, if
+    `logging.remote.batch` is set, each batch is sent as a single compressed payload;
+    requests are retried up to `logging.remote.max_retries` times with exponential
+    backoff if they fail.  Records which are logged while the queue is full, or which
+    can't be sent, are dropped and counted in `dropped`; requests which fail for good
+    are counted in `failed` and logged to the `RemoteHandler` logger, which isn't sent
+    to Cloud.
+    """
+
     def __init__(self) -> None:
-        super().__init__()
+        super().__init__(queue.Queue(maxsize=config.logging.remote.queue_size))
         self.logger_server = config.cloud.log
         self.client = None
-        self.errored_out = False
-
-    def emit(self, record) -> None:  # type: ignore
+        self.dropped = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._thread = None  # type: Optional[threading.Thread]
+        self._pid = None  # type: Optional[int]
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                # the shipping thread doesn't survive a fork, and the queue may have been
+                # copied mid-operation, so a forked process starts over with its own
+                self.queue = queue.Queue(
+                    maxsize=config.logging.remote.queue_size
+                )  # type: queue.Queue
+                self._thread = threading.Thread(
+                    target=self._ship, name="prefect-log-shipper", daemon=True
+                )
+                self._thread.start()
+                self._pid = os.getpid()
         try:
-            from prefect.client import Client
-
-            if self.errored_out is True:
-                return
-            if self.client is None:
-                self.client = Client()  # type: ignore
-
-            assert isinstance(self.client, Client)  # mypy assert
-            r = self.client.post(path="", server=self.logger_server, **record.__dict__)
-        except:
-            self.errored_out = True
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _ship(self) -> None:
+        log_queue = self.queue
+        while True:
+            batch = [log_queue.get()]
+            deadline = time.monotonic() + config.logging.remote.batch_interval
+            while len(batch) < config.logging.remote.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(log_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            if records:
+                try:
+                    self._send(records)
+                except Exception as exc:
+                    # for example, a record which can't be formatted; the thread must
+                    # keep running, or the queue would fill up for good
+                    with self._lock:
+                        self.failed += 1
+                        self.dropped += len(records)
+                    _handler_logger.warning("Failed to send logs: %r", exc)
+            for _ in batch:
+                log_queue.task_done()
+            if len(records) < len(batch):
+                return  # closed
+
+    def _send(self, records: List[logging.LogRecord]) -> None:
+        if config.logging.remote.batch:
+            payload = compress([_serialize_record(record) for record in records])
+            if not self._post(logs=payload):
+                with self._lock:
+                    self.dropped += len(records)
+        else:
+            for record in records:
+                if not self._post(**_serialize_record(record)):
+                    with self._lock:
+                        self.dropped += 1
+
+    def _post(self, **params: Any) -> bool:
+        """
+        Posts to the log API, retrying if the request fails.
+
+        Returns:
+            - bool: whether the request succeeded
+        """
+        from prefect.client import Client
+
+        max_retries = config.logging.remote.max_retries
+        for attempt in range(max_retries + 1):
+            try:
+                if self.client is None:
+                    self.client = Client()  # type: ignore
+                self.client.post(  # type: ignore
+                    path="", server=self.logger_server, **params
+                )
+                return True
+            except Exception as exc:
+                if attempt < max_retries:
+                    time.sleep(config.logging.remote.backoff_factor * 2 ** attempt)
+                else:
+                    error = exc
+        with self._lock:
+            self.failed += 1
+        _handler_logger.warning(
+            "Failed to send logs to %s: %r", self.logger_server, error
+        )
+        return False
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """
+        Waits for every record which has been logged to be sent (or dropped).
+
+        Args:
+            - timeout (float, optional): the most seconds to wait; defaults to 10
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return
+        with self.queue.all_tasks_done:  # type: ignore
+            self.queue.all_tasks_done.wait_for(  # type: ignore
+                lambda: not self.queue.unfinished_tasks, timeout  # type: ignore
+            )
+
+    def close(self) -> None:
+        """
+        Sends any records which are still queued and stops the shipping thread.
+        """
+        if self._thread is not None and self._pid == os.getpid():
+            self.flush()
+            try:
+                self.queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread = self._pid = None
+        super().close()
+
+
+def _serialize_record(record: logging.LogRecord) -> Dict[str, Any]:
+    """
+    Returns the attributes of a prepared log record, converting any which can't be
+    represented in JSON to strings.
+    """
+    return {
+        key: value
+        if value is None or isinstance(value, (str, int, float, bool))
+        else str(value)
+        for key, value in record.__dict__.items()
+    }
 
 
 old_factory = logging.getLogRecordFactory()
@@ -14,6 +14,28 @@ def test_cli_is_installed():
     assert b"The Prefect CLI" in output
 
 
+def test_prune_results(tmpdir):
+    handler = prefect.engine.result_handlers.ContentAddressedResultHandler(
+        dir=str(tmpdir)
+    )
+    fpath = handler.write("x")
+
+    result = CliRunner().invoke(
+        prefect.cli.cli, ["prune-results", str(tmpdir), "--days", "0", "--dry-run"]
+    )
+    assert result.exit_code == 0
+    assert fpath in result.output
+    assert "Would prune 1 result(s)." in result.output
+    assert os.path.exists(fpath)
+
+    result = CliRunner().invoke(
+        prefect.cli.cli, ["prune-results", str(tmpdir), "--days", "0"]
+    )
+    assert result.exit_code == 0
+    assert "Pruned 1 result(s)." in result.output
+    assert not os.path.exists(fpath)
+
+
 def error_flow():
     @prefect.task
     def zero_error():
@@ -0,0 +1,283 @@
+import asyncio
+import http.server
+import json
+import socketserver
+import sys
+import threading
+import time
+import uuid
+
+import pytest
+
+import prefect
+from prefect.client import AsyncClient, Client
+from prefect.engine.state import Pending, Running
+from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.exceptions import AuthorizationError, ClientError
+
+pytest.importorskip("tornado")
+
+
+class StubCloud:
+    """
+    A local stand-in for the Prefect Cloud GraphQL API, which records the requests it
+    receives and answers them with `respond(query, variables)`.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.token = "token"
+        self.refreshes = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = 0
+        self.statuses = []
+        self.lock = threading.Lock()
+        self.respond = lambda query, variables: {"data": {}}
+
+    def handler(self):
+        cloud = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"] or 0))
+                if self.path.endswith("refresh_token"):
+                    with cloud.lock:
+                        cloud.refreshes += 1
+                        cloud.token = "token-{}".format(cloud.refreshes)
+                    return self.reply(200, {"token": cloud.token})
+                if self.headers["Authorization"] != "Bearer {}".format(cloud.token):
+                    return self.reply(401, {})
+
+                params = json.loads(body.decode())
+                with cloud.lock:
+                    cloud.requests.append(params)
+                    cloud.in_flight += 1
+                    cloud.max_in_flight = max(cloud.max_in_flight, cloud.in_flight)
+                    status = cloud.statuses.pop(0) if cloud.statuses else 200
+                time.sleep(cloud.delay)
+                with cloud.lock:
+                    cloud.in_flight -= 1
+                if status != 200:
+                    return self.reply(status, {})
+                variables = json.loads(params["variables"])
+                self.reply(200, cloud.respond(params["query"], variables))
+
+            def reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture()
+def cloud():
+    class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+        daemon_threads = True
+
+    stub = StubCloud()
+    server = Server(("127.0.0.1", 0), stub.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}".format(server.server_address[1])
+    with set_temporary_config(
+        {
+            "cloud.graphql": url,
+            "cloud.auth_token": "token",
+            "cloud.http.backoff_factor": 0,
+        }
+    ):
+        yield stub
+    server.shutdown()
+    server.server_close()
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_graphql(cloud):
+    cloud.respond = lambda query, variables: {"data": {"answer": variables["x"]}}
+    client = AsyncClient()
+    result = run(client.graphql({"query": {"answer": True}}, x=42))
+    assert result.data.answer == 42
+    assert cloud.requests[0]["query"].startswith("query")
+
+
+def test_graphql_errors_get_raised(cloud):
+    cloud.respond = lambda query, variables: {"errors": [{"message": "GraphQL issue!"}]}
+    with pytest.raises(ClientError, match="GraphQL issue!"):
+        run(AsyncClient().graphql("query { answer }"))
+
+
+def test_requests_require_a_token(cloud):
+    with set_temporary_config({"cloud.auth_token": None}):
+        client = AsyncClient()
+    client.token = None
+    with pytest.raises(AuthorizationError):
+        run(client.graphql("query { answer }"))
+
+
+def test_many_requests_run_concurrently(cloud):
+    cloud.delay = 0.1
+    cloud.respond = lambda query, variables: {"data": {"i": variables["i"]}}
+    client = AsyncClient()
+
+    async def many():
+        return await asyncio.gather(
+            *[client.graphql("query { i }", i=i) for i in range(50)]
+        )
+
+    results = run(many())
+    assert [r.data.i for r in results] == list(range(50))
+    assert cloud.max_in_flight > 10
+
+
+def test_concurrency_is_limited_by_config(cloud):
+    cloud.delay = 0.05
+    with set_temporary_config({"cloud.http.max_concurrent_requests": 3}):
+        client = AsyncClient()
+
+        async def many():
+            await asyncio.gather(*[client.graphql("query { i }") for i in range(12)])
+
+        run(many())
+    assert cloud.max_in_flight == 3
+
+
+def test_methods_send_the_same_documents_as_the_sync_client(cloud):
+    cloud.respond = lambda query, variables: {"data": {}}
+    flow_run_id, task_run_id = str(uuid.uuid4()), str(uuid.uuid4())
+    Client().set_task_run_state(task_run_id, 1, Running())
+    Client().update_flow_run_heartbeat(flow_run_id)
+    client = AsyncClient()
+    run(client.set_task_run_state(task_run_id, 1, Running()))
+    run(client.update_flow_run_heartbeat(flow_run_id))
+
+    sync_requests, async_requests = cloud.requests[:2], cloud.requests[2:]
+    assert sync_requests == async_requests
+
+
+def test_get_task_run_info(cloud):
+    def respond(query, variables):
+        task_run = {
+            "id": "tr",
+            "version": 3,
+            "serialized_state": Pending().serialize(),
+            "task": {"slug": "slug"},
+        }
+        return {"data": {"getOrCreateTaskRun": {"task_run": task_run}}}
+
+    cloud.respond = respond
+    info = run(AsyncClient().get_task_run_info("fr", "t", map_index=2))
+    assert (info.id, info.version, info.task_slug) == ("tr", 3, "slug")
+    assert isinstance(info.state, Pending)
+    variables = json.loads(cloud.requests[0]["variables"])
+    assert variables["input"]["mapIndex"] == 2
+
+
+def test_get_task_run_infos_sends_a_request_per_batch(cloud):
+    def respond(query, variables):
+        data = {
+            key.replace("input", "run"): {
+                "task_run": {
+                    "id": "tr-{}".format(value["mapIndex"]),
+                    "version": 0,
+                    "serialized_state": Pending().serialize(),
+                    "task": {"slug": "slug"},
+                }
+            }
+            for key, value in variables.items()
+        }
+        return {"data": data}
+
+    cloud.respond = respond
+    with set_temporary_config({"cloud.flow_runs.map_batch_size": 2}):
+        infos = run(AsyncClient().get_task_run_infos("fr", "t", map_indices=range(5)))
+    assert [info.id for info in infos] == ["tr-{}".format(i) for i in range(5)]
+    assert len(cloud.requests) == 3
+
+
+def test_get_flow_run_info(cloud):
+    def respond(query, variables):
+        flow_run = {
+            "parameters": {},
+            "context": None,
+            "version": 0,
+            "scheduled_start_time": "2019-01-25T19:15:58.632412+00:00",
+            "serialized_state": Running().serialize(),
+            "task_runs": [],
+        }
+        return {"data": {"flow_run_by_pk": flow_run}}
+
+    cloud.respond = respond
+    info = run(AsyncClient().get_flow_run_info("fr"))
+    assert isinstance(info.state, Running)
+    assert info.scheduled_start_time.year == 2019
+    assert list(info.task_runs) == []
+
+
+def test_expired_tokens_are_refreshed_once(cloud):
+    cloud.token = "new"
+    client = AsyncClient()
+
+    async def many():
+        await asyncio.gather(*[client.graphql("query { i }") for i in range(20)])
+
+    run(many())
+    assert cloud.refreshes == 1
+    assert client.token == "token-1"
+    assert len(cloud.requests) == 20
+
+
+def test_queries_are_retried(cloud):
+    cloud.statuses = [503, 502]
+    cloud.respond = lambda query, variables: {"data": {"ok": True}}
+    assert run(AsyncClient().graphql("query { ok }")).data.ok is True
+    assert len(cloud.requests) == 3
+
+
+def test_mutations_are_not_retried(cloud):
+    import tornado.httpclient
+
+    cloud.statuses = [503]
+    with pytest.raises(tornado.httpclient.HTTPError):
+        run(AsyncClient().graphql("mutation { ok }"))
+    assert len(cloud.requests) == 1
+
+
+def test_authentication_is_shared_with_a_sync_client(cloud):
+    client = Client()
+    async_client = AsyncClient(client=client)
+    assert async_client.client is client
+    assert async_client.graphql_server == client.graphql_server
+
+    cloud.token = "new"
+    run(async_client.graphql("query { i }"))
+    assert client.token == async_client.token == "token-1"
+
+
+def test_sync_only_methods_are_not_provided():
+    client = AsyncClient()
+    assert not isinstance(client, Client)
+    for name in ["deploy", "create_project", "set_secret", "login", "logout"]:
+        assert not hasattr(client, name)
+
+
+def test_missing_tornado_raises_a_helpful_error(cloud, monkeypatch):
+    monkeypatch.setitem(sys.modules, "tornado.httpclient", None)
+    with pytest.raises(ImportError, match='"async" extra'):
+        run(AsyncClient().graphql("query { i }"))
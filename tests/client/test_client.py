@@ -1,7 +1,11 @@
 import base64
+import collections
 import datetime
+import http.server
 import json
 import os
+import socketserver
+import threading
 import uuid
 from unittest.mock import MagicMock, mock_open
 
@@ -11,7 +15,13 @@ import pytest
 import requests
 
 import prefect
-from prefect.client.client import Client, FlowRunInfoResult, TaskRunInfoResult
+from prefect.client.client import (
+    Client,
+    FlowRunInfoResult,
+    TaskRunInfoResult,
+    _get_session,
+    _set_task_run_states_mutation,
+)
 from prefect.engine.result import NoResult, Result, SafeResult
 from prefect.engine.state import (
     Cached,
@@ -92,7 +102,7 @@ def test_client_doesnt_login_if_no_tokens_available(monkeypatch, cloud):
     )
     mock_file = mock_open()
     monkeypatch.setattr("builtins.open", mock_file)
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
 
     config = {
         "cloud.graphql": "http://my-cloud.foo",
@@ -120,7 +130,7 @@ def test_client_logs_out_and_deletes_auth_token(monkeypatch):
             ok=True, json=MagicMock(return_value=dict(token="secrettoken"))
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config({"cloud.graphql": "http://my-cloud.foo"}):
         client = Client()
     client.login("test@example.com", "1234")
@@ -134,7 +144,7 @@ def test_client_logs_out_and_deletes_auth_token(monkeypatch):
 
 def test_client_raises_if_login_fails(monkeypatch):
     post = MagicMock(return_value=MagicMock(ok=False))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config({"cloud.graphql": "http://my-cloud.foo"}):
         client = Client()
     with pytest.raises(AuthorizationError):
@@ -145,7 +155,7 @@ def test_client_raises_if_login_fails(monkeypatch):
 
 def test_client_posts_raises_with_no_token(monkeypatch):
     post = MagicMock()
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": None}
     ):
@@ -159,7 +169,7 @@ def test_client_posts_to_graphql_server(monkeypatch):
     post = MagicMock(
         return_value=MagicMock(json=MagicMock(return_value=dict(success=True)))
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -179,7 +189,7 @@ def test_client_posts_retries_if_token_needs_refreshing(monkeypatch):
             json=MagicMock(return_value=dict(token="new-token")),
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -198,7 +208,7 @@ def test_client_posts_graphql_to_graphql_server(monkeypatch):
             json=MagicMock(return_value=dict(data=dict(success=True)))
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -218,7 +228,7 @@ def test_client_graphql_retries_if_token_needs_refreshing(monkeypatch):
             json=MagicMock(return_value=dict(token="new-token")),
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -231,6 +241,198 @@ def test_client_graphql_retries_if_token_needs_refreshing(monkeypatch):
     assert client.token == "new-token"
 
 
+def test_clients_share_a_session_across_threads():
+    sessions = []
+    threads = [
+        threading.Thread(target=lambda: sessions.append(_get_session()))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(s is _get_session() for s in sessions)
+
+
+def test_session_is_recreated_in_forked_processes(monkeypatch):
+    session = _get_session()
+    monkeypatch.setattr("os.getpid", lambda: -1)
+    assert _get_session() is not session
+
+
+def test_session_pool_size_is_configurable(monkeypatch):
+    monkeypatch.setattr("prefect.client.client._session", None)
+    with set_temporary_config({"cloud.http.pool_size": 3}):
+        adapter = _get_session().get_adapter("https://api.prefect.io")
+    assert adapter._pool_maxsize == 3
+
+
+def test_requests_time_out_after_the_configured_timeout(monkeypatch, retry_config):
+    get = MagicMock()
+    monkeypatch.setattr("requests.Session.get", get)
+    with set_temporary_config({"cloud.http.timeout": 5}):
+        Client().get("/foo")
+    assert get.call_args[1]["timeout"] == 5
+
+    with set_temporary_config({"cloud.http.timeout": 0}):
+        Client().get("/foo")
+    assert get.call_args[1]["timeout"] is None
+
+
+def test_timed_out_queries_are_retried(monkeypatch, retry_config):
+    post = flaky_request(requests.Timeout())
+    monkeypatch.setattr("requests.Session.post", post)
+    assert Client().graphql("query { x }").data.x == 1
+    assert post.call_count == 2
+    assert post.call_args[1]["timeout"] == prefect.config.cloud.http.timeout
+
+
+def test_login_and_token_refreshes_use_the_shared_session(monkeypatch):
+    post = MagicMock(
+        return_value=MagicMock(
+            ok=True, json=MagicMock(return_value=dict(token="secrettoken"))
+        )
+    )
+    monkeypatch.setattr("requests.Session.post", post)
+    monkeypatch.setattr("builtins.open", mock_open())
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.http.timeout": 5}
+    ):
+        client = Client()
+        client.login("test@example.com", "1234")
+        client.refresh_token()
+    assert [c[0][0] for c in post.call_args_list] == [
+        "http://my-cloud.foo/login_email",
+        "http://my-cloud.foo/refresh_token",
+    ]
+    assert all(c[1]["timeout"] == 5 for c in post.call_args_list)
+
+
+def flaky_request(*errors):
+    """
+    Returns a mock request function which raises each of the provided errors in turn
+    before succeeding.
+    """
+    responses = []
+    for error in errors:
+        if isinstance(error, int):
+            exc = requests.HTTPError()
+            exc.response = MagicMock(status_code=error)
+            error = MagicMock(raise_for_status=MagicMock(side_effect=exc))
+        responses.append(error)
+    responses.append(MagicMock(json=MagicMock(return_value=dict(data=dict(x=1)))))
+    return MagicMock(side_effect=responses)
+
+
+@pytest.fixture
+def retry_config():
+    with set_temporary_config(
+        {
+            "cloud.graphql": "http://my-cloud.foo",
+            "cloud.auth_token": "secret_token",
+            "cloud.http.backoff_factor": 0,
+            "cloud.http.max_retries": 2,
+        }
+    ):
+        yield
+
+
+def test_gets_are_retried(monkeypatch, retry_config):
+    get = flaky_request(requests.ConnectionError(), 503)
+    monkeypatch.setattr("requests.Session.get", get)
+    assert Client().get("/foo") == dict(data=dict(x=1))
+    assert get.call_count == 3
+
+
+def test_graphql_queries_are_retried(monkeypatch, retry_config):
+    post = flaky_request(requests.Timeout(), 502)
+    monkeypatch.setattr("requests.Session.post", post)
+    assert Client().graphql("query { x }").data.x == 1
+    assert post.call_count == 3
+
+
+def test_retries_give_up_after_max_retries(monkeypatch, retry_config):
+    error = requests.ConnectionError()
+    get = flaky_request(error, error, error)
+    monkeypatch.setattr("requests.Session.get", get)
+    with pytest.raises(requests.ConnectionError):
+        Client().get("/foo")
+    assert get.call_count == 3
+
+
+def test_retries_back_off_exponentially(monkeypatch, retry_config):
+    sleep = MagicMock()
+    monkeypatch.setattr("prefect.client.client.time.sleep", sleep)
+    monkeypatch.setattr("requests.Session.get", flaky_request(503, 503))
+    with set_temporary_config({"cloud.http.backoff_factor": 0.5}):
+        Client().get("/foo")
+    assert [c[0][0] for c in sleep.call_args_list] == [0.5, 1.0]
+
+
+@pytest.mark.parametrize("query", ["mutation { x }", "  mutation($a: Int) { x }"])
+def test_graphql_mutations_are_not_retried(monkeypatch, retry_config, query):
+    post = flaky_request(requests.ConnectionError())
+    monkeypatch.setattr("requests.Session.post", post)
+    with pytest.raises(requests.ConnectionError):
+        Client().graphql(query)
+    assert post.call_count == 1
+
+
+def test_posts_and_client_errors_are_not_retried(monkeypatch, retry_config):
+    post = flaky_request(503)
+    monkeypatch.setattr("requests.Session.post", post)
+    with pytest.raises(requests.HTTPError):
+        Client().post("/foo")
+    assert post.call_count == 1
+
+    get = flaky_request(404)
+    monkeypatch.setattr("requests.Session.get", get)
+    with pytest.raises(requests.HTTPError):
+        Client().get("/foo")
+    assert get.call_count == 1
+
+
+def test_client_keeps_connections_alive():
+    connections = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps(dict(data=dict(ok=True))).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = "http://127.0.0.1:{}".format(server.server_address[1])
+        with set_temporary_config({"cloud.graphql": url, "cloud.auth_token": "token"}):
+            for _ in range(10):
+                assert Client().graphql("query { ok }").data.ok is True
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(connections) == 1
+
+
 ## test actual mutation and query handling
 def test_graphql_errors_get_raised(monkeypatch):
     post = MagicMock(
@@ -238,7 +440,7 @@ def test_graphql_errors_get_raised(monkeypatch):
             json=MagicMock(return_value=dict(data="42", errors="GraphQL issue!"))
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -262,7 +464,7 @@ def test_client_deploy(monkeypatch, compressed):
             "data": {"project": [{"id": "proj-id"}], "createFlow": {"id": "long-id"}}
         }
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -288,7 +490,7 @@ def test_client_deploy_builds_flow(monkeypatch, compressed):
             "data": {"project": [{"id": "proj-id"}], "createFlow": {"id": "long-id"}}
         }
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -326,7 +528,7 @@ def test_client_deploy_optionally_avoids_building_flow(monkeypatch, compressed):
             "data": {"project": [{"id": "proj-id"}], "createFlow": {"id": "long-id"}}
         }
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -353,7 +555,7 @@ def test_client_deploy_optionally_avoids_building_flow(monkeypatch, compressed):
 def test_client_deploy_with_bad_proj_name(monkeypatch):
     response = {"data": {"project": []}}
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -405,7 +607,7 @@ def test_get_flow_run_info(monkeypatch):
             json=MagicMock(return_value=dict(data=json.loads(response)))
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -421,6 +623,69 @@ def test_get_flow_run_info(monkeypatch):
     assert result.version == 0
     assert result.parameters == dict()
 
+    # task runs are deserialized as they're consumed
+    task_runs = list(result.task_runs)
+    assert len(task_runs) == 1
+    assert isinstance(task_runs[0], TaskRunInfoResult)
+    assert task_runs[0].task_slug == "da344768-5f5d-4eaf-9bca-83815617f713"
+    assert isinstance(task_runs[0].state, Pending)
+
+
+def test_get_flow_run_info_without_task_runs(monkeypatch):
+    response = {
+        "flow_run_by_pk": {
+            "version": 0,
+            "parameters": {},
+            "context": None,
+            "scheduled_start_time": "2019-01-25T19:15:58.632412+00:00",
+            "serialized_state": Pending().serialize(),
+        }
+    }
+    post = MagicMock(
+        return_value=MagicMock(json=MagicMock(return_value=dict(data=response)))
+    )
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    result = client.get_flow_run_info(flow_run_id="74-salt", include_task_runs=False)
+    assert "task_runs" not in post.call_args[1]["json"]["query"]
+    assert isinstance(result.state, Pending)
+    assert list(result.task_runs) == []
+
+
+def test_get_flow_run_task_runs(monkeypatch):
+    task_run = {
+        "id": "tr",
+        "task": {"id": "t", "slug": "slug"},
+        "version": 2,
+        "serialized_state": Running().serialize(),
+    }
+    post = MagicMock(
+        return_value=MagicMock(
+            json=MagicMock(return_value=dict(data=dict(task_run=[task_run])))
+        )
+    )
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    result = client.get_flow_run_task_runs(
+        flow_run_id="74-salt", task_slugs=["slug", "other"]
+    )
+
+    query = post.call_args[1]["json"]["query"]
+    assert 'flow_run_id: { _eq: "74-salt" }' in query
+    assert 'slug: { _in: ["slug", "other"] }' in query
+    assert result == [
+        TaskRunInfoResult(
+            id="tr", task_id="t", task_slug="slug", version=2, state=result[0].state
+        )
+    ]
+    assert isinstance(result[0].state, Running)
+
 
 def test_get_flow_run_info_raises_informative_error(monkeypatch):
     response = """
@@ -433,7 +698,7 @@ def test_get_flow_run_info_raises_informative_error(monkeypatch):
             json=MagicMock(return_value=dict(data=json.loads(response)))
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -446,7 +711,7 @@ def test_get_flow_run_info_raises_informative_error(monkeypatch):
 def test_set_flow_run_state(monkeypatch):
     response = {"data": {"setFlowRunState": {"id": 1}}}
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -463,7 +728,7 @@ def test_set_flow_run_state_with_error(monkeypatch):
         "errors": [{"message": "something went wrong"}],
     }
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -499,7 +764,7 @@ def test_get_task_run_info(monkeypatch):
             json=MagicMock(return_value=dict(data=json.loads(response)))
         )
     )
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -515,13 +780,88 @@ def test_get_task_run_info(monkeypatch):
     assert result.version == 0
 
 
+def test_get_task_run_infos_sends_one_aliased_mutation(monkeypatch):
+    def task_run(i):
+        return {
+            "task_run": {
+                "id": "id-{}".format(i),
+                "version": i,
+                "serialized_state": {"type": "Pending", "__version__": "0.3.3"},
+                "task": {"slug": "slug"},
+            }
+        }
+
+    response = {"data": {"run{}".format(i): task_run(i) for i in range(3)}}
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    result = client.get_task_run_infos(
+        flow_run_id="74-salt", task_id="72-salt", map_indices=range(3)
+    )
+
+    assert post.call_count == 1
+    query = post.call_args[1]["json"]["query"]
+    variables = json.loads(post.call_args[1]["json"]["variables"])
+    for i in range(3):
+        assert "run{0}: getOrCreateTaskRun(input: $input{0})".format(i) in query
+        assert variables["input{}".format(i)]["mapIndex"] == i
+    assert [r.id for r in result] == ["id-0", "id-1", "id-2"]
+    assert [r.version for r in result] == [0, 1, 2]
+    assert all(isinstance(r.state, Pending) for r in result)
+    assert all(isinstance(r, TaskRunInfoResult) for r in result)
+    assert client.get_task_run_infos("74-salt", "72-salt", []) == []
+    assert post.call_count == 1
+
+
+def test_get_task_run_infos_sends_a_mutation_per_batch(monkeypatch):
+    def post(url, **kwargs):
+        variables = json.loads(kwargs["json"]["variables"])
+        data = {
+            key.replace("input", "run"): {
+                "task_run": {
+                    "id": "id-{}".format(value["mapIndex"]),
+                    "version": 0,
+                    "serialized_state": {"type": "Pending", "__version__": "0.3.3"},
+                    "task": {"slug": "slug"},
+                }
+            }
+            for key, value in variables.items()
+        }
+        return MagicMock(json=MagicMock(return_value={"data": data}))
+
+    post = MagicMock(side_effect=post)
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {
+            "cloud.graphql": "http://my-cloud.foo",
+            "cloud.auth_token": "secret_token",
+            "cloud.flow_runs.map_batch_size": 2,
+        }
+    ):
+        client = Client()
+        result = client.get_task_run_infos(
+            flow_run_id="74-salt", task_id="72-salt", map_indices=range(5)
+        )
+
+    assert post.call_count == 3
+    assert [r.id for r in result] == ["id-{}".format(i) for i in range(5)]
+    batches = [
+        sorted(v["mapIndex"] for v in json.loads(c[1]["json"]["variables"]).values())
+        for c in post.call_args_list
+    ]
+    assert batches == [[0, 1], [2, 3], [4]]
+
+
 def test_get_task_run_info_with_error(monkeypatch):
     response = {
         "data": {"getOrCreateTaskRun": None},
         "errors": [{"message": "something went wrong"}],
     }
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -539,7 +879,7 @@ def test_set_task_run_state(monkeypatch):
     response = {"data": {"setTaskRunState": None}}
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
 
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -555,7 +895,7 @@ def test_set_task_run_state_serializes(monkeypatch):
     response = {"data": {"setTaskRunState": None}}
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
 
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -568,6 +908,86 @@ def test_set_task_run_state_serializes(monkeypatch):
         )
 
 
+def test_set_task_run_states_sends_one_aliased_mutation(monkeypatch):
+    response = {"data": {"update0": {"id": "a"}, "update1": {"id": "b"}}}
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    errors = client.set_task_run_states([("a", 0, Pending()), ("b", 3, Running())])
+
+    assert errors == [None, None]
+    assert post.call_count == 1
+    params = post.call_args[1]["json"]
+    query = params["query"]
+    assert (
+        "mutation($input0: setTaskRunStateInput!, $input1: setTaskRunStateInput!)"
+        in query
+    )
+    assert query.index("update0: setTaskRunState(input: $input0)") < query.index(
+        "update1: setTaskRunState(input: $input1)"
+    )
+    variables = json.loads(params["variables"])
+    assert variables["input1"]["taskRunId"] == "b"
+    assert variables["input1"]["version"] == 3
+    assert variables["input0"]["state"]["type"] == "Pending"
+    assert variables["input1"]["state"]["type"] == "Running"
+
+
+def test_set_task_run_states_mutation_orders_its_fields(monkeypatch):
+    prepare_graphql = MagicMock()
+    monkeypatch.setattr("prefect.client.client.prepare_graphql", prepare_graphql)
+    _set_task_run_states_mutation.cache_clear()
+    try:
+        _set_task_run_states_mutation(12)
+    finally:
+        _set_task_run_states_mutation.cache_clear()
+    (fields,) = prepare_graphql.call_args[0][0].values()
+    # dicts aren't ordered on every supported Python version
+    assert isinstance(fields, collections.OrderedDict)
+    assert [key.split(":")[0] for key in fields] == [
+        "update{}".format(i) for i in range(12)
+    ]
+
+
+def test_set_task_run_states_reports_errors_per_update(monkeypatch):
+    response = {
+        "data": {"update0": {"id": "a"}, "update1": None},
+        "errors": [{"message": "version mismatch", "path": ["update1"]}],
+    }
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    errors = client.set_task_run_states([("a", 0, Pending()), ("b", 3, Running())])
+
+    assert errors[0] is None
+    assert isinstance(errors[1], ClientError)
+    assert "version mismatch" in str(errors[1])
+
+
+def test_set_task_run_states_fails_every_update_for_unattributed_errors(monkeypatch):
+    response = {"errors": [{"message": "bad request"}]}
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    errors = client.set_task_run_states([("a", 0, Pending()), ("b", 3, Running())])
+
+    assert all(isinstance(e, ClientError) for e in errors)
+    assert client.set_task_run_states([]) == []
+    assert post.call_count == 1
+
+
 def test_set_task_run_state_with_error(monkeypatch):
     response = {
         "data": {"setTaskRunState": None},
@@ -575,7 +995,7 @@ def test_set_task_run_state_with_error(monkeypatch):
     }
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
 
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
     ):
@@ -584,3 +1004,23 @@ def test_set_task_run_state_with_error(monkeypatch):
     with pytest.raises(ClientError) as exc:
         client.set_task_run_state(task_run_id="76-salt", version=0, state=Pending())
     assert "something went wrong" in str(exc.value)
+
+
+def test_hot_path_mutations_are_prepared_once(monkeypatch):
+    response = {"data": {"setTaskRunState": {"id": 1}}}
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    client.set_task_run_state(task_run_id="a", version=1, state=Pending())
+    client.set_task_run_state(task_run_id="b", version=2, state=Running())
+
+    first, second = [call[1]["json"] for call in post.call_args_list]
+    assert first["query"] == second["query"]
+    assert "taskRunId" not in first["query"]
+    variables = json.loads(second["variables"])
+    assert variables["input"]["taskRunId"] == "b"
+    assert variables["input"]["version"] == 2
+    assert variables["input"]["state"]["type"] == "Running"
@@ -1,10 +1,12 @@
 import json
+import threading
 from unittest.mock import MagicMock
 
 import pytest
 
 import prefect
-from prefect.client import Secret
+from prefect.client import Secret, invalidate_secrets, prefetch_secrets
+from prefect.client.secrets import declared_secrets
 from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.exceptions import AuthorizationError
 
@@ -13,6 +15,43 @@ from prefect.utilities.exceptions import AuthorizationError
 #################################
 
 
+@pytest.fixture(autouse=True)
+def clear_secret_cache():
+    invalidate_secrets()
+    yield
+    invalidate_secrets()
+
+
+@pytest.fixture()
+def cloud_secrets(monkeypatch):
+    """
+    Answers secret queries with the value "<name>-value" for each secret, returning the
+    mocked `post` method.
+    """
+
+    def post(url, **kwargs):
+        variables = json.loads(kwargs["json"]["variables"])
+        if "name" in variables:
+            data = {"secretValue": variables["name"] + "-value"}
+        else:
+            data = {
+                var.replace("name", "secret"): name + "-value"
+                for var, name in variables.items()
+            }
+        return MagicMock(json=MagicMock(return_value={"data": data}))
+
+    post = MagicMock(side_effect=post)
+    monkeypatch.setattr("requests.Session.post", post)
+    with set_temporary_config(
+        {
+            "cloud.auth_token": "secret_token",
+            "cloud.use_local_secrets": False,
+            "cloud.secrets.cache_ttl": 300,
+        }
+    ):
+        yield post
+
+
 def test_create_secret():
     secret = Secret(name="test")
     assert secret
@@ -47,7 +86,7 @@ def test_secret_value_depends_on_use_local_secrets():
 def test_secrets_use_client(monkeypatch):
     response = {"data": {"secretValue": "1234"}}
     post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
-    monkeypatch.setattr("requests.post", post)
+    monkeypatch.setattr("requests.Session.post", post)
     with set_temporary_config(
         {"cloud.auth_token": "secret_token", "cloud.use_local_secrets": False}
     ):
@@ -79,3 +118,166 @@ def test_secrets_dont_raise_just_because_flow_key_is_populated():
     with set_temporary_config({"cloud.use_local_secrets": True}):
         with prefect.context(secrets=dict(test=42), flow="not None"):
             assert secret.get() == 42
+
+
+class TestSecretCache:
+    def test_cloud_secrets_are_retrieved_once(self, cloud_secrets):
+        assert Secret("a").get() == "a-value"
+        assert Secret("a").get() == "a-value"
+        assert Secret("b").get() == "b-value"
+        assert cloud_secrets.call_count == 2
+
+    def test_cloud_secrets_are_retrieved_once_across_threads(self, cloud_secrets):
+        values = []
+        threads = [
+            threading.Thread(target=lambda: values.append(Secret("a").get()))
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert values == ["a-value"] * 20
+        assert cloud_secrets.call_count == 1
+
+    def test_cached_secrets_expire(self, cloud_secrets, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("time.monotonic", lambda: now[0])
+        with set_temporary_config({"cloud.secrets.cache_ttl": 10}):
+            Secret("a").get()
+            now[0] += 9
+            Secret("a").get()
+            assert cloud_secrets.call_count == 1
+            now[0] += 2
+            Secret("a").get()
+            assert cloud_secrets.call_count == 2
+
+    def test_caching_can_be_disabled(self, cloud_secrets):
+        with set_temporary_config({"cloud.secrets.cache_ttl": 0}):
+            Secret("a").get()
+            Secret("a").get()
+        assert cloud_secrets.call_count == 2
+
+    def test_invalidate_secrets(self, cloud_secrets):
+        Secret("a").get()
+        Secret("b").get()
+        invalidate_secrets(["a"])
+        Secret("a").get()
+        Secret("b").get()
+        assert cloud_secrets.call_count == 3
+        invalidate_secrets()
+        Secret("b").get()
+        assert cloud_secrets.call_count == 4
+
+    def test_secrets_are_not_cached_by_default(self, monkeypatch):
+        response = {"data": {"secretValue": "1234"}}
+        post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+        monkeypatch.setattr("requests.Session.post", post)
+        with set_temporary_config(
+            {"cloud.auth_token": "secret_token", "cloud.use_local_secrets": False}
+        ):
+            Secret("a").get()
+            Secret("a").get()
+        assert post.call_count == 2
+
+    def test_secrets_are_cached_by_server_and_token(self, cloud_secrets):
+        Secret("a").get()
+        with set_temporary_config({"cloud.auth_token": "other_token"}):
+            Secret("a").get()
+        with set_temporary_config({"cloud.graphql": "http://other-cloud.foo"}):
+            Secret("a").get()
+        Secret("a").get()
+        assert cloud_secrets.call_count == 3
+        assert cloud_secrets.call_args_list[1][1]["headers"] == {
+            "Authorization": "Bearer other_token"
+        }
+
+    def test_secrets_are_retrieved_concurrently(self, cloud_secrets):
+        post = cloud_secrets.side_effect
+        started, release = threading.Event(), threading.Event()
+
+        def slow_post(url, **kwargs):
+            if '"a"' in kwargs["json"]["variables"]:
+                started.set()
+                release.wait(5)
+            return post(url, **kwargs)
+
+        cloud_secrets.side_effect = slow_post
+        values = []
+        threads = [
+            threading.Thread(target=lambda: values.append(Secret("a").get()))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        assert started.wait(5)
+        # another secret isn't held up by the retrieval in progress
+        assert Secret("b").get() == "b-value"
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert values == ["a-value"] * 3
+        assert cloud_secrets.call_count == 2
+
+    def test_failed_retrievals_are_not_cached(self, cloud_secrets):
+        cloud_secrets.side_effect = ValueError("no secrets today")
+        with pytest.raises(ValueError):
+            Secret("a").get()
+        cloud_secrets.side_effect = None
+        cloud_secrets.return_value = MagicMock(
+            json=MagicMock(return_value={"data": {"secretValue": "a-value"}})
+        )
+        assert Secret("a").get() == "a-value"
+
+    def test_local_secrets_are_not_cached(self):
+        with set_temporary_config({"cloud.use_local_secrets": True}):
+            with prefect.context(secrets=dict(test=1)):
+                assert Secret("test").get() == 1
+            with prefect.context(secrets=dict(test=2)):
+                assert Secret("test").get() == 2
+
+
+class TestPrefetchSecrets:
+    def test_prefetch_retrieves_secrets_with_one_request(self, cloud_secrets):
+        prefetch_secrets(["a", "b", "c", "a"])
+        assert cloud_secrets.call_count == 1
+        query = cloud_secrets.call_args[1]["json"]["query"]
+        assert query.count("secretValue") == 3
+
+        assert [Secret(name).get() for name in "abc"] == [
+            "a-value",
+            "b-value",
+            "c-value",
+        ]
+        assert cloud_secrets.call_count == 1
+
+    def test_prefetch_skips_cached_secrets(self, cloud_secrets):
+        Secret("a").get()
+        prefetch_secrets(["a", "b"])
+        assert cloud_secrets.call_count == 2
+        query = cloud_secrets.call_args[1]["json"]["query"]
+        assert query.count("secretValue") == 1
+        prefetch_secrets(["a", "b"])
+        assert cloud_secrets.call_count == 2
+
+    def test_prefetch_does_nothing_with_local_secrets(self, cloud_secrets):
+        with set_temporary_config({"cloud.use_local_secrets": True}):
+            prefetch_secrets(["a"])
+        assert cloud_secrets.call_count == 0
+
+    def test_declared_secrets(self):
+        class SecretTask(prefect.Task):
+            def __init__(self, credentials_secret="CREDENTIALS", **kwargs):
+                self.credentials_secret = credentials_secret
+                self.other_secret = None
+                super().__init__(**kwargs)
+
+        flow = prefect.Flow(
+            "test",
+            tasks=[
+                SecretTask(),
+                SecretTask(credentials_secret="OTHER"),
+                prefect.Task(),
+            ],
+        )
+        assert declared_secrets(flow) == {"CREDENTIALS", "OTHER"}
@@ -387,3 +387,28 @@ def test_state_handler_failures_are_handled_appropriately(client):
     assert states[0].is_running()
     assert states[1].is_failed()
     assert isinstance(states[1].result, SyntaxError)
+
+
+def test_flow_runner_prefetches_declared_secrets(client, monkeypatch):
+    prefetch = MagicMock()
+    monkeypatch.setattr("prefect.engine.cloud.flow_runner.prefetch_secrets", prefetch)
+
+    class SecretTask(prefect.Task):
+        def __init__(self, credentials_secret="CREDENTIALS", **kwargs):
+            self.credentials_secret = credentials_secret
+            super().__init__(**kwargs)
+
+    flow = prefect.Flow(name="test", tasks=[SecretTask(), prefect.Task()])
+    state = CloudFlowRunner(flow=flow).run(return_tasks=flow.tasks)
+    assert state.is_successful()
+    prefetch.assert_called_once_with({"CREDENTIALS"})
+
+
+def test_flow_runner_runs_even_if_secrets_cant_be_prefetched(client, monkeypatch):
+    prefetch = MagicMock(side_effect=SyntaxError("bad secrets"))
+    monkeypatch.setattr("prefect.engine.cloud.flow_runner.prefetch_secrets", prefetch)
+
+    flow = prefect.Flow(name="test", tasks=[prefect.Task()])
+    state = CloudFlowRunner(flow=flow).run(return_tasks=flow.tasks)
+    assert prefetch.called
+    assert state.is_successful()
@@ -1,4 +1,6 @@
 import datetime
+import threading
+import time
 import uuid
 from collections import Counter, namedtuple
 from unittest.mock import MagicMock
@@ -9,6 +11,7 @@ import pytest
 import prefect
 from prefect.client.client import Client, FlowRunInfoResult, TaskRunInfoResult
 from prefect.engine.cloud import CloudFlowRunner, CloudTaskRunner
+from prefect.engine.cloud.flow_runner import _TaskContexts, _TaskRunPages, _TaskStates
 from prefect.engine.executors import LocalExecutor
 from prefect.engine.result_handlers import ResultHandler
 from prefect.engine.state import (
@@ -119,6 +122,24 @@ class MockedCloudClient(MagicMock):
             ],
         )
 
+    def get_flow_run_task_runs(self, flow_run_id, task_slugs, *args, **kwargs):
+        self.call_count["get_flow_run_task_runs"] += 1
+
+        task_slugs = set(task_slugs)
+        return [
+            TaskRunInfoResult(
+                id=tr.id,
+                task_id=tr.task_slug,
+                task_slug=tr.task_slug,
+                version=tr.version,
+                state=tr.state,
+            )
+            for tr in self.task_runs.values()
+            if tr.flow_run_id == flow_run_id
+            and tr.task_slug in task_slugs
+            and tr.map_index == -1
+        ]
+
     def get_task_run_info(self, flow_run_id, task_id, map_index, *args, **kwargs):
         """
         Return task run if found, otherwise create it
@@ -153,6 +174,17 @@ class MockedCloudClient(MagicMock):
             state=task_run.state,
         )
 
+    def get_task_run_infos(self, flow_run_id, task_id, map_indices):
+        """
+        Return the task runs of many map indices, creating any which don't exist
+        """
+        self.call_count["get_task_run_infos"] += 1
+        self.call_count["get_task_run_info"] -= len(map_indices)
+        return [
+            self.get_task_run_info(flow_run_id, task_id, map_index)
+            for map_index in map_indices
+        ]
+
     def set_flow_run_state(self, flow_run_id, version, state, **kwargs):
         self.call_count["set_flow_run_state"] += 1
         self.call_count[flow_run_id] += 1
@@ -208,6 +240,27 @@ def test_simple_two_task_flow(monkeypatch, executor):
     assert client.task_runs[task_run_id_2].state.is_successful()
 
 
+def test_written_payloads_are_forgotten_when_the_run_ends(monkeypatch):
+    flow_run_id = str(uuid.uuid4())
+    task = prefect.Task()
+    flow = prefect.Flow(name="test", tasks=[task])
+    MockedCloudClient(
+        flow_runs=[FlowRun(id=flow_run_id)],
+        task_runs=[TaskRun(id="tr", task_slug=task.slug, flow_run_id=flow_run_id)],
+        monkeypatch=monkeypatch,
+    )
+    forget_flow_run = MagicMock()
+    monkeypatch.setattr(
+        "prefect.engine.cloud.flow_runner.forget_flow_run", forget_flow_run
+    )
+
+    with prefect.context(flow_run_id=flow_run_id):
+        state = CloudFlowRunner(flow=flow).run()
+
+    assert state.is_successful()
+    forget_flow_run.assert_called_once_with(flow_run_id)
+
+
 @pytest.mark.parametrize("executor", ["local", "sync"], indirect=True)
 def test_scheduled_start_time_is_in_context(monkeypatch, executor):
     flow_run_id = str(uuid.uuid4())
@@ -439,6 +492,9 @@ def test_simple_map(monkeypatch, executor):
     assert client.task_runs[task_run_id_1].state.is_mapped()
     # there should be a total of 4 task runs corresponding to the mapped task
     assert len([tr for tr in client.task_runs.values() if tr.task_slug == t1.slug]) == 4
+    # which are all retrieved with a single request
+    assert client.call_count["get_task_run_infos"] == 1
+    assert client.call_count["get_task_run_info"] == 0
 
 
 @pytest.mark.parametrize("executor", ["local", "sync"], indirect=True)
@@ -633,3 +689,159 @@ def test_deep_map_with_a_retry(monkeypatch):
         if tr.task_slug == t3.slug and tr.map_index == 0
     )
     assert t3_0.state.is_successful()
+
+
+class TestTaskRunPages:
+    def chain(self, monkeypatch, length, states=None):
+        flow_run_id = str(uuid.uuid4())
+        tasks = [prefect.Task(name=str(i)) for i in range(length)]
+        flow = prefect.Flow(name="test")
+        for upstream, downstream in zip(tasks, tasks[1:]):
+            flow.add_edge(upstream, downstream)
+
+        states = states or {}
+        client = MockedCloudClient(
+            flow_runs=[FlowRun(id=flow_run_id)],
+            task_runs=[
+                TaskRun(
+                    id="tr-{}".format(i),
+                    task_slug=t.slug,
+                    flow_run_id=flow_run_id,
+                    state=states.get(i),
+                )
+                for i, t in enumerate(tasks)
+            ],
+            monkeypatch=monkeypatch,
+        )
+        return flow_run_id, flow, tasks, client
+
+    @pytest.mark.parametrize("executor", ["local", "sync"], indirect=True)
+    def test_task_runs_are_retrieved_in_pages(self, monkeypatch, executor):
+        flow_run_id, flow, tasks, client = self.chain(monkeypatch, length=5)
+
+        with set_temporary_config({"cloud.flow_runs.task_run_page_size": 2}):
+            with prefect.context(flow_run_id=flow_run_id):
+                state = CloudFlowRunner(flow=flow).run(
+                    return_tasks=flow.tasks, executor=executor
+                )
+
+        assert state.is_successful()
+        assert client.call_count["get_flow_run_task_runs"] == 3
+        assert client.call_count["get_task_run_info"] == 0
+        for i in range(5):
+            assert client.task_runs["tr-{}".format(i)].state.is_successful()
+
+    def test_task_runs_can_be_retrieved_with_the_flow_run(self, monkeypatch):
+        flow_run_id, flow, tasks, client = self.chain(monkeypatch, length=3)
+
+        with set_temporary_config({"cloud.flow_runs.task_run_page_size": 0}):
+            with prefect.context(flow_run_id=flow_run_id):
+                state = CloudFlowRunner(flow=flow).run(return_tasks=flow.tasks)
+
+        assert state.is_successful()
+        assert client.call_count["get_flow_run_task_runs"] == 0
+        assert client.task_runs["tr-2"].state.is_successful()
+
+    def test_states_from_later_pages_are_respected(self, monkeypatch):
+        flow_run_id, flow, tasks, client = self.chain(
+            monkeypatch, length=4, states={2: Success(result=3), 3: Failed()}
+        )
+
+        with set_temporary_config({"cloud.flow_runs.task_run_page_size": 1}):
+            with prefect.context(flow_run_id=flow_run_id):
+                state = CloudFlowRunner(flow=flow).run(return_tasks=flow.tasks)
+
+        # the last task wasn't run again; its failure fails the flow run
+        assert state.is_failed()
+        assert client.call_count["tr-2"] == 0
+        assert client.call_count["tr-3"] == 0
+        assert client.task_runs["tr-1"].state.is_successful()
+        assert state.result[tasks[3]].is_failed()
+
+    def test_pages_which_fail_are_retried(self, monkeypatch):
+        flow_run_id, flow, tasks, client = self.chain(monkeypatch, length=2)
+        get_page = client.get_flow_run_task_runs
+        calls = []
+
+        def flaky(*args, **kwargs):
+            calls.append(kwargs["task_slugs"])
+            if len(calls) == 1:
+                raise ValueError("first page fails")
+            return get_page(*args, **kwargs)
+
+        client.get_flow_run_task_runs = flaky
+        with set_temporary_config({"cloud.flow_runs.task_run_page_size": 1}):
+            with prefect.context(flow_run_id=flow_run_id):
+                state = CloudFlowRunner(flow=flow).run(return_tasks=flow.tasks)
+
+        assert state.is_successful()
+        assert len(calls) == 3
+        assert calls.count([tasks[0].slug]) == 2
+        assert client.task_runs["tr-0"].state.is_successful()
+
+    def test_every_accessor_waits_for_the_pages(self, monkeypatch):
+        flow_run_id, flow, tasks, client = self.chain(
+            monkeypatch, length=4, states={3: Success(result=3)}
+        )
+        tasks = list(flow.sorted_tasks())
+        pages = _TaskRunPages(
+            client=client,
+            flow_run_id=flow_run_id,
+            tasks=tasks,
+            page_size=1,
+            task_states={},
+            task_contexts={t: {"task_name": t.name} for t in tasks},
+        )
+        task_states = _TaskStates(pages.task_states, pages=pages)
+        task_contexts = _TaskContexts(pages.task_contexts, pages=pages)
+
+        assert len(task_states) == 4
+        assert set(task_states) == set(tasks)
+        assert task_states[tasks[3]].is_successful()
+        assert dict(task_states) == task_states.copy() == pages.task_states
+        assert [c["task_run_id"] for c in task_contexts.values()] == [
+            "tr-{}".format(t.name) for t in tasks
+        ]
+        assert all(c["task_name"] == t.name for t, c in task_contexts.items())
+
+    def test_contexts_can_be_added_without_waiting(self, monkeypatch):
+        flow_run_id, flow, tasks, client = self.chain(monkeypatch, length=2)
+        pages = _TaskRunPages(
+            client=client,
+            flow_run_id=flow_run_id,
+            tasks=tasks,
+            page_size=1,
+            task_states={},
+            task_contexts={},
+        )
+        task_contexts = _TaskContexts(pages.task_contexts, pages=pages)
+        task_contexts.setdefault(tasks[1], {}).update(task_name="1")
+        assert not pages.merged
+        assert task_contexts[tasks[1]] == dict(
+            task_name="1", task_run_id="tr-1", task_run_version=0, task_id=tasks[1].slug
+        )
+
+    def test_pages_are_not_retrieved_after_the_run_ends(self, monkeypatch):
+        flow_run_id, flow, tasks, client = self.chain(monkeypatch, length=5)
+        get_page = client.get_flow_run_task_runs
+        started, release = threading.Event(), threading.Event()
+
+        def slow_page(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return get_page(*args, **kwargs)
+
+        client.get_flow_run_task_runs = slow_page
+        # the flow run has already finished, so the run ends right away
+        client.flow_runs[flow_run_id].state = Success()
+        with set_temporary_config({"cloud.flow_runs.task_run_page_size": 1}):
+            with prefect.context(flow_run_id=flow_run_id):
+                runner = CloudFlowRunner(flow=flow)
+                state = runner.run()
+
+        assert state.is_successful()
+        assert runner._task_run_pages is None
+        assert started.wait(5)
+        release.set()
+        time.sleep(0.2)
+        assert client.call_count["get_flow_run_task_runs"] == 1
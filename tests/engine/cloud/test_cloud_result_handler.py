@@ -54,6 +54,23 @@ class TestCloudHandler:
         handler = CloudResultHandler()
         assert handler.read(uri="http://look-here") == "my secret"
 
+    def test_cloud_handler_roundtrips_compressed_results(self, monkeypatch):
+        stored = {}
+
+        def post(*args, result=None, **kwargs):
+            stored["result"] = result
+            return dict(uri="http://look-here")
+
+        client = MagicMock(post=post, get=lambda *args, **kwargs: stored)
+        monkeypatch.setattr(
+            "prefect.engine.cloud.result_handler.Client", MagicMock(return_value=client)
+        )
+        handler = CloudResultHandler(compression="gzip")
+        uri = handler.write(["x"] * 1000)
+        assert isinstance(stored["result"], str)
+        assert len(stored["result"]) < 1000
+        assert CloudResultHandler().read(uri) == ["x"] * 1000
+
     def test_cloud_handler_handles_empty_buckets(self, monkeypatch):
         binary_data = ""
         client = MagicMock(get=lambda *args, **kwargs: dict(result=binary_data))
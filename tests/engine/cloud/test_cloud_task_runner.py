@@ -1,9 +1,10 @@
 import datetime
 import os
+import threading
 import tempfile
 import time
 import uuid
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import cloudpickle
 import pytest
@@ -36,6 +37,7 @@ from prefect.engine.state import (
 )
 from prefect.serialization.result_handlers import ResultHandlerSchema
 from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.exceptions import ClientError
 
 
 @pytest.fixture(autouse=True)
@@ -109,6 +111,70 @@ def test_task_runner_calls_get_task_run_info_if_map_index_is_not_none(client):
     assert [type(s).__name__ for s in states] == ["Running", "Success"]
 
 
+class TestMappedTaskRuns:
+    def test_mapped_children_are_initialized_with_one_request(self, client):
+        client.get_task_run_infos = MagicMock(
+            side_effect=lambda flow_run_id, task_id, map_indices: [
+                MagicMock(id="child-{}".format(i), version=i, state=Pending())
+                for i in map_indices
+            ]
+        )
+
+        @prefect.task
+        def add_one(x):
+            return x + 1
+
+        upstream = Edge(Task(), add_one, key="x", mapped=True)
+        state = CloudTaskRunner(task=add_one).run(
+            upstream_states={upstream: Success(result=[1, 2, 3])},
+            context={"flow_run_id": "fr", "task_id": "t", "task_run_id": "parent"},
+            executor=prefect.engine.executors.LocalExecutor(),
+        )
+
+        assert state.is_mapped()
+        assert [s.result for s in state.map_states] == [2, 3, 4]
+        assert client.get_task_run_infos.call_count == 1
+        assert list(client.get_task_run_infos.call_args[1]["map_indices"]) == [0, 1, 2]
+        assert not client.get_task_run_info.called
+
+        updates = [
+            (call[1]["task_run_id"], call[1]["version"])
+            for call in client.set_task_run_state.call_args_list
+        ]
+        # each child reports Running and then Success, starting from its own version
+        for i in range(3):
+            child = "child-{}".format(i)
+            assert [v for id, v in updates if id == child] == [i, i + 1]
+        assert [id for id, _ in updates][-1] == "parent"
+
+    def test_mapped_children_initialize_themselves_if_bulk_request_fails(self, client):
+        client.get_task_run_infos = MagicMock(side_effect=SyntaxError)
+        client.get_task_run_info = MagicMock(
+            side_effect=lambda flow_run_id, task_id, map_index: MagicMock(
+                id="child-{}".format(map_index), version=0, state=None
+            )
+        )
+
+        @prefect.task
+        def add_one(x):
+            return x + 1
+
+        upstream = Edge(Task(), add_one, key="x", mapped=True)
+        state = CloudTaskRunner(task=add_one).run(
+            upstream_states={upstream: Success(result=[1, 2])},
+            context={"task_run_id": "parent"},
+            executor=prefect.engine.executors.LocalExecutor(),
+        )
+
+        assert state.is_mapped()
+        assert [s.result for s in state.map_states] == [2, 3]
+        assert client.get_task_run_info.call_count == 2
+        ids = {
+            call[1]["task_run_id"] for call in client.set_task_run_state.call_args_list
+        }
+        assert ids == {"parent", "child-0", "child-1"}
+
+
 def test_task_runner_raises_endrun_if_client_cant_communicate_during_state_updates(
     monkeypatch
 ):
@@ -132,6 +198,33 @@ def test_task_runner_raises_endrun_if_client_cant_communicate_during_state_updat
     assert res.state.is_running()
 
 
+def test_task_runner_fails_cleanly_if_results_cant_be_stored(client):
+    class BadHandler(ResultHandler):
+        def read(self, val):
+            pass
+
+        def write(self, val):
+            raise SyntaxError("Oh boy")
+
+    @prefect.task(max_retries=1, retry_delay=datetime.timedelta(minutes=1))
+    def raise_error(x):
+        raise NameError("I don't exist")
+
+    upstream = Success(result=Result(1, result_handler=BadHandler()))
+    res = CloudTaskRunner(task=raise_error).run(
+        upstream_states={Edge(Task(), raise_error, key="x"): upstream},
+        context={"map_index": 1},
+    )
+
+    states = [call[1]["state"] for call in client.set_task_run_state.call_args_list]
+    # the Retrying state can't be reported without its cached inputs, so the run fails
+    assert not any(s.is_retrying() for s in states)
+    assert states[-1].is_failed()
+    assert "storing task results" in states[-1].message
+    assert res.is_failed()
+    assert isinstance(res.result, SyntaxError)
+
+
 def test_task_runner_queries_for_cached_states_if_task_has_caching(client):
     @prefect.task(cache_for=datetime.timedelta(minutes=1))
     def cached_task():
@@ -182,6 +275,34 @@ def test_task_runner_validates_cached_states_if_task_has_caching(client):
     assert res.result == 42
 
 
+def test_task_runner_hydrates_inputs_for_custom_cache_validators(client):
+    received = []
+
+    def validator(state, inputs, parameters):
+        received.append(dict(inputs))
+        return True
+
+    @prefect.task(cache_for=datetime.timedelta(minutes=1), cache_validator=validator)
+    def cached_task(x):
+        return 42
+
+    state = Cached(
+        cached_result_expiration=datetime.datetime.utcnow()
+        + datetime.timedelta(days=1),
+        result=Result(99, JSONResultHandler()),
+    )
+    client.get_latest_cached_states = MagicMock(return_value=[state])
+    upstream = Success(result=SafeResult("1", result_handler=JSONResultHandler()))
+
+    res = CloudTaskRunner(task=cached_task).run(
+        upstream_states={Edge(Task(), cached_task, key="x"): upstream}
+    )
+    assert res.is_cached()
+    assert res.result == 99
+    assert type(received[0]["x"]) is Result
+    assert received[0]["x"].value == 1
+
+
 def test_task_runner_raises_endrun_if_client_cant_receive_state_updates(monkeypatch):
     task = Task(name="test")
     get_task_run_info = MagicMock(side_effect=SyntaxError)
@@ -318,7 +439,7 @@ class TestHeartBeats:
     @pytest.mark.parametrize(
         "executor", ["local", "sync", "mproc", "mthread"], indirect=True
     )
-    def test_task_runner_has_a_heartbeat(self, executor, monkeypatch):
+    def test_task_runner_has_a_heartbeat(self, executor):
         with tempfile.NamedTemporaryFile() as call_file:
             fname = call_file.name
 
@@ -332,14 +453,14 @@ class TestHeartBeats:
 
             def multiprocessing_helper(executor):
                 client = MagicMock()
-                monkeypatch.setattr(
+                with patch(
                     "prefect.engine.cloud.task_runner.Client",
                     MagicMock(return_value=client),
-                )
-                runner = CloudTaskRunner(task=sleeper)
-                runner._heartbeat = update
-                with set_temporary_config({"cloud.heartbeat_interval": 0.025}):
-                    return runner.run(executor=executor)
+                ):
+                    runner = CloudTaskRunner(task=sleeper)
+                    runner._heartbeat = update
+                    with set_temporary_config({"cloud.heartbeat_interval": 0.025}):
+                        return runner.run(executor=executor)
 
             with executor.start():
                 fut = executor.submit(multiprocessing_helper, executor=executor)
@@ -352,7 +473,7 @@ class TestHeartBeats:
         assert len(results.split()) >= 60
 
     @pytest.mark.parametrize("executor", ["local", "sync", "mthread"], indirect=True)
-    def test_task_runner_has_a_heartbeat_with_timeouts(self, executor, monkeypatch):
+    def test_task_runner_has_a_heartbeat_with_timeouts(self, executor):
         with tempfile.NamedTemporaryFile() as call_file:
             fname = call_file.name
 
@@ -366,14 +487,14 @@ class TestHeartBeats:
 
             def multiprocessing_helper(executor):
                 client = MagicMock()
-                monkeypatch.setattr(
+                with patch(
                     "prefect.engine.cloud.task_runner.Client",
                     MagicMock(return_value=client),
-                )
-                runner = CloudTaskRunner(task=sleeper)
-                runner._heartbeat = update
-                with set_temporary_config({"cloud.heartbeat_interval": 0.025}):
-                    return runner.run(executor=executor)
+                ):
+                    runner = CloudTaskRunner(task=sleeper)
+                    runner._heartbeat = update
+                    with set_temporary_config({"cloud.heartbeat_interval": 0.025}):
+                        return runner.run(executor=executor)
 
             with executor.start():
                 fut = executor.submit(multiprocessing_helper, executor=executor)
@@ -388,9 +509,7 @@ class TestHeartBeats:
     @pytest.mark.parametrize(
         "executor", ["local", "sync", "mproc", "mthread"], indirect=True
     )
-    def test_task_runner_has_a_heartbeat_only_during_execution(
-        self, executor, monkeypatch
-    ):
+    def test_task_runner_has_a_heartbeat_only_during_execution(self, executor):
         with tempfile.NamedTemporaryFile() as call_file:
             fname = call_file.name
 
@@ -400,15 +519,15 @@ class TestHeartBeats:
 
             def multiprocessing_helper(executor):
                 client = MagicMock()
-                monkeypatch.setattr(
+                with patch(
                     "prefect.engine.cloud.task_runner.Client",
                     MagicMock(return_value=client),
-                )
-                runner = CloudTaskRunner(task=Task())
-                runner.cache_result = lambda *args, **kwargs: time.sleep(0.2)
-                runner._heartbeat = update
-                with set_temporary_config({"cloud.heartbeat_interval": 0.05}):
-                    return runner.run(executor=executor)
+                ):
+                    runner = CloudTaskRunner(task=Task())
+                    runner.cache_result = lambda *args, **kwargs: time.sleep(0.2)
+                    runner._heartbeat = update
+                    with set_temporary_config({"cloud.heartbeat_interval": 0.05}):
+                        return runner.run(executor=executor)
 
             with executor.start():
                 fut = executor.submit(multiprocessing_helper, executor=executor)
@@ -543,3 +662,103 @@ def test_state_handler_failures_are_handled_appropriately(client):
     assert states[0].is_running()
     assert states[1].is_failed()
     assert isinstance(states[1].result, SyntaxError)
+
+
+class TestBatchedStateUpdates:
+    @pytest.fixture()
+    def batched(self, client, monkeypatch):
+        sent = []
+
+        def set_task_run_states(updates):
+            sent.extend(updates)
+            return [None] * len(updates)
+
+        client.set_task_run_states = MagicMock(side_effect=set_task_run_states)
+        monkeypatch.setattr(
+            "prefect.engine.cloud.utilities._batcher",
+            prefect.engine.cloud.utilities.StateUpdateBatcher(client=client),
+        )
+        monkeypatch.setattr("prefect.engine.cloud.utilities._batcher_pid", os.getpid())
+        with set_temporary_config({"cloud.state_updates.batch": True}):
+            yield sent
+
+    def test_states_are_sent_through_the_batcher(self, client, batched):
+        @prefect.task
+        def add(x, y):
+            return x + y
+
+        res = CloudTaskRunner(task=add).run(
+            context={"task_run_version": 2},
+            upstream_states={
+                Edge(Task(), add, key="x"): Success(result=1),
+                Edge(Task(), add, key="y"): Success(result=2),
+            },
+        )
+
+        assert res.is_successful()
+        assert not client.set_task_run_state.called
+        assert [type(state).__name__ for _, _, state in batched] == [
+            "Running",
+            "Success",
+        ]
+        assert [version for _, version, _ in batched] == [2, 3]
+
+    def test_task_runs_concurrently_with_running_state_updates(self, client, batched):
+        release = threading.Event()
+        sets = client.set_task_run_states.side_effect
+
+        def slow_set_task_run_states(updates):
+            release.wait(5)
+            return sets(updates)
+
+        client.set_task_run_states.side_effect = slow_set_task_run_states
+
+        @prefect.task
+        def run_while_reporting():
+            # the Running state is still in flight, so the task starts straight away
+            assert not batched
+            release.set()
+            return 1
+
+        res = CloudTaskRunner(task=run_while_reporting).run()
+        assert res.is_successful()
+        assert [type(state).__name__ for _, _, state in batched] == [
+            "Running",
+            "Success",
+        ]
+
+    def test_failed_optimistic_updates_end_the_run_at_the_next_state(
+        self, client, batched
+    ):
+        release = threading.Event()
+        ran = []
+
+        def fail(updates):
+            release.wait(5)
+            return [ClientError("version mismatch")] * len(updates)
+
+        client.set_task_run_states.side_effect = fail
+
+        @prefect.task
+        def add():
+            ran.append(True)
+            release.set()
+            return 1
+
+        res = CloudTaskRunner(task=add).run()
+        assert ran
+        assert isinstance(res, ClientFailed)
+        assert res.state.is_successful()
+
+    def test_final_states_wait_for_their_update(self, client, batched):
+        client.set_task_run_states.side_effect = lambda updates: [
+            None if state.is_running() else ClientError("no") for _, _, state in updates
+        ]
+
+        @prefect.task
+        def fail():
+            raise ValueError()
+
+        res = CloudTaskRunner(task=fail).run()
+        assert isinstance(res, ClientFailed)
+        assert res.state.is_failed()
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+import prefect
+from prefect.engine.cloud import CloudFlowRunner
+from prefect.engine.state import Failed, Success
+from prefect.utilities.configuration import set_temporary_config
+
+benchmarks_dir = str(Path(__file__).parents[3] / "benchmarks")
+
+
+@pytest.fixture
+def cloud_runners(monkeypatch):
+    monkeypatch.syspath_prepend(benchmarks_dir)
+    import cloud_runners
+
+    return cloud_runners
+
+
+@pytest.fixture
+def cloud(cloud_runners):
+    with cloud_runners.FakeCloud(seed=0) as cloud:
+        settings = dict(cloud.config(), **{"cloud.heartbeat_interval": 3600.0})
+        with set_temporary_config(settings):
+            yield cloud
+
+
+def task_run_states(cloud, flow_run_id):
+    return [
+        prefect.engine.state.State.deserialize(tr["state"])
+        for tr in cloud.task_runs.values()
+        if tr["flow_run_id"] == flow_run_id
+    ]
+
+
+def test_cloud_flow_runner_runs_a_chain_against_the_fake_cloud(cloud, cloud_runners):
+    flow = cloud_runners.chain_flow(5)
+    flow_run_id = cloud.create_flow_run(flow)
+    with prefect.context(flow_run_id=flow_run_id):
+        state = CloudFlowRunner(flow=flow).run(return_tasks=flow.tasks)
+
+    assert isinstance(state, Success)
+    assert sorted(s.result for s in state.result.values()) == [0, 1, 2, 3, 4, 5]
+    assert prefect.engine.state.State.deserialize(
+        cloud.flow_runs[flow_run_id]["state"]
+    ).is_successful()
+    states = task_run_states(cloud, flow_run_id)
+    assert len(states) == len(flow.tasks)
+    assert all(isinstance(s, Success) for s in states)
+    assert cloud.calls["setTaskRunState"] >= 10
+
+
+def test_cloud_flow_runner_runs_a_map_against_the_fake_cloud(cloud, cloud_runners):
+    flow = cloud_runners.map_flow(3)
+    elapsed, runs, state = cloud_runners.run_in_cloud(flow, cloud, "local")
+
+    assert state.is_successful()
+    # the flow's tasks and the three children of the mapped task
+    assert runs == len(flow.tasks) + 3
+    assert cloud.calls["getOrCreateTaskRun"] >= 3
+
+
+def test_failed_tasks_are_reported_to_the_fake_cloud(cloud):
+    @prefect.task
+    def fail():
+        raise ValueError("oops")
+
+    flow = prefect.Flow("failing", tasks=[fail])
+    flow_run_id = cloud.create_flow_run(flow)
+    with prefect.context(flow_run_id=flow_run_id):
+        state = CloudFlowRunner(flow=flow).run()
+
+    assert isinstance(state, Failed)
+    assert isinstance(task_run_states(cloud, flow_run_id)[0], Failed)
@@ -1,7 +1,24 @@
-from prefect.engine.cloud.utilities import prepare_state_for_cloud
+import gc
+import os
+import threading
+import time
+import weakref
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import prefect
+from prefect.engine.cloud import utilities
+from prefect.engine.cloud.utilities import (
+    StateUpdateBatcher,
+    get_state_update_batcher,
+    prepare_state_for_cloud,
+)
 from prefect.engine.result import NoResult, Result, SafeResult
 from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
-from prefect.engine.state import Cached, Pending, Success
+from prefect.engine.state import Cached, Pending, Running, Success
+from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.exceptions import ClientError
 
 
 def test_preparing_state_for_cloud_replaces_cached_inputs_with_safe():
@@ -26,3 +43,375 @@ def test_preparing_state_for_cloud_doesnt_copy_data():
     cloud_state = prepare_state_for_cloud(state)
     assert cloud_state.is_cached()
     assert cloud_state.result is state.result
+
+
+def test_preparing_state_for_cloud_writes_results_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    class BarrierHandler(JSONResultHandler):
+        def write(self, val):
+            barrier.wait()
+            return super().write(val)
+
+    handler = BarrierHandler()
+    state = Cached(
+        result=Result(1, result_handler=handler),
+        cached_inputs=dict(
+            x=Result(2, result_handler=handler), y=Result(3, result_handler=handler)
+        ),
+    )
+    cloud_state = prepare_state_for_cloud(state)
+    assert cloud_state._result.safe_value == SafeResult("1", result_handler=handler)
+    assert cloud_state.cached_inputs["x"].safe_value.value == "2"
+    assert cloud_state.cached_inputs["y"].safe_value.value == "3"
+
+
+@pytest.fixture
+def write():
+    """
+    Counts the writes made by every `JSONResultHandler`
+    """
+    with patch.object(
+        JSONResultHandler, "write", autospec=True, side_effect=JSONResultHandler.write
+    ) as write:
+        yield write
+
+
+def writes_by(write, handler):
+    return sum(call[0][0] is handler for call in write.call_args_list)
+
+
+def test_preparing_state_for_cloud_writes_shared_results_once(write):
+    xres = Result(3, result_handler=JSONResultHandler())
+    state = prepare_state_for_cloud(Pending(cached_inputs=dict(x=xres, y=xres)))
+    assert state.cached_inputs["y"].safe_value.value == "3"
+    assert write.call_count == 1
+
+
+def test_preparing_state_for_cloud_writes_shared_payloads_once(write):
+    value = [1, 2]
+    state = prepare_state_for_cloud(
+        Pending(
+            cached_inputs=dict(
+                x=Result(value, result_handler=JSONResultHandler()),
+                y=Result(value, result_handler=JSONResultHandler()),
+            )
+        )
+    )
+    assert state.cached_inputs["x"].safe_value.value == "[1, 2]"
+    assert state.cached_inputs["y"].safe_value.value == "[1, 2]"
+    assert write.call_count == 1
+
+
+def test_preparing_state_for_cloud_raises_write_errors():
+    class BadHandler(ResultHandler):
+        def read(self, val):
+            pass
+
+        def write(self, val):
+            raise SyntaxError("Oh boy")
+
+    state = Pending(
+        cached_inputs=dict(
+            x=Result(1, result_handler=BadHandler()),
+            y=Result(2, result_handler=JSONResultHandler()),
+        )
+    )
+    with pytest.raises(SyntaxError):
+        prepare_state_for_cloud(state)
+
+
+class TestWriteOnceWithinFlowRun:
+    def test_copies_of_a_result_are_written_once(self, write):
+        handler = JSONResultHandler()
+        with prefect.context(flow_run_id="run-1"):
+            one = prepare_state_for_cloud(
+                Pending(cached_inputs=dict(x=Result([1, 2], result_handler=handler)))
+            )
+            two = prepare_state_for_cloud(
+                Pending(cached_inputs=dict(y=Result([1, 2], result_handler=handler)))
+            )
+        assert write.call_count == 1
+        assert one.cached_inputs["x"].safe_value == two.cached_inputs["y"].safe_value
+        assert two.cached_inputs["y"].safe_value.value == "[1, 2]"
+
+    def test_references_to_a_payload_are_not_hashed(self, write, monkeypatch):
+        digest = MagicMock(side_effect=utilities._content_digest)
+        monkeypatch.setattr(utilities, "_content_digest", digest)
+        value, states = [1, 2], []
+        with prefect.context(flow_run_id="run-9"):
+            for name in "xy":
+                states.append(
+                    prepare_state_for_cloud(
+                        Pending(
+                            cached_inputs={
+                                name: Result(value, result_handler=JSONResultHandler())
+                            }
+                        )
+                    )
+                )
+            prepare_state_for_cloud(
+                Pending(
+                    cached_inputs=dict(
+                        z=Result("ab", result_handler=JSONResultHandler())
+                    )
+                )
+            )
+        assert write.call_count == 2
+        assert digest.call_count == 0
+
+    def test_payloads_of_the_same_shape_are_hashed(self, write, monkeypatch):
+        digest = MagicMock(side_effect=utilities._content_digest)
+        monkeypatch.setattr(utilities, "_content_digest", digest)
+        handler, states = JSONResultHandler(), []
+        with prefect.context(flow_run_id="run-10"):
+            for value in [[1, 2], [3, 4]]:
+                states.append(
+                    prepare_state_for_cloud(
+                        Pending(
+                            cached_inputs=dict(x=Result(value, result_handler=handler))
+                        )
+                    )
+                )
+        assert write.call_count == 2
+        assert digest.call_count == 2
+
+    def test_payloads_are_not_kept_alive(self):
+        class Payload:
+            pass
+
+        class ReprHandler(ResultHandler):
+            def read(self, val):
+                pass
+
+            def write(self, val):
+                return repr(val)
+
+        handler = ReprHandler()
+        with prefect.context(flow_run_id="run-11"):
+            state = prepare_state_for_cloud(
+                Pending(
+                    cached_inputs=dict(
+                        x=Result(Payload(), result_handler=handler),
+                        y=Result([1, 2], result_handler=handler),
+                    )
+                )
+            )
+        ref = weakref.ref(state.cached_inputs["x"].value)
+        del state
+        gc.collect()
+        assert ref() is None
+        payloads = [p for ps in utilities._written["run-11"].values() for p in ps]
+        assert len(payloads) == 2
+        assert all(p.get_value() is utilities._GONE for p in payloads)
+
+    def test_written_runs_are_forgotten(self, write):
+        with prefect.context(flow_run_id="run-12"):
+            prepare_state_for_cloud(
+                Pending(
+                    cached_inputs=dict(x=Result(1, result_handler=JSONResultHandler()))
+                )
+            )
+        assert "run-12" in utilities._written
+        utilities.forget_flow_run("run-12")
+        assert "run-12" not in utilities._written
+
+    def test_content_digest_is_hashed_while_pickling(self, monkeypatch):
+        monkeypatch.setattr(
+            "cloudpickle.dumps", MagicMock(side_effect=AssertionError("dumps"))
+        )
+        digest = utilities._content_digest([1, 2])
+        assert digest == utilities._content_digest([1, 2])
+        assert digest != utilities._content_digest([2, 1])
+        assert utilities._content_digest(threading.Lock()) == ""
+
+    def test_equal_handlers_share_writes(self, write):
+        first, second = JSONResultHandler(), JSONResultHandler()
+        with prefect.context(flow_run_id="run-2"):
+            one = prepare_state_for_cloud(
+                Pending(cached_inputs=dict(x=Result("a", result_handler=first)))
+            )
+            state = prepare_state_for_cloud(
+                Pending(cached_inputs=dict(x=Result("a", result_handler=second)))
+            )
+        assert write.call_count == 1
+        assert state.cached_inputs["x"].safe_value.result_handler is second
+
+    def test_different_payloads_are_written_separately(self, write):
+        handler = JSONResultHandler()
+        with prefect.context(flow_run_id="run-3"):
+            prepare_state_for_cloud(
+                Pending(
+                    cached_inputs=dict(
+                        x=Result(1, result_handler=handler),
+                        y=Result(2, result_handler=handler),
+                    )
+                )
+            )
+        assert write.call_count == 2
+
+    def test_different_handlers_are_written_separately(self, write):
+        class OtherHandler(JSONResultHandler):
+            pass
+
+        handler, other = JSONResultHandler(), OtherHandler()
+        with prefect.context(flow_run_id="run-4"):
+            prepare_state_for_cloud(
+                Pending(
+                    cached_inputs=dict(
+                        x=Result(1, result_handler=handler),
+                        y=Result(1, result_handler=other),
+                    )
+                )
+            )
+        assert writes_by(write, handler) == 1
+        assert writes_by(write, other) == 1
+
+    def test_results_are_written_again_in_a_new_flow_run(self, write):
+        handler = JSONResultHandler()
+        for run_id in ["run-5", "run-6"]:
+            with prefect.context(flow_run_id=run_id):
+                prepare_state_for_cloud(
+                    Pending(cached_inputs=dict(x=Result(1, result_handler=handler)))
+                )
+        assert write.call_count == 2
+
+    def test_failed_writes_are_retried(self, write):
+        original = write.side_effect
+
+        def flaky_write(self, val):
+            if write.call_count == 1:
+                raise SyntaxError("Oh boy")
+            return original(self, val)
+
+        write.side_effect = flaky_write
+        handler = JSONResultHandler()
+        with prefect.context(flow_run_id="run-7"):
+            with pytest.raises(SyntaxError):
+                prepare_state_for_cloud(
+                    Pending(cached_inputs=dict(x=Result(1, result_handler=handler)))
+                )
+            state = prepare_state_for_cloud(
+                Pending(cached_inputs=dict(x=Result(1, result_handler=handler)))
+            )
+        assert write.call_count == 2
+        assert state.cached_inputs["x"].safe_value.value == "1"
+
+    def test_concurrent_writes_of_the_same_payload_wait_for_each_other(self, write):
+        started, release = threading.Event(), threading.Event()
+
+        class SlowHandler(JSONResultHandler):
+            def write(self, val):
+                started.set()
+                release.wait(5)
+                return super().write(val)
+
+        handler = SlowHandler()
+        states = [
+            Pending(cached_inputs=dict(x=Result([1], result_handler=handler)))
+            for _ in range(2)
+        ]
+
+        def prepare(state):
+            with prefect.context(flow_run_id="run-8"):
+                prepare_state_for_cloud(state)
+
+        first = threading.Thread(target=prepare, args=(states[0],))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=prepare, args=(states[1],))
+        second.start()
+        release.set()
+        first.join()
+        second.join()
+        assert write.call_count == 1
+        assert states[1].cached_inputs["x"].safe_value.value == "[1]"
+
+
+class TestStateUpdateBatcher:
+    def test_updates_submitted_together_are_sent_in_one_batch(self):
+        client = MagicMock(set_task_run_states=lambda updates: [None] * len(updates))
+        client.set_task_run_states = MagicMock(side_effect=client.set_task_run_states)
+        batcher = StateUpdateBatcher(client=client)
+        with set_temporary_config({"cloud.state_updates.batch_interval": 0.2}):
+            futures = [
+                batcher.submit("run-{}".format(i), 0, Running()) for i in range(5)
+            ]
+            for future in futures:
+                assert future.result(timeout=5) is None
+        assert client.set_task_run_states.call_count == 1
+        updates = client.set_task_run_states.call_args[0][0]
+        assert [u[0] for u in updates] == ["run-{}".format(i) for i in range(5)]
+
+    def test_updates_are_sent_in_order_in_batches_of_at_most_max_size(self):
+        sent = []
+
+        def set_task_run_states(updates):
+            sent.append(updates)
+            return [None] * len(updates)
+
+        batcher = StateUpdateBatcher(
+            client=MagicMock(set_task_run_states=set_task_run_states)
+        )
+        with set_temporary_config(
+            {
+                "cloud.state_updates.batch_interval": 0.2,
+                "cloud.state_updates.max_batch_size": 2,
+            }
+        ):
+            futures = [batcher.submit("run", v, Running()) for v in range(5)]
+            for future in futures:
+                future.result(timeout=5)
+        assert [len(batch) for batch in sent] == [2, 2, 1]
+        assert [u[1] for batch in sent for u in batch] == [0, 1, 2, 3, 4]
+
+    def test_updates_arriving_during_a_request_form_the_next_batch(self):
+        in_flight, release = threading.Event(), threading.Event()
+        sent = []
+
+        def set_task_run_states(updates):
+            sent.append(updates)
+            in_flight.set()
+            release.wait(5)
+            return [None] * len(updates)
+
+        batcher = StateUpdateBatcher(
+            client=MagicMock(set_task_run_states=set_task_run_states)
+        )
+        with set_temporary_config({"cloud.state_updates.batch_interval": 0}):
+            first = batcher.submit("a", 0, Running())
+            in_flight.wait(5)
+            later = [batcher.submit(run, 0, Running()) for run in "bcd"]
+            release.set()
+            for future in [first] + later:
+                future.result(timeout=5)
+        assert [[u[0] for u in batch] for batch in sent] == [["a"], ["b", "c", "d"]]
+
+    def test_failed_updates_raise_their_error(self):
+        error = ClientError("version mismatch")
+        client = MagicMock(set_task_run_states=MagicMock(return_value=[None, error]))
+        batcher = StateUpdateBatcher(client=client)
+        with set_temporary_config({"cloud.state_updates.batch_interval": 0.2}):
+            ok = batcher.submit("a", 0, Running())
+            bad = batcher.submit("b", 0, Running())
+            assert ok.result(timeout=5) is None
+            with pytest.raises(ClientError, match="version mismatch"):
+                bad.result(timeout=5)
+
+    def test_failed_requests_fail_every_update_in_the_batch(self):
+        client = MagicMock(set_task_run_states=MagicMock(side_effect=SyntaxError))
+        batcher = StateUpdateBatcher(client=client)
+        with set_temporary_config({"cloud.state_updates.batch_interval": 0.2}):
+            futures = [batcher.submit(run, 0, Running()) for run in "ab"]
+            for future in futures:
+                with pytest.raises(SyntaxError):
+                    future.result(timeout=5)
+
+    def test_batcher_is_shared_within_a_process(self, monkeypatch):
+        monkeypatch.setattr("prefect.engine.cloud.utilities._batcher", None)
+        batcher = get_state_update_batcher()
+        assert get_state_update_batcher() is batcher
+
+        # a forked process gets a batcher of its own
+        monkeypatch.setattr("os.getpid", MagicMock(return_value=os.getpid() + 1))
+        assert get_state_update_batcher() is not batcher
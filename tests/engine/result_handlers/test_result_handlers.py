@@ -1,6 +1,12 @@
+import base64
+import datetime
+import hashlib
+import io
 import json
 import os
 import tempfile
+import time
+import tracemalloc
 from unittest.mock import MagicMock, patch
 
 import cloudpickle
@@ -9,16 +15,91 @@ import pytest
 
 import prefect
 from prefect.client import Client
+from prefect.engine.result import SafeResult
 from prefect.engine.result_handlers import (
+    ArrowResultHandler,
+    ContentAddressedResultHandler,
     GCSResultHandler,
     JSONResultHandler,
     LocalResultHandler,
     ResultHandler,
     S3ResultHandler,
+    serializers,
+)
+from prefect.engine.result_handlers.content_addressed_result_handler import (
+    last_written,
+    prune,
 )
 from prefect.utilities.configuration import set_temporary_config
 
 
+class LocalS3:
+    """
+    A stand-in for a boto3 S3 client which keeps objects in a local directory and, like
+    boto3's managed transfers, uploads them in fixed-size parts.
+    """
+
+    part_size = 256 * 1024
+
+    def __init__(self, root):
+        self.root = root
+        self.part_sizes = []
+
+    def _path(self, bucket, key):
+        path = os.path.join(self.root, bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def upload_fileobj(self, Fileobj, Bucket, Key):
+        self.part_sizes = []
+        with open(self._path(Bucket, Key), "wb") as f:
+            while True:
+                part = Fileobj.read(self.part_size)
+                if not part:
+                    break
+                self.part_sizes.append(len(part))
+                f.write(part)
+
+    def get_object(self, Bucket, Key):
+        return dict(Body=open(self._path(Bucket, Key), "rb"))
+
+
+class LocalGCSBucket:
+    """
+    A stand-in for a google-cloud-storage bucket which keeps blobs in a local directory
+    and transfers them `chunk_size` bytes at a time.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def blob(self, name, chunk_size=None):
+        return LocalGCSBlob(os.path.join(self.root, name.replace("/", "_")), chunk_size)
+
+
+class LocalGCSBlob:
+    def __init__(self, path, chunk_size):
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def upload_from_file(self, file_obj):
+        with open(self.path, "wb") as f:
+            while True:
+                assert file_obj.tell() == f.tell()
+                chunk = file_obj.read(self.chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+
+    def download_to_file(self, file_obj):
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                file_obj.write(chunk)
+
+
 class TestJSONHandler:
     def test_json_handler_initializes_with_no_args(self):
         handler = JSONResultHandler()
@@ -81,6 +162,81 @@ class TestLocalHandler:
         new = cloudpickle.loads(cloudpickle.dumps(handler))
         assert isinstance(new, LocalResultHandler)
 
+    @pytest.mark.parametrize("compression", [None, "gzip", "zlib"])
+    def test_local_handler_writes_and_reads_with_compression(
+        self, tmp_dir, compression
+    ):
+        handler = LocalResultHandler(dir=tmp_dir, compression=compression)
+        assert handler.read(handler.write(b"x" * 1000)) == b"x" * 1000
+
+    def test_local_handler_compresses_results(self, tmp_dir):
+        handler = LocalResultHandler(dir=tmp_dir, compression="zlib")
+        fpath = handler.write(b"x" * 10000)
+        assert os.path.getsize(fpath) < 1000
+
+    def test_local_handler_reads_with_any_settings(self, tmp_dir):
+        fpath = LocalResultHandler(dir=tmp_dir, serializer="json").write([1, 2])
+        assert LocalResultHandler(compression="lzma").read(fpath) == [1, 2]
+
+    def test_local_handler_reads_results_without_headers(self, tmp_dir):
+        fpath = os.path.join(tmp_dir, "legacy")
+        with open(fpath, "wb") as f:
+            f.write(cloudpickle.dumps("old result"))
+        assert LocalResultHandler().read(fpath) == "old result"
+
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_local_handler_writes_buffers_out_of_band(self, tmp_dir, compression):
+        handler = LocalResultHandler(
+            dir=tmp_dir, serializer="pickle_oob", compression=compression
+        )
+        value = {"data": bytearray(os.urandom(4 * 1024 * 1024)), "meta": [1, 2]}
+        assert handler.read(handler.write(value)) == value
+
+    @pytest.mark.parametrize("order", ["C", "F"])
+    def test_local_handler_memory_maps_arrays(self, tmp_dir, order):
+        numpy = pytest.importorskip("numpy")
+        handler = LocalResultHandler(dir=tmp_dir, memory_map=True)
+        array = numpy.arange(10000, dtype="f8").reshape((100, 100), order=order)
+        fpath = handler.write(array)
+        assert fpath.endswith(".npy")
+
+        new = handler.read(fpath)
+        assert isinstance(new, numpy.memmap)
+        assert new.flags.f_contiguous == array.flags.f_contiguous
+        assert (new == array).all()
+
+    def test_local_handler_memory_maps_are_copy_on_write(self, tmp_dir):
+        numpy = pytest.importorskip("numpy")
+        handler = LocalResultHandler(dir=tmp_dir, memory_map=True)
+        fpath = handler.write(numpy.zeros(1000))
+        handler.read(fpath)[0] = 42
+        assert handler.read(fpath)[0] == 0
+
+    def test_local_handler_reads_mapped_arrays_without_memory_map(self, tmp_dir):
+        numpy = pytest.importorskip("numpy")
+        fpath = LocalResultHandler(dir=tmp_dir, memory_map=True).write(numpy.ones(5))
+        new = LocalResultHandler().read(fpath)
+        assert type(new) is numpy.ndarray
+        assert new.tolist() == [1] * 5
+
+    def test_local_handler_only_memory_maps_plain_arrays(self, tmp_dir):
+        numpy = pytest.importorskip("numpy")
+        handler = LocalResultHandler(dir=tmp_dir, memory_map=True)
+        for value in [{"x": 1}, numpy.array([None, 1]), numpy.zeros(0)]:
+            fpath = handler.write(value)
+            assert not fpath.endswith(".npy")
+            assert type(handler.read(fpath)) is type(value)
+
+    def test_local_handler_cant_compress_memory_maps(self):
+        with pytest.raises(ValueError):
+            LocalResultHandler(memory_map=True, compression="gzip")
+
+    def test_local_handler_raises_on_unknown_serializer(self):
+        with pytest.raises(ValueError):
+            LocalResultHandler(serializer="foo")
+        with pytest.raises(ValueError):
+            LocalResultHandler(compression="foo")
+
 
 def test_result_handlers_must_implement_read_and_write_to_work():
     class MyHandler(ResultHandler):
@@ -110,6 +266,176 @@ def test_result_handlers_must_implement_read_and_write_to_work():
     assert "abstract methods write" in str(exc.value)
 
 
+class TestContentAddressedHandler:
+    @pytest.fixture
+    def handler(self, tmpdir):
+        return ContentAddressedResultHandler(dir=str(tmpdir))
+
+    def blobs(self, root):
+        return sorted(
+            f for _, _, files in os.walk(root) for f in files if not f.startswith(".")
+        )
+
+    def test_handler_defaults_to_a_directory_in_tmp(self):
+        handler = ContentAddressedResultHandler()
+        assert handler.dir is None
+        assert handler._root().startswith(tempfile.gettempdir())
+
+    def test_handler_writes_and_reads(self, handler):
+        fpath = handler.write({"x": [1, 2]})
+        assert os.path.isabs(fpath)
+        assert handler.read(fpath) == {"x": [1, 2]}
+
+    def test_handler_stores_blobs_by_content(self, handler):
+        fpath = handler.write("foo")
+        with open(fpath, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        assert fpath == os.path.join(handler.dir, digest[:2], digest)
+
+    @pytest.mark.parametrize("compression", [None, "gzip", "zlib"])
+    def test_handler_stores_identical_payloads_once(self, tmpdir, compression):
+        handler = ContentAddressedResultHandler(
+            dir=str(tmpdir), compression=compression
+        )
+        first, second = handler.write([1, 2, 3]), handler.write([1, 2, 3])
+        third = handler.write([4, 5, 6])
+        assert first == second != third
+        assert len(self.blobs(handler.dir)) == 2
+
+    def test_rewriting_a_payload_refreshes_it(self, handler):
+        fpath = handler.write(1)
+        os.utime(fpath, (0, 0))
+        assert handler.write(1) == fpath
+        assert last_written(fpath) > time.time() - 60
+
+    def test_failed_writes_leave_nothing_behind(self, handler):
+        class Unpicklable:
+            def __reduce__(self):
+                raise TypeError("I cannot be pickled.")
+
+        with pytest.raises(TypeError):
+            handler.write(Unpicklable())
+        assert os.listdir(handler.dir) == []
+
+    def test_prune_only_removes_old_blobs(self, handler):
+        old, recent = handler.write("old"), handler.write("recent")
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+
+        assert handler.prune(older_than=datetime.timedelta(hours=1)) == [old]
+        assert not os.path.exists(old)
+        assert handler.read(recent) == "recent"
+
+    def test_prune_dry_run(self, handler):
+        fpath = handler.write("kept")
+        pruned = handler.prune(older_than=datetime.timedelta(0), dry_run=True)
+        assert pruned == [fpath]
+        assert os.path.exists(fpath)
+
+        assert prune(handler.dir, older_than=datetime.timedelta(0)) == [fpath]
+        assert self.blobs(handler.dir) == []
+
+    def test_prune_removes_abandoned_temporary_files(self, handler):
+        handler.write("x")
+        tmp = os.path.join(handler.dir, ".prefect-abandoned")
+        open(tmp, "wb").close()
+        os.utime(tmp, (0, 0))
+        assert handler.prune(older_than=datetime.timedelta(hours=1)) == [tmp]
+        assert len(self.blobs(handler.dir)) == 1
+
+    def test_prune_rechecks_blobs_before_deleting(self, handler, monkeypatch):
+        fpath = handler.write("x")
+        os.utime(fpath, (0, 0))
+        reads = []
+
+        def racing_last_written(path):
+            # the first check is stale: a write refreshes the blob right after it
+            reads.append(path)
+            written = last_written(path)
+            if len(reads) == 1:
+                assert handler.write("x") == fpath
+            return written
+
+        monkeypatch.setattr(
+            "prefect.engine.result_handlers.content_addressed_result_handler.last_written",
+            racing_last_written,
+        )
+        assert handler.prune(older_than=datetime.timedelta(hours=1)) == []
+        assert len(reads) == 2
+        assert handler.read(fpath) == "x"
+
+    def test_handler_is_pickleable(self, handler):
+        new = cloudpickle.loads(cloudpickle.dumps(handler))
+        assert isinstance(new, ContentAddressedResultHandler)
+        assert new.dir == handler.dir
+
+
+class TestArrowHandler:
+    @pytest.fixture(params=["parquet", "arrow"])
+    def handler(self, request, tmpdir):
+        return ArrowResultHandler(
+            dir=str(tmpdir), format=request.param, row_group_size=10
+        )
+
+    @pytest.fixture
+    def df(self):
+        pandas = pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow")
+        return pandas.DataFrame(
+            {"a": range(30), "b": [str(i) for i in range(30)], "c": [0.5] * 30},
+            index=pandas.Index(["r{}".format(i) for i in range(30)], name="key"),
+        )
+
+    def test_handler_rejects_unknown_formats(self):
+        with pytest.raises(ValueError):
+            ArrowResultHandler(format="csv")
+
+    def test_handler_pickles_other_results(self, handler):
+        fpath = handler.write({"x": 1})
+        assert not fpath.endswith((".parquet", ".arrow"))
+        assert handler.read(fpath) == {"x": 1}
+
+    def test_handler_cant_project_other_results(self, handler):
+        with pytest.raises(ValueError):
+            handler.read(handler.write({"x": 1}), columns=["x"])
+
+    def test_handler_writes_and_reads_dataframes(self, handler, df):
+        fpath = handler.write(df)
+        assert fpath.endswith("." + handler.format)
+        assert handler.read(fpath).equals(df)
+
+    def test_handler_writes_and_reads_arrow_tables(self, handler):
+        pyarrow = pytest.importorskip("pyarrow")
+        table = pyarrow.Table.from_pydict({"x": [1, 2, 3]})
+        assert handler.read(handler.write(table)).equals(table)
+        batch = pyarrow.RecordBatch.from_pydict({"x": [1, 2, 3]})
+        assert handler.read(handler.write(batch)).equals(table)
+
+    def test_handler_reads_columns(self, handler, df):
+        new = handler.read(handler.write(df), columns=["a", "c"])
+        assert new.equals(df[["a", "c"]])
+
+    def test_handler_reads_row_groups(self, handler, df):
+        new = handler.read(handler.write(df), columns=["b"], row_groups=[0, 2])
+        assert new.equals(df[["b"]].iloc[list(range(10)) + list(range(20, 30))])
+
+    def test_safe_results_read_columns(self, handler, df):
+        safe = SafeResult(handler.write(df), result_handler=handler)
+        assert safe.to_result(columns=["a"]).value.equals(df[["a"]])
+        assert safe.to_result().value.equals(df)
+
+    def test_handler_pickles_frames_arrow_cant_convert(self, handler):
+        pandas = pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow")
+        df = pandas.DataFrame({"x": [object(), object()]})
+        fpath = handler.write(df)
+        assert not fpath.endswith("." + handler.format)
+        assert handler.read(fpath).shape == (2, 1)
+
+    def test_handler_is_pickleable(self, handler):
+        new = cloudpickle.loads(cloudpickle.dumps(handler))
+        assert new == handler
+
+
 @pytest.mark.xfail(raises=ImportError)
 class TestGCSResultHandler:
     @pytest.fixture
@@ -147,15 +473,31 @@ class TestGCSResultHandler:
         )
         assert bucket.blob.call_args[0][0].endswith("prefect_result")
 
-    def test_gcs_writes_binary_string(self, google_client):
-        blob = MagicMock()
-        google_client.return_value.bucket = MagicMock(
-            return_value=MagicMock(blob=MagicMock(return_value=blob))
-        )
+    @pytest.fixture
+    def local_gcs(self, google_client, tmpdir):
+        bucket = LocalGCSBucket(str(tmpdir))
+        google_client.return_value.bucket = MagicMock(return_value=bucket)
+        return bucket
+
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_gcs_writes_and_reads_raw_binary(self, local_gcs, compression):
+        handler = GCSResultHandler(bucket="foo", compression=compression)
+        uri = handler.write({"x": [1, 2, 3]})
+        with open(local_gcs.blob(uri).path, "rb") as f:
+            assert serializers.has_header(f.read())
+        assert handler.read(uri) == {"x": [1, 2, 3]}
+
+    def test_gcs_streams_results_in_chunks(self, local_gcs):
         handler = GCSResultHandler(bucket="foo")
-        handler.write(None)
-        assert blob.upload_from_string.called
-        assert isinstance(blob.upload_from_string.call_args[0][0], str)
+        handler.chunk_size = 256 * 1024
+        value = os.urandom(4 * 1024 * 1024)
+        uri = handler.write(value)
+        assert handler.read(uri) == value
+
+    def test_gcs_reads_legacy_results(self, local_gcs):
+        with open(local_gcs.blob("legacy").path, "wb") as f:
+            f.write(base64.b64encode(cloudpickle.dumps(42)))
+        assert GCSResultHandler(bucket="foo").read("legacy") == 42
 
     def test_gcs_handler_is_pickleable(self, google_client, monkeypatch):
         class gcs_bucket:
@@ -207,6 +549,73 @@ class TestS3ResultHandler:
         assert used_uri.startswith(pendulum.now("utc").format("Y/M/D"))
         assert used_uri.endswith("prefect_result")
 
+    @pytest.fixture
+    def local_s3(self, s3_client, tmpdir):
+        client = LocalS3(str(tmpdir))
+        s3_client.return_value = client
+        return client
+
+    def make_handler(self, **kwargs):
+        with prefect.context(
+            secrets=dict(AWS_CREDENTIALS=dict(ACCESS_KEY=1, SECRET_ACCESS_KEY=42))
+        ):
+            with set_temporary_config({"cloud.use_local_secrets": True}):
+                return S3ResultHandler(bucket="foo", **kwargs)
+
+    def test_s3_writes_raw_binary(self, local_s3):
+        handler = self.make_handler(compression="zlib")
+        uri = handler.write(b"x" * 10000)
+        with open(local_s3._path("foo", uri), "rb") as f:
+            data = f.read()
+        assert serializers.has_header(data)
+        assert len(data) < 1000
+        assert handler.read(uri) == b"x" * 10000
+
+    @pytest.mark.parametrize("compression", [None, "gzip", "zlib"])
+    def test_s3_streams_results_in_full_parts(self, local_s3, compression):
+        handler = self.make_handler(compression=compression)
+        value = [os.urandom(1024 * 1024) for _ in range(4)]
+        uri = handler.write(value)
+        # every part except the last must be full-sized for a multipart upload
+        assert len(local_s3.part_sizes) > 4
+        assert set(local_s3.part_sizes[:-1]) == {LocalS3.part_size}
+        assert handler.read(uri) == value
+
+    def test_s3_streaming_bounds_memory_use(self, local_s3):
+        handler = self.make_handler()
+        value = os.urandom(32 * 1024 * 1024)
+
+        tracemalloc.start()
+        try:
+            uri = handler.write(value)
+            _, write_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            tracemalloc.start()
+            result = handler.read(uri)
+            _, read_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result == value
+        # nothing proportional to the result is buffered while writing; reading never
+        # holds the whole payload, only the unpickler's frame and the result it builds
+        assert write_peak < 8 * 1024 * 1024
+        assert read_peak < 2 * len(value) + 8 * 1024 * 1024
+
+    def test_s3_write_errors_are_raised(self, local_s3):
+        class Unpicklable:
+            def __reduce__(self):
+                raise TypeError("I cannot be pickled.")
+
+        handler = self.make_handler()
+        with pytest.raises(TypeError):
+            handler.write([os.urandom(1024 * 1024), Unpicklable()])
+
+    def test_s3_reads_legacy_results(self, local_s3):
+        with open(local_s3._path("foo", "legacy"), "wb") as f:
+            f.write(base64.b64encode(cloudpickle.dumps(42)))
+        assert self.make_handler().read("legacy") == 42
+
     def test_s3_handler_is_pickleable(self, monkeypatch):
         class client:
             def __init__(self, *args, **kwargs):
@@ -0,0 +1,227 @@
+import io
+import os
+import tracemalloc
+
+import cloudpickle
+import pytest
+
+from prefect.engine.result_handlers import serializers
+
+
+class TestDumpsAndLoads:
+    @pytest.mark.parametrize("codec", [None] + sorted(serializers.CODECS))
+    @pytest.mark.parametrize("value", [42, "stringy", None, {"a": [1, 2.5]}])
+    def test_roundtrip(self, value, codec):
+        blob = serializers.dumps(value, compression=codec)
+        assert serializers.has_header(blob)
+        assert serializers.loads(blob) == value
+
+    def test_json_roundtrip(self):
+        blob = serializers.dumps({"a": [1, 2]}, serializer="json")
+        assert blob.endswith(b'{"a": [1, 2]}')
+        assert serializers.loads(blob) == {"a": [1, 2]}
+
+    def test_pickle_roundtrip_of_functions(self):
+        fn = serializers.loads(serializers.dumps(lambda x: x + 1))
+        assert fn(1) == 2
+
+    def test_compression_shrinks_repetitive_data(self):
+        value = b"x" * 10000
+        assert len(serializers.dumps(value, compression="zlib")) < 1000
+        assert len(serializers.dumps(value)) > 10000
+
+    def test_header_records_serializer_and_codec(self):
+        blob = serializers.dumps(1, serializer="json", compression="gzip")
+        assert blob.startswith(serializers.MAGIC + b"\x01\x04json\x04gzip")
+
+    def test_loads_reads_payloads_without_headers_with_cloudpickle(self):
+        blob = cloudpickle.dumps("legacy")
+        assert not serializers.has_header(blob)
+        assert serializers.loads(blob) == "legacy"
+
+    def test_loads_raises_on_unknown_header_version(self):
+        blob = serializers.MAGIC + b"\x09" + serializers.dumps(1)[5:]
+        with pytest.raises(ValueError) as exc:
+            serializers.loads(blob)
+        assert "header version" in str(exc.value)
+
+    def test_loads_raises_on_unknown_codec(self):
+        blob = serializers.MAGIC + b"\x01\x06pickle\x03foo" + cloudpickle.dumps(1)
+        with pytest.raises(ValueError) as exc:
+            serializers.loads(blob)
+        assert "foo" in str(exc.value)
+
+    def test_dumps_raises_on_unknown_serializer(self):
+        with pytest.raises(ValueError) as exc:
+            serializers.dumps(1, serializer="yaml")
+        assert "available serializers" in str(exc.value)
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise TypeError("I cannot be pickled.")
+
+
+class TestStreaming:
+    @pytest.mark.parametrize("codec", [None] + sorted(serializers.CODECS))
+    def test_dump_matches_dumps(self, codec):
+        value = {"a": list(range(1000))}
+        f = io.BytesIO()
+        serializers.dump(value, f, compression=codec)
+        assert serializers.loads(f.getvalue()) == value
+        blob = serializers.dumps(value, compression=codec)
+        assert serializers.load(io.BytesIO(blob)) == value
+
+    @pytest.mark.parametrize("codec", [None] + sorted(serializers.CODECS))
+    @pytest.mark.parametrize("serializer", ["pickle", "json"])
+    def test_stream_roundtrip(self, codec, serializer):
+        value = ["x" * 1000, os.urandom(8).hex()] * 1000
+        with serializers.stream_dump(value, serializer, codec) as stream:
+            assert serializers.stream_load(lambda f: f.write(stream.read())) == value
+
+    def test_stream_reads_are_filled_and_positioned(self):
+        value = os.urandom(3 * serializers.CHUNK_SIZE)
+        with serializers.stream_dump(value) as stream:
+            assert len(stream.read(100000)) == 100000
+            assert stream.tell() == 100000
+            rest = stream.read()
+        assert serializers.loads(serializers.dumps(value)[:100000] + rest) == value
+
+    def test_load_reads_payloads_without_headers_with_legacy(self):
+        f = io.BytesIO(b"legacy")
+        assert serializers.load(f, legacy=lambda b: b.decode()) == "legacy"
+
+    def test_stream_dump_raises_serialization_errors(self):
+        with pytest.raises(TypeError):
+            with serializers.stream_dump([os.urandom(1024), Unpicklable()]) as stream:
+                stream.read()
+
+    def test_stream_load_raises_fill_errors(self):
+        def fill(f):
+            f.write(serializers.dumps(os.urandom(1024 * 1024))[:1000])
+            raise OSError("connection reset")
+
+        with pytest.raises(OSError) as exc:
+            serializers.stream_load(fill)
+        assert "connection reset" in str(exc.value)
+
+    def test_codecs_without_streams_are_buffered(self, monkeypatch):
+        monkeypatch.setattr(serializers, "CODECS", dict(serializers.CODECS))
+        monkeypatch.setattr(
+            serializers, "STREAM_CODECS", dict(serializers.STREAM_CODECS)
+        )
+        serializers.register_codec("reverse", lambda b: b[::-1], lambda b: b[::-1])
+        with serializers.stream_dump("abc", "json", "reverse") as stream:
+            blob = stream.read()
+        assert blob.endswith(b'"cba"')
+        assert serializers.load(io.BytesIO(blob)) == "abc"
+
+
+class TestOutOfBandPickle:
+    def buffer_count(self, blob):
+        header = serializers._header("pickle_oob")
+        assert blob.startswith(header)
+        return int.from_bytes(blob[len(header) : len(header) + 4], "little")
+
+    @pytest.mark.parametrize("codec", [None] + sorted(serializers.CODECS))
+    def test_roundtrip(self, codec):
+        value = {"big": bytearray(os.urandom(1024 * 1024)), "fn": lambda x: x + 1}
+        blob = serializers.dumps(value, "pickle_oob", codec)
+        new = serializers.loads(blob)
+        assert new["big"] == value["big"]
+        assert new["fn"](1) == 2
+
+    @pytest.mark.parametrize("codec", [None, "zlib", "gzip"])
+    def test_stream_roundtrip(self, codec):
+        value = [bytearray(os.urandom(1024 * 1024)) for _ in range(3)]
+        with serializers.stream_dump(value, "pickle_oob", codec) as stream:
+            assert serializers.stream_load(lambda f: f.write(stream.read())) == value
+
+    def test_only_large_buffers_are_written_out_of_band(self):
+        small, big = bytearray(100), bytearray(1024 * 1024)
+        assert self.buffer_count(serializers.dumps([small], "pickle_oob")) == 0
+        assert self.buffer_count(serializers.dumps([small, big], "pickle_oob")) == 1
+
+    def test_shared_buffers_are_written_once(self):
+        big = bytearray(os.urandom(1024 * 1024))
+        blob = serializers.dumps([big, big], "pickle_oob")
+        assert len(blob) < 2 * len(big)
+        new = serializers.loads(blob)
+        assert new[0] is new[1]
+
+    def test_buffers_are_not_copied(self, tmpdir):
+        value = bytearray(os.urandom(16 * 1024 * 1024))
+        with open(str(tmpdir.join("result")), "w+b") as f:
+            tracemalloc.start()
+            try:
+                serializers.dump(value, f, "pickle_oob")
+                _, write_peak = tracemalloc.get_traced_memory()
+                f.seek(0)
+            finally:
+                tracemalloc.stop()
+            tracemalloc.start()
+            try:
+                new = serializers.load(f)
+                _, read_peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        assert new == value
+        # a plain pickle would copy the value once when writing and twice when reading;
+        # the only allocation proportional to the value should be the value itself
+        assert write_peak < len(value) / 4
+        assert read_peak < 1.5 * len(value)
+
+    def test_truncated_payloads_raise(self):
+        blob = serializers.dumps(bytearray(1024 * 1024), "pickle_oob")
+        with pytest.raises(EOFError):
+            serializers.loads(blob[:-1000])
+
+    @pytest.mark.parametrize("order", ["C", "F"])
+    def test_numpy_arrays_are_written_out_of_band(self, order):
+        numpy = pytest.importorskip("numpy")
+        array = numpy.arange(1024 * 1024, dtype="f8").reshape((1024, 1024), order=order)
+        blob = serializers.dumps({"array": array}, "pickle_oob")
+        assert self.buffer_count(blob) == 1
+
+        new = serializers.loads(blob)["array"]
+        assert new.shape == array.shape and new.dtype == array.dtype
+        assert new.flags.c_contiguous == array.flags.c_contiguous
+        assert new.flags.writeable
+        assert (new == array).all()
+
+    def test_numpy_arrays_which_cant_be_viewed_are_pickled(self):
+        numpy = pytest.importorskip("numpy")
+        strided = numpy.arange(1024 * 1024, dtype="f8")[::2]
+        objects = numpy.array([object()] * 10000)
+        blob = serializers.dumps([strided, objects], "pickle_oob")
+        assert self.buffer_count(blob) == 0
+        new = serializers.loads(blob)
+        assert (new[0] == strided).all()
+        assert new[1].shape == objects.shape
+
+
+class TestRegistration:
+    def test_register_serializer(self, monkeypatch):
+        monkeypatch.setattr(serializers, "SERIALIZERS", dict(serializers.SERIALIZERS))
+
+        class StrSerializer(serializers.Serializer):
+            def dumps(self, value):
+                return str(value).encode()
+
+            def loads(self, blob):
+                return blob.decode()
+
+        serializers.register_serializer("str", StrSerializer())
+        assert serializers.loads(serializers.dumps(42, serializer="str")) == "42"
+
+    def test_register_codec(self, monkeypatch):
+        monkeypatch.setattr(serializers, "CODECS", dict(serializers.CODECS))
+        serializers.register_codec("reverse", lambda b: b[::-1], lambda b: b[::-1])
+        blob = serializers.dumps("abc", serializer="json", compression="reverse")
+        assert blob.endswith(b'"cba"')
+        assert serializers.loads(blob) == "abc"
+
+    def test_names_must_fit_in_the_header(self):
+        with pytest.raises(ValueError):
+            serializers.register_codec("x" * 256, bytes, bytes)
@@ -11,6 +11,8 @@ from prefect.engine.cache_validators import (
     partial_inputs_only,
     partial_parameters_only,
 )
+from prefect.engine.result import Result, SafeResult
+from prefect.engine.result_handlers import JSONResultHandler
 from prefect.engine.state import Cached
 
 all_validators = [all_inputs, all_parameters, never_use, duration_only]
@@ -56,6 +58,13 @@ class TestAllInputs:
         state = Cached(cached_inputs=dict(x=1, s="str"))
         assert all_inputs(state, dict(x=1, s="str", noise="e"), None) is False
 
+    def test_unread_inputs_are_read_before_validation(self):
+        safe = SafeResult("1", result_handler=JSONResultHandler())
+        state = Cached(cached_inputs=dict(x=safe.to_result()))
+        inputs = dict(x=safe)
+        assert all_inputs(state, inputs, None) is True
+        assert inputs["x"].value == 1
+
 
 class TestAllParameters:
     def test_parameters_invalidate(self):
@@ -106,6 +115,14 @@ class TestPartialInputsOnly:
         state = Cached(cached_inputs=dict(x=5))
         assert partial_inputs_only(validate_on=["x"])(state, None, None) is False
 
+    def test_only_validated_inputs_are_read(self):
+        safe = SafeResult("1", result_handler=JSONResultHandler())
+        state = Cached(cached_inputs=dict(x=safe.to_result()))
+        inputs = dict(x=safe, y=SafeResult("2", result_handler=JSONResultHandler()))
+        assert partial_inputs_only(validate_on=["x"])(state, inputs, None) is True
+        assert isinstance(inputs["x"], Result)
+        assert isinstance(inputs["y"], SafeResult)
+
     def test_curried(self):
         state = Cached(cached_inputs=dict(x=1, s="str"))
         validator = partial_inputs_only(validate_on=["x"])
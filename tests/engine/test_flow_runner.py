@@ -1,5 +1,6 @@
 import collections
 import datetime
+import os
 import queue
 import random
 import sys
@@ -15,8 +16,15 @@ from prefect.core import Flow, Parameter, Task
 from prefect.engine import signals
 from prefect.engine.cache_validators import duration_only
 from prefect.engine.executors import Executor, LocalExecutor
-from prefect.engine.flow_runner import ENDRUN, FlowRunner, FlowRunnerInitializeResult
-from prefect.engine.result import NoResult, Result
+from prefect.engine.flow_runner import (
+    ENDRUN,
+    FlowRunner,
+    FlowRunnerInitializeResult,
+    ResultSpiller,
+    release_result,
+)
+from prefect.engine.result import NoResult, Result, SafeResult
+from prefect.engine.result_handlers import JSONResultHandler, LocalResultHandler
 from prefect.engine.state import (
     Cached,
     Failed,
@@ -35,6 +43,7 @@ from prefect.engine.state import (
     TriggerFailed,
 )
 from prefect.triggers import any_failed, manual_only
+from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.debug import raise_on_exception
 
 
@@ -888,6 +897,293 @@ def test_flow_runner_handles_mapped_timeouts(executor):
         assert isinstance(fstate.result, TimeoutError)
 
 
+class TestReleaseIntermediateResults:
+    @pytest.fixture(autouse=True)
+    def release_results(self):
+        with set_temporary_config(
+            {"engine.flow_runner.release_intermediate_results": True}
+        ):
+            yield
+
+    @pytest.mark.parametrize(
+        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    )
+    def test_results_are_released_once_consumed(self, executor):
+        with Flow(name="test") as flow:
+            x = AddTask()(1, 2)
+            y = AddTask()(x, 3)
+            z = AddTask()(y, x)
+
+        state = FlowRunner(flow=flow).run(return_tasks=flow.tasks, executor=executor)
+        assert state.is_successful()
+        assert state.result[x].is_successful()
+        assert state.result[x].result == NoResult
+        assert state.result[y].result == NoResult
+        assert state.result[z].result == 9
+
+    def test_results_are_kept_by_default(self):
+        with Flow(name="test") as flow:
+            x = AddTask()(1, 2)
+            y = AddTask()(x, 3)
+
+        with set_temporary_config(
+            {"engine.flow_runner.release_intermediate_results": False}
+        ):
+            state = FlowRunner(flow=flow).run(return_tasks=flow.tasks)
+        assert state.result[x].result == 3
+        assert state.result[y].result == 6
+
+    def test_stored_results_are_replaced_by_their_safe_result(self):
+        with Flow(name="test") as flow:
+            x = AddTask()(1, 2)
+            y = AddTask()(x, 3)
+
+        result = Result(3, result_handler=JSONResultHandler())
+        result.store_safe_value()
+        state = FlowRunner(flow=flow).run(
+            return_tasks=flow.tasks, task_states={x: Success(result=result)}
+        )
+        assert state.result[x]._result == SafeResult("3", JSONResultHandler())
+        assert state.result[y].result == 6
+
+    def test_mapped_results_are_released(self):
+        with Flow(name="test") as flow:
+            x = AddTask().map([1, 2], [3, 4])
+            y = AddTask().map(x, [1, 1])
+            z = AddTask()(y, [10])
+
+        state = FlowRunner(flow=flow).run(return_tasks=flow.tasks)
+        assert state.result[z].result == [5, 7, 10]
+        assert state.result[x].result == [NoResult, NoResult]
+        assert all(s.result == NoResult for s in state.result[x].map_states)
+
+    def test_results_are_kept_for_consumers_which_havent_run(self):
+        @prefect.task(max_retries=1, retry_delay=datetime.timedelta(0))
+        def flaky():
+            if prefect.context.get("task_run_count") == 1:
+                raise ValueError("try again")
+            return 10
+
+        with Flow(name="test") as flow:
+            x = AddTask()(1, 2)
+            y = AddTask()(x, flaky)
+
+        state = flow.run()
+        assert state.is_successful()
+        assert state.result[y].result == 13
+        assert state.result[x].result == NoResult
+
+    def test_failed_and_cached_states_are_not_released(self):
+        failed = Failed(result=ValueError())
+        cached = Cached(result=Result(1))
+        for state in [failed, cached]:
+            released = release_result(
+                state, consumer_states=[Success()], consumer_keys=[{"x"}]
+            )
+            assert released is state
+
+    def test_states_are_not_released_while_consumers_need_them(self):
+        state = Success(result=Result(1))
+        for consumer in [
+            Pending(),
+            Pending(cached_inputs={}),
+            Retrying(cached_inputs={"y": Result(2)}),
+            Mapped(map_states=[Success(), Pending()]),
+        ]:
+            released = release_result(
+                state, consumer_states=[consumer], consumer_keys=[{"x"}]
+            )
+            assert released is state
+
+    def test_states_are_released_once_consumers_have_their_inputs(self):
+        state = Success(result=Result(1))
+        released = release_result(
+            state,
+            consumer_states=[
+                Retrying(cached_inputs={"x": Result(1)}),
+                Success(),
+                Pending(),
+            ],
+            consumer_keys=[{"x"}, {"x", "y"}, {None}],
+        )
+        assert released is not state
+        assert released.result == NoResult
+        assert state.result == 1
+
+
+class BytesTask(Task):
+    def run(self, n):
+        return b"x" * n
+
+
+class TestMemoryBudget:
+    @pytest.mark.parametrize("executor", ["local", "sync"], indirect=True)
+    def test_results_are_spilled_over_budget(self, executor, monkeypatch):
+        spill = ResultSpiller._spill
+        spilled, dirs = [], []
+
+        def recording_spill(self, task, state):
+            spill(self, task, state)
+            spilled.append(task)
+            dirs.append(self._dir)
+
+        monkeypatch.setattr(ResultSpiller, "_spill", recording_spill)
+        with Flow(name="test") as flow:
+            a = BytesTask()(1000)
+            b = BytesTask()(1000)
+            c = BytesTask()(1000)
+            d = AddTask()(a, AddTask()(b, c))
+
+        with set_temporary_config({"engine.flow_runner.memory_budget": 1500}):
+            state = FlowRunner(flow=flow).run(return_tasks=[a, d], executor=executor)
+        assert state.is_successful()
+        # terminal results are never spilled
+        assert spilled and d not in spilled
+        # the returned results are read back once the run is over
+        assert state.result[a].result == b"x" * 1000
+        assert state.result[d].result == b"x" * 3000
+        assert type(state.result[a]._result) is Result
+        # the spilled results are deleted once the run is over
+        assert dirs[0] is not None and not os.path.exists(dirs[0])
+
+    @pytest.mark.parametrize("executor", ["local", "sync"], indirect=True)
+    def test_returned_results_are_read_back(self, executor):
+        with Flow(name="test") as flow:
+            a = BytesTask()(1000)
+            b = BytesTask()(1000)
+            c = AddTask()(a, b)
+
+        with set_temporary_config({"engine.flow_runner.memory_budget": 10}):
+            state = FlowRunner(flow=flow).run(
+                return_tasks=flow.tasks, executor=executor
+            )
+        assert state.is_successful()
+        for task in flow.tasks:
+            assert not isinstance(state.result[task]._result, SafeResult)
+        assert state.result[a].result == b"x" * 1000
+        assert state.result[c].result == b"x" * 2000
+
+    def test_results_are_spilled_when_running_a_flow(self, monkeypatch):
+        spill = ResultSpiller._spill
+        spilled = []
+
+        def recording_spill(self, task, state):
+            spill(self, task, state)
+            spilled.append(task)
+
+        monkeypatch.setattr(ResultSpiller, "_spill", recording_spill)
+        with Flow(name="test") as flow:
+            a = BytesTask()(1000)
+            b = BytesTask()(1000)
+            c = AddTask()(a, b)
+
+        with set_temporary_config({"engine.flow_runner.memory_budget": 1500}):
+            state = flow.run()
+        assert state.is_successful()
+        assert {a, b} & set(spilled) and c not in spilled
+        assert state.result[a].result == b"x" * 1000
+        assert state.result[c].result == b"x" * 2000
+
+    def test_results_are_not_spilled_by_default(self):
+        with Flow(name="test") as flow:
+            a = BytesTask()(1000)
+            b = AddTask()(a, a)
+
+        state = FlowRunner(flow=flow).run(return_tasks=flow.tasks)
+        assert state.result[a].result == b"x" * 1000
+
+    def test_budget_is_not_enforced_for_dask(self, mthread):
+        with Flow(name="test") as flow:
+            a = BytesTask()(1000)
+            b = AddTask()(a, a)
+
+        with set_temporary_config({"engine.flow_runner.memory_budget": 10}):
+            state = FlowRunner(flow=flow).run(return_tasks=flow.tasks, executor=mthread)
+        assert state.result[a].result == b"x" * 1000
+        assert state.result[b].result == b"x" * 2000
+
+
+class TestResultSpiller:
+    def test_least_recently_needed_results_are_spilled_first(self):
+        spiller = ResultSpiller(budget=2500)
+        t1, t2, t3 = Task(), Task(), Task()
+        s1 = spiller.track(t1, Success(result=Result(b"x" * 1000)), upstream_tasks=[])
+        s2 = spiller.track(t2, Success(result=Result(b"y" * 1000)), upstream_tasks=[])
+        # t3 needed t1's result, so t2 is now the least recently needed
+        s3 = spiller.track(t3, Success(result=Result(b"z" * 1000)), upstream_tasks=[t1])
+        assert isinstance(s2._result, SafeResult)
+        assert s1.result == b"x" * 1000
+        assert s3.result == b"z" * 1000
+        assert spiller.resident_bytes <= 2500
+
+    def test_stored_results_are_not_written_again(self):
+        class CountingHandler(JSONResultHandler):
+            writes = 0
+
+            def write(self, val):
+                type(self).writes += 1
+                return super().write(val)
+
+        result = Result("x" * 100, result_handler=JSONResultHandler())
+        result.store_safe_value()
+        spiller = ResultSpiller(budget=1, result_handler=CountingHandler())
+        state = spiller.track(Task(), Success(result=result), upstream_tasks=[])
+        assert state._result == result.safe_value
+        assert CountingHandler.writes == 0
+
+    def test_only_successful_unmapped_results_are_spilled(self):
+        spiller = ResultSpiller(budget=1)
+        for state in [
+            Failed(result=Result(b"x" * 1000)),
+            Mapped(result=Result([b"x" * 1000])),
+            Cached(result=Result(b"x" * 1000)),
+        ]:
+            assert spiller.track(Task(), state, upstream_tasks=[]) is state
+            assert isinstance(state._result, Result)
+        assert spiller.resident_bytes == 0
+
+    def test_spilled_results_can_be_restored(self):
+        task = Task()
+        spiller = ResultSpiller(budget=1)
+        state = spiller.track(task, Success(result=Result(b"x" * 1000)), [])
+        assert isinstance(state._result, SafeResult)
+        assert spiller.restore(task, state) is state
+        assert type(state._result) is Result
+        assert state.result == b"x" * 1000
+        spiller.cleanup()
+
+    def test_unspilled_results_are_not_restored(self):
+        task = Task()
+        spiller = ResultSpiller(budget=1, keep=[task])
+        result = Result(b"x" * 1000)
+        state = spiller.track(task, Success(result=result), [])
+        assert spiller.restore(task, state)._result is result
+
+    def test_kept_tasks_are_not_spilled(self):
+        kept = Task()
+        spiller = ResultSpiller(budget=1, keep=[kept])
+        state = spiller.track(kept, Success(result=Result(b"x" * 1000)), [])
+        assert state.result == b"x" * 1000
+        assert spiller.resident_bytes == 0
+
+    def test_cleanup_removes_spilled_results(self):
+        spiller = ResultSpiller(budget=1)
+        state = spiller.track(Task(), Success(result=Result(b"x" * 1000)), [])
+        assert isinstance(state._result, SafeResult)
+        assert os.path.exists(state._result.value)
+        spiller.cleanup()
+        assert not os.path.exists(state._result.value)
+
+    def test_unreferenced_states_are_forgotten(self):
+        spiller = ResultSpiller(budget=1500)
+        spiller.track(Task(), Success(result=Result(b"x" * 1000)), upstream_tasks=[])
+        state = spiller.track(
+            Task(), Success(result=Result(b"y" * 1000)), upstream_tasks=[]
+        )
+        assert state.result == b"y" * 1000
+        assert spiller.resident_bytes < 1500
+
+
 handler_results = collections.defaultdict(lambda: 0)
 
 
@@ -200,6 +200,20 @@ class TestToResult:
         assert res.safe_value is s
         assert res.result_handler is s.result_handler
 
+    def test_to_result_passes_read_kwargs_to_the_handler(self):
+        class SlicingHandler(ResultHandler):
+            def read(self, loc, start=0):
+                return loc[start:]
+
+            def write(self, value):
+                return value
+
+        s = SafeResult("abc", result_handler=SlicingHandler())
+        res = s.to_result(start=1)
+        assert res.value == "bc"
+        # a partially read result can't be stored as its full safe value
+        assert res.safe_value is NoResult
+
 
 @pytest.mark.parametrize(
     "obj",
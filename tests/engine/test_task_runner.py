@@ -1,4 +1,5 @@
 import collections
+import threading
 from datetime import datetime, timedelta
 from time import sleep
 from unittest.mock import MagicMock
@@ -662,21 +663,28 @@ class TestGetTaskInputs:
         )
         assert inputs == {"x": Result(1)}
 
-    def test_get_inputs_from_upstream_reads_results(self):
+    def test_get_inputs_from_upstream_does_not_read_results(self):
         result = SafeResult("1", result_handler=JSONResultHandler())
         state = Success(result=result)
         inputs = TaskRunner(task=Task()).get_task_inputs(
             state=Pending(), upstream_states={Edge(1, 2, key="x"): state}
         )
-        assert inputs == {"x": result.to_result()}
+        assert inputs == {"x": result}
 
-    def test_get_inputs_from_upstream_reads_cached_inputs(self):
+    def test_get_inputs_from_upstream_does_not_read_cached_inputs(self):
         result = SafeResult("1", result_handler=JSONResultHandler())
         state = Pending(cached_inputs=dict(x=result))
         inputs = TaskRunner(task=Task()).get_task_inputs(
             state=state, upstream_states={}
         )
-        assert inputs == {"x": result.to_result()}
+        assert inputs == {"x": result}
+
+    def test_load_inputs_reads_results(self):
+        result = SafeResult("1", result_handler=JSONResultHandler())
+        inputs = {"x": result, "y": Result(2), "z": NoResult}
+        loaded = TaskRunner(task=Task()).load_task_inputs(inputs)
+        assert loaded is inputs
+        assert inputs == {"x": result.to_result(), "y": Result(2), "z": NoResult}
 
     def test_get_inputs_from_upstream_with_non_key_edges(self):
         inputs = TaskRunner(task=Task()).get_task_inputs(
@@ -736,6 +744,125 @@ class TestGetTaskInputs:
         assert inputs == {"x": Result(None), "y": Result(5)}
 
 
+class ReadCountingHandler(JSONResultHandler):
+    def __init__(self):
+        self.reads = 0
+        super().__init__()
+
+    def read(self, jblob):
+        self.reads += 1
+        return super().read(jblob)
+
+
+class TestInputsAreReadLazily:
+    def test_inputs_are_read_when_task_runs(self):
+        handler = ReadCountingHandler()
+
+        @prefect.task
+        def add_one(x):
+            return x + 1
+
+        upstream = Success(result=SafeResult("1", result_handler=handler))
+        state = TaskRunner(task=add_one).run(
+            upstream_states={Edge(Task(), add_one, key="x"): upstream}
+        )
+        assert state.is_successful()
+        assert state.result == 2
+        assert handler.reads == 1
+
+    def test_multiple_inputs_are_read_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BarrierHandler(JSONResultHandler):
+            def read(self, jblob):
+                barrier.wait()
+                return super().read(jblob)
+
+        inputs = {
+            "x": SafeResult("1", result_handler=BarrierHandler()),
+            "y": SafeResult("2", result_handler=BarrierHandler()),
+        }
+        TaskRunner(task=Task()).load_task_inputs(inputs)
+        assert inputs["x"].value == 1
+        assert inputs["y"].value == 2
+
+    def test_inputs_are_not_read_for_skipped_tasks(self):
+        handler = ReadCountingHandler()
+        task = Task()
+        upstream = Skipped(result=SafeResult("1", result_handler=handler))
+        state = TaskRunner(task=task).run(
+            upstream_states={Edge(Task(), task, key="x"): upstream}
+        )
+        assert state.is_skipped()
+        assert handler.reads == 0
+
+    def test_inputs_are_not_read_for_trigger_failed_tasks(self):
+        handler = ReadCountingHandler()
+        task = Task()
+        upstream = Failed(result=SafeResult("1", result_handler=handler))
+        state = TaskRunner(task=task).run(
+            upstream_states={Edge(Task(), task, key="x"): upstream}
+        )
+        assert isinstance(state, TriggerFailed)
+        assert handler.reads == 0
+
+    def test_inputs_are_not_read_for_valid_duration_caches(self):
+        handler = ReadCountingHandler()
+        task = Task(cache_for=timedelta(minutes=1))
+        upstream = Success(result=SafeResult("1", result_handler=handler))
+        cached = Cached(
+            result=2, cached_result_expiration=pendulum.now("utc") + timedelta(hours=1)
+        )
+        state = TaskRunner(task=task).run(
+            state=cached, upstream_states={Edge(Task(), task, key="x"): upstream}
+        )
+        assert state is cached
+        assert handler.reads == 0
+
+    def test_inputs_are_read_only_once_for_input_cache_validators(self):
+        handler = ReadCountingHandler()
+
+        @prefect.task(cache_for=timedelta(minutes=1), cache_validator=all_inputs)
+        def add_one(x):
+            return x + 1
+
+        upstream = Success(result=SafeResult("1", result_handler=handler))
+        cached = Cached(
+            result=2,
+            cached_inputs={"x": Result(5)},
+            cached_result_expiration=pendulum.now("utc") + timedelta(hours=1),
+        )
+        state = TaskRunner(task=add_one).run(
+            state=cached, upstream_states={Edge(Task(), add_one, key="x"): upstream}
+        )
+        # the cache is invalid, so the task reruns without reading its inputs again
+        assert state.is_cached()
+        assert state.result == 2
+        assert state.cached_inputs["x"].value == 1
+        assert handler.reads == 1
+
+    def test_inputs_are_read_for_custom_cache_validators(self):
+        handler = ReadCountingHandler()
+        received = []
+
+        def validator(state, inputs, parameters):
+            received.append(dict(inputs))
+            return True
+
+        task = Task(cache_for=timedelta(minutes=1), cache_validator=validator)
+        upstream = Success(result=SafeResult("1", result_handler=handler))
+        cached = Cached(
+            result=2, cached_result_expiration=pendulum.now("utc") + timedelta(hours=1)
+        )
+        state = TaskRunner(task=task).run(
+            state=cached, upstream_states={Edge(Task(), task, key="x"): upstream}
+        )
+        assert state is cached
+        assert type(received[0]["x"]) is Result
+        assert received[0]["x"].value == 1
+        assert handler.reads == 1
+
+
 class TestCheckTaskCached:
     @pytest.mark.parametrize("state", [Pending(), Success(), Retrying()])
     def test_not_cached(self, state):
@@ -1,12 +1,14 @@
 import datetime
+import gzip
 import json
 
 import pytest
 
 import prefect
 from prefect.core import Edge, Flow, Parameter, Task
-from prefect.serialization.flow import FlowSchema
+from prefect.serialization.flow import FlowSchema, compress_flow, decompress_flow
 from prefect.serialization.task import ParameterSchema
+from prefect.utilities.graphql import compress
 
 
 def test_serialize_empty_dict():
@@ -146,3 +148,200 @@ def test_serialize_empty_dict_contains_only_basic_fields():
         "__version__": prefect.__version__,
         "type": "builtins.dict",
     }
+
+
+class TestCompressFlow:
+    def flow(self):
+        class ArgTask(Task):
+            def run(self, x):
+                return x
+
+        f = Flow(name="test", schedule=prefect.schedules.CronSchedule("0 0 * * *"))
+        p = Parameter("p", default={"a": 1})
+        t1, t2, t3 = (
+            Task("a", tags=["x"]),
+            Task("b", max_retries=1, retry_delay=datetime.timedelta(1)),
+            ArgTask("c"),
+        )
+        f.add_edge(p, t1, key="p")
+        f.add_edge(t1, t2)
+        f.add_edge(t2, t3, key="x")
+        f.add_edge(t1, t3, mapped=True)
+        f.set_reference_tasks([t3])
+        return f
+
+    def test_round_trip(self):
+        serialized = self.flow().serialize()
+        compressed = compress_flow(serialized)
+        assert isinstance(compressed, bytes)
+        assert decompress_flow(compressed) == serialized
+
+    @pytest.mark.parametrize(
+        "serialized",
+        [
+            FlowSchema().dump({}),
+            FlowSchema().dump(Flow(name="test")),
+            FlowSchema(only=["name", "tasks"]).dump(Flow(name="test", tasks=[Task()])),
+        ],
+    )
+    def test_round_trip_partial_flows(self, serialized):
+        assert decompress_flow(compress_flow(serialized)) == serialized
+
+    def test_values_are_stored_once(self):
+        serialized = FlowSchema().dump(
+            Flow(name="test", tasks=[Task() for _ in range(5)])
+        )
+        encoded = json.loads(gzip.decompress(compress_flow(serialized)).decode())
+        assert len(encoded["tasks"]["rows"]) == 5
+        assert encoded["values"].count("prefect.core.task.Task") == 1
+        assert encoded["values"].count(prefect.__version__) == 1
+
+    def test_columns_are_listed_in_index_order(self):
+        serialized = self.flow().serialize()
+        encoded = json.loads(gzip.decompress(compress_flow(serialized)).decode())
+        seen = []
+        for task in serialized["tasks"]:
+            seen.extend(key for key in task if key not in seen)
+        columns = encoded["tasks"]["columns"]
+        assert sorted(columns) == sorted(seen)
+        # each row holds the value of the column at the same position
+        for task, row in zip(serialized["tasks"], encoded["tasks"]["rows"]):
+            for column, i in zip(columns, row):
+                if i != -1:
+                    assert encoded["values"][i] == task[column]
+
+    def test_values_of_different_types_are_distinct(self):
+        t1, t2, t3 = (
+            Task(name="1"),
+            Task(name="2", max_retries=1, retry_delay=datetime.timedelta(1)),
+            Task(name="3"),
+        )
+        t3.slug = "1"
+        serialized = FlowSchema().dump(Flow(name="test", tasks=[t1, t2, t3]))
+        assert decompress_flow(compress_flow(serialized)) == serialized
+
+    def test_load_decompressed_flow(self):
+        f = self.flow()
+        f2 = FlowSchema().load(decompress_flow(compress_flow(f.serialize())))
+        assert {t.slug for t in f2.tasks} == {t.slug for t in f.tasks}
+        assert {
+            (e.upstream_task.slug, e.downstream_task.slug, e.key, e.mapped)
+            for e in f2.edges
+        } == {
+            (e.upstream_task.slug, e.downstream_task.slug, e.key, e.mapped)
+            for e in f.edges
+        }
+        assert {t.slug for t in f2.reference_tasks()} == {
+            t.slug for t in f.reference_tasks()
+        }
+        assert f2.schedule.next(5) == f.schedule.next(5)
+        assert {p.name: p.default for p in f2.parameters()} == {"p": {"a": 1}}
+
+    def test_compressed_flow_is_smaller(self):
+        serialized = Flow(name="test", tasks=[Task() for _ in range(100)]).serialize()
+        assert len(compress_flow(serialized)) < len(compress(serialized))
+
+    def test_edges_must_refer_to_tasks(self):
+        serialized = self.flow().serialize()
+        serialized["tasks"] = serialized["tasks"][1:]
+        with pytest.raises(ValueError):
+            compress_flow(serialized)
+
+    def test_tasks_must_have_distinct_slugs(self):
+        serialized = self.flow().serialize()
+        serialized["tasks"].append(serialized["tasks"][0])
+        with pytest.raises(ValueError, match="distinct slugs"):
+            compress_flow(serialized)
+
+    def test_decompress_unknown_format(self):
+        with pytest.raises(ValueError, match="Unsupported compact flow format"):
+            decompress_flow(gzip.compress(b'{"format": 100}'))
+
+
+class TestBulkLoad:
+    def generated_flow(self, n_tasks=200):
+        class ArgTask(Task):
+            def run(self, x=None, y=None):
+                pass
+
+        f = Flow(name="test")
+        tasks = [ArgTask(name=str(i % 10)) for i in range(n_tasks)]
+        for i, task in enumerate(tasks[1:], 1):
+            f.add_edge(tasks[i - 1], task, key="x" if i % 2 else None)
+            f.add_edge(tasks[i // 2], task, key="y", mapped=bool(i % 3))
+        f.set_reference_tasks(tasks[-2:])
+        return f
+
+    def test_round_trip(self):
+        f = self.generated_flow()
+        serialized = FlowSchema().dump(f)
+        f2 = FlowSchema().load(serialized)
+
+        assert {t.slug for t in f2.tasks} == {t.slug for t in f.tasks}
+        assert {
+            (e.upstream_task.slug, e.downstream_task.slug, e.key, e.mapped)
+            for e in f2.edges
+        } == {
+            (e.upstream_task.slug, e.downstream_task.slug, e.key, e.mapped)
+            for e in f.edges
+        }
+        assert {t.slug for t in f2.reference_tasks()} == {
+            t.slug for t in f.reference_tasks()
+        }
+
+    def test_edges_use_loaded_tasks(self):
+        f2 = FlowSchema().load(FlowSchema().dump(self.generated_flow()))
+        for edge in f2.edges:
+            assert edge.upstream_task in f2.tasks
+            assert edge.downstream_task in f2.tasks
+
+    def test_flow_caches_work_after_load(self):
+        f = self.generated_flow(20)
+        f2 = FlowSchema().load(FlowSchema().dump(f))
+        assert [t.slug for t in f2.sorted_tasks()] == [t.slug for t in f.sorted_tasks()]
+        assert {t.slug for t in f2.root_tasks()} == {t.slug for t in f.root_tasks()}
+        f2.validate()
+
+    def test_edges_to_unknown_tasks_are_loaded_with_edge_schema(self):
+        serialized = FlowSchema().dump(self.generated_flow(5))
+        serialized["edges"].append(
+            dict(
+                upstream_task=dict(slug="unknown"),
+                downstream_task=serialized["tasks"][0],
+                key=None,
+                mapped=False,
+            )
+        )
+        f2 = FlowSchema().load(serialized)
+        assert len(f2.tasks) == 6
+        assert "unknown" in {t.slug for t in f2.tasks}
+        assert len(f2.edges) == 9
+
+    def test_edges_with_unexpected_values_are_loaded_with_edge_schema(self):
+        serialized = FlowSchema().dump(self.generated_flow(5))
+        edge = next(e for e in serialized["edges"] if not e["mapped"])
+        edge["mapped"] = "true"
+        f2 = FlowSchema().load(serialized)
+        mapped = {
+            (e.upstream_task.slug, e.downstream_task.slug, e.key)
+            for e in f2.edges
+            if e.mapped
+        }
+        assert len(mapped) == sum(bool(e["mapped"]) for e in serialized["edges"])
+        assert (
+            edge["upstream_task"]["slug"],
+            edge["downstream_task"]["slug"],
+            edge["key"],
+        ) in mapped
+
+    def test_invalid_edges_raise(self):
+        serialized = FlowSchema().dump(self.generated_flow(5))
+        serialized["edges"][0]["key"] = "not an identifier"
+        with pytest.raises(ValueError, match="valid identifier"):
+            FlowSchema().load(serialized)
+
+    def test_load_without_creating_objects(self):
+        serialized = FlowSchema().dump(self.generated_flow(5))
+        data = FlowSchema().load(serialized, create_object=False)
+        assert isinstance(data, dict)
+        assert len(data["tasks"]) == 5
@@ -6,6 +6,8 @@ import prefect
 from prefect.client import Client
 from prefect.engine.cloud.result_handler import CloudResultHandler
 from prefect.engine.result_handlers import (
+    ArrowResultHandler,
+    ContentAddressedResultHandler,
     GCSResultHandler,
     JSONResultHandler,
     LocalResultHandler,
@@ -94,6 +96,32 @@ class TestCustomSchema:
         assert obj is None
 
 
+class TestArrowResultHandler:
+    def test_roundtrip(self):
+        schema = ResultHandlerSchema()
+        handler = ArrowResultHandler(dir="/root/results", format="arrow")
+        serialized = schema.dump(handler)
+        assert serialized["type"] == "ArrowResultHandler"
+
+        obj = schema.load(serialized)
+        assert obj == handler
+        assert obj.row_group_size is None
+
+
+class TestContentAddressedResultHandler:
+    def test_roundtrip(self):
+        schema = ResultHandlerSchema()
+        handler = ContentAddressedResultHandler(dir="/root/results", compression="zlib")
+        serialized = schema.dump(handler)
+        assert serialized["type"] == "ContentAddressedResultHandler"
+
+        obj = schema.load(serialized)
+        assert isinstance(obj, ContentAddressedResultHandler)
+        assert obj.dir == "/root/results"
+        assert obj.serializer == "pickle"
+        assert obj.compression == "zlib"
+
+
 class TestLocalResultHandler:
     def test_serialize_local_result_handler_with_no_dir(self):
         serialized = ResultHandlerSchema().dump(LocalResultHandler())
@@ -112,6 +140,26 @@ class TestLocalResultHandler:
         assert serialized["type"] == "LocalResultHandler"
         assert serialized["dir"] == "/root/prefect"
 
+    def test_roundtrip_serializer_settings(self):
+        schema = ResultHandlerSchema()
+        obj = schema.load(
+            schema.dump(LocalResultHandler(serializer="json", compression="gzip"))
+        )
+        assert obj.serializer == "json"
+        assert obj.compression == "gzip"
+
+    def test_roundtrip_memory_map(self):
+        schema = ResultHandlerSchema()
+        obj = schema.load(schema.dump(LocalResultHandler(memory_map=True)))
+        assert obj.memory_map is True
+        handler = schema.load({"type": "LocalResultHandler"})
+        assert handler.memory_map is False
+
+    def test_deserialize_without_serializer_settings_uses_defaults(self):
+        handler = ResultHandlerSchema().load({"type": "LocalResultHandler"})
+        assert handler.serializer == "pickle"
+        assert handler.compression is None
+
     @pytest.mark.parametrize("dir", [None, "/root/prefect"])
     def test_deserialize_local_result_handler(self, dir):
         schema = ResultHandlerSchema()
@@ -11,8 +11,13 @@ import pytest
 import prefect
 from prefect.engine import state
 from prefect.engine.result import NoResult, Result, SafeResult
-from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
-from prefect.serialization.state import StateSchema
+from prefect.engine.result_handlers import (
+    JSONResultHandler,
+    LocalResultHandler,
+    ResultHandler,
+)
+from prefect.serialization.state import StateSchema, deserialize_state, serialize_state
+from prefect.utilities.graphql import GraphQLResult
 
 all_states = sorted(
     set(
@@ -233,3 +238,96 @@ def test_deserialize_handles_unknown_fields():
     )
 
     assert deserialized.is_successful()
+
+
+def test_all_states_are_compiled():
+    from prefect.serialization.state import _COMPILED_STATE_SCHEMAS
+
+    assert set(_COMPILED_STATE_SCHEMAS) == set(StateSchema.type_schemas)
+
+
+class TestCompiledSerialization:
+    @pytest.mark.parametrize(
+        "s",
+        complex_states()
+        + [cls(message="message") for cls in all_states if cls is not state.Mapped]
+        + [
+            state.Mapped(message="message", map_states=[state.Success(), None]),
+            state.Failed(message=ValueError("message")),
+            state.Success(result=SafeResult("1", result_handler=JSONResultHandler())),
+            state.Success(result=SafeResult(None, result_handler=JSONResultHandler())),
+            state.Success(
+                result=SafeResult(1, result_handler=LocalResultHandler(dir="/tmp"))
+            ),
+        ],
+    )
+    def test_serialize_and_deserialize_match_schema(self, s):
+        serialized = StateSchema().dump(s)
+        assert serialize_state(s) == serialized
+        assert s.serialize() == serialized
+
+        expected = StateSchema().load(serialized)
+        deserialized = deserialize_state(serialized)
+        assert type(deserialized) is type(expected)
+        assert deserialized == expected
+        assert deserialized.__dict__ == expected.__dict__
+        assert state.State.deserialize(serialized) == expected
+        result_handler = getattr(deserialized._result, "result_handler", None)
+        if result_handler is not None:
+            assert type(result_handler) is type(expected._result.result_handler)
+            assert result_handler.__dict__ == expected._result.result_handler.__dict__
+
+    def test_deserialize_from_only_type(self):
+        deserialized = deserialize_state({"type": "Retrying"})
+        assert type(deserialized) is state.Retrying
+        assert deserialized._result == NoResult
+
+    def test_deserialize_ignores_unknown_fields(self):
+        deserialized = deserialize_state({"type": "Success", "unknown": 1})
+        assert type(deserialized) is state.Success
+
+    def test_deserialize_graphql_result(self):
+        serialized = GraphQLResult(
+            state.Retrying(message="message", run_count=2).serialize()
+        )
+        deserialized = deserialize_state(serialized)
+        assert type(deserialized) is state.Retrying
+        assert deserialized.run_count == 2
+
+    def test_serialize_custom_result_handler_falls_back_to_schema(self):
+        class MyHandler(ResultHandler):
+            def read(self, *args):
+                pass
+
+            def write(self, *args):
+                pass
+
+        s = state.Success(result=SafeResult(1, result_handler=MyHandler()))
+        serialized = serialize_state(s)
+        assert serialized == StateSchema().dump(s)
+        assert serialized["_result"]["result_handler"]["type"] == "MyHandler"
+        assert deserialize_state(serialized)._result == SafeResult(1, None)
+
+    def test_deserialize_converts_values_like_schema(self):
+        deserialized = deserialize_state({"type": "Retrying", "run_count": "3"})
+        assert deserialized.run_count == 3
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {},
+            {"type": "FakeState"},
+            {"type": "Success", "message": 1},
+            {"type": "Success", "_result": None},
+            {"type": "Scheduled", "start_time": "not a time"},
+            {"type": "Pending", "cached_inputs": {"x": None}},
+        ],
+    )
+    def test_deserialize_invalid_data_raises_validation_error(self, data):
+        with pytest.raises(marshmallow.exceptions.ValidationError):
+            deserialize_state(data)
+
+    def test_serialize_invalid_result_raises_validation_error(self):
+        res = SafeResult({"x": lambda: 1}, result_handler=JSONResultHandler())
+        with pytest.raises(marshmallow.exceptions.ValidationError):
+            serialize_state(state.Success(result=res))
@@ -7,7 +7,7 @@ from unittest.mock import MagicMock
 import pytest
 
 import prefect
-from prefect.utilities.executors import Heartbeat, timeout_handler
+from prefect.utilities.executors import Heartbeat, get_io_pool, io_map, timeout_handler
 
 
 def test_heartbeat_calls_function_on_interval():
@@ -101,3 +101,45 @@ def test_timeout_handler_preserves_context():
 def test_timeout_handler_preserves_logging(caplog):
     timeout_handler(prefect.Flow("logs").run, timeout=2)
     assert len(caplog.records) >= 2  # 1 INFO to start, 1 INFO to end
+
+
+class TestIOMap:
+    def test_io_map_returns_results_in_order(self):
+        def slow_square(x):
+            time.sleep(0.01 * (5 - x))
+            return x ** 2
+
+        assert io_map(slow_square, range(5)) == [0, 1, 4, 9, 16]
+
+    def test_io_map_runs_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait(x):
+            barrier.wait()
+            return x
+
+        assert io_map(wait, [1, 2, 3]) == [1, 2, 3]
+
+    def test_io_map_preserves_context(self):
+        def get_key(x):
+            return prefect.context.get("test_key")
+
+        with prefect.context(test_key=42):
+            assert io_map(get_key, [1, 2]) == [42, 42]
+
+    def test_io_map_reraises(self):
+        def fail(x):
+            if x == 2:
+                raise ValueError("bad item")
+            return x
+
+        with pytest.raises(ValueError, match="bad item"):
+            io_map(fail, [1, 2, 3])
+
+    def test_io_map_runs_single_items_in_calling_thread(self):
+        assert io_map(lambda x: threading.current_thread(), [1]) == [
+            threading.current_thread()
+        ]
+
+    def test_io_pool_is_shared(self):
+        assert get_io_pool() is get_io_pool()
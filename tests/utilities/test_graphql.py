@@ -10,8 +10,12 @@ from prefect.utilities.collections import DotDict
 from prefect.utilities.graphql import (
     EnumValue,
     GQLObject,
+    GraphQLList,
+    GraphQLResult,
+    PreparedQuery,
     parse_graphql,
     parse_graphql_arguments,
+    prepare_graphql,
     with_args,
     compress,
     decompress,
@@ -413,3 +417,61 @@ def test_decompress():
 )
 def test_compression_back_translation(obj):
     assert decompress(compress(obj)) == obj
+
+
+def test_prepare_graphql_matches_parse_graphql():
+    document = {"mutation($input: myInput!)": {"myMutation(input: $input)": {"id"}}}
+    prepared = prepare_graphql(document)
+    assert isinstance(prepared, PreparedQuery)
+    assert prepared == parse_graphql(document)
+
+
+def test_parse_graphql_returns_prepared_queries_unchanged():
+    prepared = prepare_graphql({"query": {"books": {"id"}}})
+    assert parse_graphql(prepared) is prepared
+
+
+class TestLazyGraphQLResult:
+    def test_wrap_does_not_copy(self):
+        data = {"a": 1}
+        result = GraphQLResult.wrap(data)
+        result.b = 2
+        assert data == {"a": 1, "b": 2}
+        assert result.a == result["a"] == 1
+
+    def test_nested_objects_are_wrapped_on_access(self):
+        data = {"data": {"flow_run": {"id": 1}}}
+        result = GraphQLResult.wrap(data)
+        assert type(data["data"]) is dict
+        assert result.data.flow_run.id == 1
+        assert isinstance(result.data, GraphQLResult)
+        assert isinstance(result["data"]["flow_run"], GraphQLResult)
+        assert result.data is result.data
+
+    def test_arrays_are_wrapped_on_access(self):
+        data = {"runs": [{"id": 1}, {"id": 2}, 3]}
+        result = GraphQLResult.wrap(data)
+        assert isinstance(result.runs, GraphQLList)
+        assert [run.id for run in result.runs[:2]] == [1, 2]
+        assert result.runs[1].id == 2
+        assert result.runs[2] == 3
+        # the objects in arrays are wrapped again on each access, rather than replaced
+        assert type(list.__getitem__(data["runs"], 0)) is dict
+
+    def test_changes_to_array_items_are_kept(self):
+        result = GraphQLResult.wrap({"runs": [{"id": 1}]})
+        for run in result.runs:
+            run.state = "x"
+        assert result.runs[0].state == "x"
+
+    def test_lazy_results_convert_to_dicts(self):
+        data = {"data": {"runs": [{"id": 1, "task": {"slug": "a"}}]}}
+        result = GraphQLResult.wrap(json.loads(json.dumps(data)))
+        assert result.to_dict() == data
+        assert type(result.to_dict()["data"]["runs"]) is list
+        assert type(result.to_dict()["data"]["runs"][0]["task"]) is dict
+        assert json.loads(repr(result)) == data
+
+    def test_lazy_results_can_have_critical_keys(self):
+        result = GraphQLResult.wrap({"update": {"items": [{"keys": 1}]}})
+        assert result.update["items"][0]["keys"] == 1
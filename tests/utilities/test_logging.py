@@ -1,6 +1,14 @@
+import base64
+import gzip
+import json
 import logging
+import threading
+import time
 from unittest.mock import MagicMock
 
+import pytest
+
+import prefect
 from prefect import utilities
 
 
@@ -39,26 +47,236 @@ def test_remote_handler_is_configured_for_cloud():
 def test_remote_handler_captures_errors_then_passes():
     try:
         with utilities.configuration.set_temporary_config(
-            {"logging.log_to_cloud": True, "cloud.log": "http://foo.bar:1800/log"}
+            {
+                "logging.log_to_cloud": True,
+                "cloud.log": "http://foo.bar:1800/log",
+                "logging.remote.max_retries": 0,
+                "logging.remote.batch_interval": 0,
+            }
         ):
             logger = utilities.logging.configure_logging(testing=True)
             assert hasattr(logger.handlers[-1], "client")
             child_logger = logger.getChild("sub-test")
             child_logger.critical("this should raise an error in the handler")
-            assert logger.handlers[-1].errored_out == True
+            logger.handlers[-1].flush()
+            assert logger.handlers[-1].dropped == 1
     finally:
         # reset root_logger
         logger = utilities.logging.configure_logging(testing=True)
         logger.handlers = []
 
 
-def test_get_logger_returns_root_logger():
-    assert utilities.logging.get_logger() is logging.getLogger("prefect")
+def decompress(payload):
+    return json.loads(gzip.decompress(base64.b64decode(payload)))
+
+
+class TestRemoteHandler:
+    @pytest.fixture()
+    def shipped(self):
+        """
+        Yields a logger with a RemoteHandler whose client records every batch it posts.
+        """
+        batches = []
+        config = {
+            "cloud.log": "http://foo.bar:1800/log",
+            "logging.remote.batch": True,
+            "logging.remote.batch_interval": 0.2,
+            "logging.remote.backoff_factor": 0,
+        }
+        with utilities.configuration.set_temporary_config(config):
+            handler = utilities.logging.RemoteHandler()
+            handler.client = MagicMock(
+                post=MagicMock(
+                    side_effect=lambda path, server, logs: batches.append(
+                        decompress(logs)
+                    )
+                )
+            )
+            logger = logging.getLogger("prefect-test-remote")
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+            logger.addHandler(handler)
+            try:
+                yield logger, handler, batches
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+
+    def test_records_are_shipped_in_compressed_batches(self, shipped):
+        logger, handler, batches = shipped
+        with prefect.context(flow_run_id="fr", task_run_id="tr"):
+            for i in range(3):
+                logger.info("message %d", i, extra=dict(obj=object()))
+        handler.flush()
+
+        assert len(batches) == 1
+        assert [r["msg"] for r in batches[0]] == ["message 0", "message 1", "message 2"]
+        assert all(r["args"] is None for r in batches[0])
+        assert batches[0][0]["levelname"] == "INFO"
+        assert batches[0][0]["obj"].startswith("<object")
+        assert handler.client.post.call_args[1]["server"] == "http://foo.bar:1800/log"
+
+    def test_batches_hold_at_most_batch_size_records(self, shipped):
+        logger, handler, batches = shipped
+        with utilities.configuration.set_temporary_config(
+            {"logging.remote.batch_size": 2}
+        ):
+            for i in range(5):
+                logger.info("message %d", i)
+            handler.flush()
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert [r["msg"] for b in batches for r in b] == [
+            "message {}".format(i) for i in range(5)
+        ]
+
+    def test_logging_never_blocks_on_the_network(self, shipped):
+        logger, handler, batches = shipped
+        release = threading.Event()
+        post = handler.client.post.side_effect
+
+        def slow_post(**kwargs):
+            release.wait(5)
+            post(**kwargs)
+
+        handler.client.post.side_effect = slow_post
+        start = time.monotonic()
+        for i in range(100):
+            logger.debug("message %d", i)
+        assert time.monotonic() - start < 1
+        release.set()
+        handler.flush()
+        assert sum(len(b) for b in batches) == 100
+
+    def test_failed_batches_are_retried(self, shipped):
+        logger, handler, batches = shipped
+        post = handler.client.post.side_effect
+        attempts = []
+
+        def flaky_post(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) < 3:
+                raise ValueError()
+            post(**kwargs)
+
+        handler.client.post.side_effect = flaky_post
+        logger.info("hello")
+        handler.flush()
+        assert len(attempts) == 3
+        assert batches[0][0]["msg"] == "hello"
+        assert handler.dropped == 0
+
+    def test_unsendable_batches_are_dropped_and_shipping_continues(self, shipped):
+        logger, handler, batches = shipped
+        post = handler.client.post.side_effect
+        handler.client.post.side_effect = ValueError()
+        with utilities.configuration.set_temporary_config(
+            {"logging.remote.max_retries": 1}
+        ):
+            logger.info("lost")
+            handler.flush()
+            assert handler.client.post.call_count == 2
+            assert handler.dropped == 1
+
+            handler.client.post.side_effect = post
+            logger.info("found")
+            handler.flush()
+        assert [r["msg"] for b in batches for r in b] == ["found"]
+
+    def test_failed_requests_are_counted_and_logged(self, shipped, caplog):
+        logger, handler, batches = shipped
+        handler.client.post.side_effect = ValueError("no logs today")
+        with utilities.configuration.set_temporary_config(
+            {"logging.remote.max_retries": 0}
+        ):
+            logger.info("lost")
+            handler.flush()
+        assert handler.failed == 1
+        assert handler.dropped == 1
+        [record] = [r for r in caplog.records if r.name == "RemoteHandler"]
+        assert record.levelname == "WARNING"
+        assert "no logs today" in record.getMessage()
+
+    def test_unserializable_records_are_counted_and_shipping_continues(
+        self, shipped, caplog, monkeypatch
+    ):
+        logger, handler, batches = shipped
+        serialize = utilities.logging._serialize_record
+
+        def bad_serialize(record):
+            if record.msg == "bad":
+                raise ValueError("can't serialize")
+            return serialize(record)
+
+        monkeypatch.setattr(utilities.logging, "_serialize_record", bad_serialize)
+        logger.info("bad")
+        handler.flush()
+        assert handler.failed == 1
+        assert handler.dropped == 1
+        assert any(
+            "can't serialize" in r.getMessage()
+            for r in caplog.records
+            if r.name == "RemoteHandler"
+        )
+
+        logger.info("good")
+        handler.flush()
+        assert [r["msg"] for b in batches for r in b] == ["good"]
+
+    def test_records_are_sent_one_at_a_time_by_default(self):
+        posted = []
+        config = {"cloud.log": "http://foo.bar:1800/log"}
+        with utilities.configuration.set_temporary_config(config):
+            handler = utilities.logging.RemoteHandler()
+            handler.client = MagicMock(
+                post=MagicMock(side_effect=lambda **kwargs: posted.append(kwargs))
+            )
+            logger = logging.getLogger("prefect-test-remote-records")
+            logger.propagate = False
+            logger.addHandler(handler)
+            try:
+                logger.warning("message %d", 0, extra=dict(obj=object()))
+                logger.warning("message %d", 1)
+                handler.flush()
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+
+        assert [p["msg"] for p in posted] == ["message 0", "message 1"]
+        assert all(p["server"] == "http://foo.bar:1800/log" for p in posted)
+        assert all("logs" not in p for p in posted)
+        assert posted[0]["obj"].startswith("<object")
+
+    def test_records_logged_while_the_queue_is_full_are_dropped(self):
+        release = threading.Event()
+        messages = []
 
+        def slow_post(path, server, logs):
+            release.wait(5)
+            messages.extend(r["msg"] for r in decompress(logs))
 
-def test_get_logger_with_name_returns_child_logger():
-    child_logger = logging.getLogger("prefect.test")
-    prefect_logger = utilities.logging.get_logger("test")
+        config = {
+            "logging.remote.batch": True,
+            "logging.remote.queue_size": 2,
+            "logging.remote.batch_size": 1,
+            "logging.remote.batch_interval": 0,
+        }
+        with utilities.configuration.set_temporary_config(config):
+            handler = utilities.logging.RemoteHandler()
+            handler.client = MagicMock(post=MagicMock(side_effect=slow_post))
+            logger = logging.getLogger("prefect-test-remote-full")
+            logger.propagate = False
+            logger.addHandler(handler)
+            try:
+                logger.warning("in flight")
+                while handler.queue.qsize():
+                    time.sleep(0.01)
+                for i in range(5):
+                    logger.warning("queued %d", i)
+                release.set()
+                handler.flush()
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
 
-    assert prefect_logger is child_logger
-    assert prefect_logger is logging.getLogger("prefect").getChild("test")
+        assert handler.dropped == 3
+        assert messages == ["in flight", "queued 0", "queued 1"]